@@ -1,6 +1,8 @@
 import discord
 import discord.ext.commands
 import os
+import json
+import hashlib
 import asyncio
 import asyncpg
 import logging
@@ -8,8 +10,22 @@ from discord import app_commands
 from discord.ext import commands
 from datetime import datetime, timezone
 from time import perf_counter
-from asyncpg.pool import create_pool
 
+from utils.config_cache import GuildConfigCache
+from utils.channels import ChannelResolver
+from utils.log_queue import LogQueue
+from utils.assets import IconStore
+from utils.audit_cache import AuditLogCache
+from utils.attachments import AttachmentArchiver
+from utils.message_store import MessageStore
+from utils.event_log import EventLogWriter
+from utils.mod_cases import ModCaseStore
+from utils.db import create_pool, backoff_delay, PoolHealthMonitor
+from utils.metrics import Metrics, InstrumentedBot, MetricsServer
+from utils.loop_monitor import LoopMonitor
+from utils.shards import ShardTracker, SHARD_IDENTIFY_DELAY
+from utils import runtime
+import apikeys
 from apikeys import Token, Database_Name, Host_IP, Host_Port, User_Name, User_Pass
 
 logging.basicConfig(format='%(levelname)s:  %(message)s', level=logging.INFO)
@@ -28,11 +44,36 @@ def current_time ():
     return current_time
 
 async def get_server_prefix(bot, message):
-    prefix_record = await bot.pool.fetchrow('SELECT prefix FROM info WHERE guild_id = $1', message.guild.id)
-    prefix = prefix_record["prefix"]
-    return prefix
+    # DMs and guilds without an info row (or prefix) use the default prefix
+    if message.guild is None:
+        return DEFAULT_PREFIX
+    prefix_record = await bot.config_cache.get(message.guild.id)
+    if not prefix_record or not prefix_record["prefix"]:
+        return DEFAULT_PREFIX
+    return prefix_record["prefix"]
 
-bot = commands.Bot(command_prefix= get_server_prefix, help_command=None, intents=intents)
+#   Sharding, Shard_Count = None lets discord pick the shard count
+shard_count = getattr(apikeys, "Shard_Count", None)
+shard_ids = getattr(apikeys, "Shard_Ids", None)
+
+class HolyRoller(InstrumentedBot):
+    # runs once after login, before the gateway connects (on_ready fires again on every reconnect)
+    async def setup_hook(self):
+        await sync_commands(self)
+
+metrics = Metrics()
+bot = HolyRoller(command_prefix= get_server_prefix, help_command=None, intents=intents, metrics=metrics, shard_count=shard_count, shard_ids=shard_ids)
+bot.shard_tracker = ShardTracker(bot, identify_delay=getattr(apikeys, "Shard_Identify_Delay", None) or SHARD_IDENTIFY_DELAY)
+bot.before_identify_hook = bot.shard_tracker.before_identify
+bot.channel_resolver = ChannelResolver(bot)
+bot.log_queue = LogQueue(bot)
+bot.icons = IconStore()
+bot.audit_cache = AuditLogCache()
+bot.attachments = AttachmentArchiver()
+bot.message_store = MessageStore()
+bot.loop_monitor = LoopMonitor(slow_ms=getattr(apikeys, "Loop_Slow_Callback_Ms", None) or 100)
+for name, collector in (("channel_resolver", bot.channel_resolver), ("log_queue", bot.log_queue), ("audit_cache", bot.audit_cache), ("attachments", bot.attachments), ("message_store", bot.message_store), ("event_loop", bot.loop_monitor), ("shards", bot.shard_tracker)):
+    metrics.add_collector(name, collector.stats)
 
 ##  Events
 
@@ -43,11 +84,15 @@ async def on_guild_join(guild):
     server = guild.name
     await owner.send(f"Thank you for adding The Holy Roller to **{server}**")
     await bot.pool.execute('INSERT INTO info (guild_id, prefix) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET prefix = $2', guild.id, DEFAULT_PREFIX)
+    bot.config_cache.invalidate(guild.id)
 
     #  on_guild_remove
 @bot.event
 async def on_guild_remove(guild):
     await bot.pool.execute('DELETE FROM info WHERE guild_id = $1', guild.id)
+    bot.config_cache.invalidate(guild.id)
+    bot.audit_cache.forget_guild(guild.id)
+    bot.message_store.forget_guild(guild.id)
     
 ##  Commands
 
@@ -58,6 +103,7 @@ async def on_guild_remove(guild):
 async def setprefix(ctx: commands.Context, prefix: str):
     try:
         await bot.pool.execute('UPDATE info SET prefix = $2 WHERE guild_id = $1', ctx.guild.id, prefix)
+        bot.config_cache.update(ctx.guild.id, prefix=prefix)
         await ctx.send(f"Changed prefix to {prefix}")
     except:
         await ctx.send("Could not change prefix, please try again")
@@ -85,23 +131,76 @@ async def setprefix_error(ctx: commands.Context, error):
 #  on_ready
 @bot.event
 async def on_ready():
-    synced = await bot.tree.sync()
-    logging.info(f"synced %s command(s)", len(synced))
     await bot.change_presence(activity=discord.activity.Game(name="Church service simulator 2024"))
     logging.info("The Holy Roller is awake and high as a fucking kite just like always     UTC:%s\n", current_time())
+    bot.shard_tracker.all_ready()
+
+#  Shards
+@bot.event
+async def on_shard_connect(shard_id):
+    bot.shard_tracker.connected(shard_id)
+
+@bot.event
+async def on_shard_ready(shard_id):
+    bot.shard_tracker.ready(shard_id)
+
+@bot.event
+async def on_shard_disconnect(shard_id):
+    bot.shard_tracker.disconnected(shard_id)
+
+@bot.event
+async def on_shard_resumed(shard_id):
+    bot.shard_tracker.resumed(shard_id)
     
 #  Load cogs
+async def load_extension_timed(name):
+    start = perf_counter()
+    await bot.load_extension(name)
+    logging.info("Loaded %s in %.1f ms", name, (perf_counter()-start)*1000)
+
 async def load():
     start = perf_counter()
-    for filename in os.listdir("./cogs"):
-        if filename.endswith(".py") and not filename.startswith("_"):
-            await bot.load_extension(f"cogs.{filename[:-3]}")
+    extensions = [f"cogs.{filename[:-3]}" for filename in sorted(os.listdir("./cogs")) if filename.endswith(".py") and not filename.startswith("_")]
+    await asyncio.gather(*(load_extension_timed(name) for name in extensions))
     end = perf_counter()
     logging.info(f"Loading took %s ms", (end-start)*1000)
 
+#  Sync slash commands once per start, and only when they changed since the last sync
+COMMAND_HASH_FILE = ".command_tree_hash"
+
+def command_tree_hash(bot):
+    payload = [command.to_dict(bot.tree) for command in bot.tree.get_commands()]
+    payload.sort(key=lambda command: (command.get("type", 1), command["name"]))
+    data = json.dumps({"application_id": bot.application_id, "commands": payload}, sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+async def sync_commands(bot):
+    current = command_tree_hash(bot)
+    try:
+        with open(COMMAND_HASH_FILE) as f:
+            previous = f.read().strip()
+    except OSError:
+        previous = None
+    if current == previous:
+        logging.info("Commands unchanged since the last sync, skipping sync")
+        return
+    synced = await bot.tree.sync()
+    logging.info(f"synced %s command(s)", len(synced))
+    try:
+        with open(COMMAND_HASH_FILE, "w") as f:
+            f.write(current)
+    except OSError:
+        logging.warning("Could not save %s, commands will be synced again on the next start", COMMAND_HASH_FILE)
+
 async def connect():
     try:
-        bot.pool = await asyncpg.create_pool(database=Database_Name, host=Host_IP, port=Host_Port, user=User_Name, password=User_Pass)
+        bot.pool = await create_pool(apikeys, query_logger=metrics.on_query, database=Database_Name, host=Host_IP, port=Host_Port, user=User_Name, password=User_Pass)
+        bot.pool_health = PoolHealthMonitor(bot.pool)
+        bot.config_cache = GuildConfigCache(bot.pool)
+        bot.event_log = EventLogWriter(bot.pool)
+        bot.mod_cases = ModCaseStore(bot.pool)
+        for name, collector in (("db_pool", bot.pool_health), ("config_cache", bot.config_cache), ("event_log", bot.event_log)):
+            metrics.add_collector(name, collector.stats)
         logging.info("Connection to DB was successfully established.")
         return True
     except:
@@ -114,17 +213,49 @@ async def main():
     #startup debugging, remove # to turn on
     #discord.utils.setup_logging()
 
+    bot.loop_monitor.start()
     logging.info("Connecting to DB...")
 
     connected = False
+    attempt = 0
     while connected == False:
         connected = await connect()
+        if connected == False:
+            delay = backoff_delay(attempt)
+            attempt += 1
+            logging.info("Retrying DB connection in %.1f seconds (attempt %s)", delay, attempt)
+            await asyncio.sleep(delay)
+    bot.pool_health.start()
+
+    try:
+        await bot.event_log.start()
+    except:
+        logging.error("Could not create the event_log table, events stay buffered until it exists.")
+    try:
+        await bot.mod_cases.ensure_table()
+    except:
+        logging.error("Could not create the mod_cases table, moderation cases won't be stored.")
+
+    metrics_server = None
+    if getattr(apikeys, "Metrics_Port", None):
+        metrics_server = MetricsServer(metrics, getattr(apikeys, "Metrics_Host", None) or "127.0.0.1", apikeys.Metrics_Port)
+        try:
+            await metrics_server.start()
+        except OSError:
+            logging.error("Could not start the metrics endpoint on port %s.", apikeys.Metrics_Port)
+            metrics_server = None
 
     #Start
     try:
         await load()
         await bot.start(Token)
     finally:
+        if metrics_server is not None:
+            await metrics_server.close()
+        await bot.attachments.close()
+        await bot.event_log.close()
+        await bot.pool_health.close()
         await bot.pool.close()
+        await bot.loop_monitor.close()
 
-asyncio.run(main())
\ No newline at end of file
+runtime.run(main(), fast=bool(getattr(apikeys, "Fast_Runtime", False)))
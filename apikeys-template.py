@@ -8,4 +8,24 @@ Database_Name = '' #The name of your database
 Host_IP = '' #The IP of the host(server) running your database
 Host_Port = '' #The host port of your database
 User_Name = '' #Username used to log onto your database
-User_Pass = '' #Password used to log onto your database
\ No newline at end of file
+User_Pass = '' #Password used to log onto your database
+
+#DB pool (optional, leave as None to use the defaults)
+Pool_Min_Size = None #Connections kept open at all times (default 2)
+Pool_Max_Size = None #Most connections the bot will open at once (default 10)
+Pool_Command_Timeout = None #Seconds before a query is cancelled (default 10)
+Pool_Statement_Cache_Size = None #Prepared statements kept per connection (default 256)
+Pool_Max_Inactive_Lifetime = None #Seconds an idle connection is kept before it's closed (default 300)
+
+#Metrics (optional)
+Metrics_Port = None #Port for the Prometheus metrics endpoint (http://127.0.0.1:<port>/metrics), None turns it off
+Metrics_Host = None #Address the metrics endpoint listens on (default 127.0.0.1, only change this if you know why)
+Loop_Slow_Callback_Ms = None #Log the code that blocks the bot for longer than this many milliseconds (default 100)
+
+#Runtime (optional)
+Fast_Runtime = False #Use uvloop and orjson when installed (pip install -r Dependencies/requirements-speed.txt)
+
+#Sharding (optional, leave as None to let discord decide)
+Shard_Count = None #Total number of shards, None asks discord for the recommended count
+Shard_Ids = None #Shards this process runs, e.g. [0, 1] (needs Shard_Count), None runs all of them
+Shard_Identify_Delay = None #Seconds between shard logins (default 5, discord allows one login per 5 seconds)
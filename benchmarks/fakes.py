@@ -0,0 +1,304 @@
+import asyncio
+import discord
+from collections import Counter
+from datetime import datetime, timezone, timedelta
+
+# In-process stand-ins for Postgres and the Discord REST API.
+# Every call is counted (and can be delayed to simulate network latency) so a scenario can
+# report DB queries and REST calls per event. Gateway state (guilds, channels, members) is
+# plain objects with the attributes the cogs read.
+
+class Stats:
+    def __init__(self, db_latency: float = 0.0, rest_latency: float = 0.0):
+        self.db_latency = db_latency
+        self.rest_latency = rest_latency
+        self.db = Counter()
+        self.rest = Counter()
+
+    async def query(self, kind):
+        self.db[kind] += 1
+        if self.db_latency:
+            await asyncio.sleep(self.db_latency)
+
+    async def request(self, route):
+        self.rest[route] += 1
+        if self.rest_latency:
+            await asyncio.sleep(self.rest_latency)
+
+    def reset(self):
+        self.db.clear()
+        self.rest.clear()
+
+# ---------- Postgres ----------
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def fetchrow(self, query, *args):
+        return await self.pool.fetchrow(query, *args)
+
+    async def fetch(self, query, *args):
+        return await self.pool.fetch(query, *args)
+
+    async def fetchval(self, query, *args):
+        return await self.pool.fetchval(query, *args)
+
+    async def execute(self, query, *args):
+        return await self.pool.execute(query, *args)
+
+    async def copy_records_to_table(self, table, *, records, columns=None):
+        await self.pool.stats.query('copy')
+        self.pool.copied[table] += len(records)
+
+class _Acquire:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def __aenter__(self):
+        return FakeConnection(self.pool)
+
+    async def __aexit__(self, *exc):
+        return False
+
+class FakePool:
+    def __init__(self, stats: Stats, info_rows: dict):
+        self.stats = stats
+        self.info_rows = info_rows
+        self.copied = Counter()
+
+    def acquire(self):
+        return _Acquire(self)
+
+    async def fetchrow(self, query, *args):
+        await self.stats.query('fetchrow')
+        if 'FROM info' in query:
+            return self.info_rows.get(args[0])
+        if query.lstrip().startswith('INSERT'):
+            return {'id': 1, 'created_at': datetime.now(timezone.utc)}
+        return None
+
+    async def fetch(self, query, *args):
+        await self.stats.query('fetch')
+        return []
+
+    async def fetchval(self, query, *args):
+        await self.stats.query('fetchval')
+        return 1
+
+    async def execute(self, query, *args):
+        await self.stats.query('execute')
+        return "OK"
+
+    def get_size(self):
+        return 1
+
+    def get_idle_size(self):
+        return 1
+
+    def get_max_size(self):
+        return 10
+
+    async def close(self):
+        pass
+
+# ---------- Discord ----------
+
+class FakeAttachment:
+    def __init__(self, filename, url, size=0, content_type=None):
+        self.filename = filename
+        self.url = url
+        self.size = size
+        self.content_type = content_type
+
+class FakeMessage:
+    def __init__(self, id, channel, author, content="", attachments=None):
+        self.id = id
+        self.channel = channel
+        self.guild = getattr(channel, 'guild', None)
+        self.author = author
+        self.content = content
+        self.attachments = attachments or []
+
+class FakeMessageable:
+    _next_message_id = 10**17
+
+    async def send(self, content=None, *, embed=None, embeds=None, file=None, files=None, **kwargs):
+        await self.stats.request(self._send_route)
+        uploads = list(files or []) + ([file] if file is not None else [])
+        expiry = int((datetime.now(timezone.utc) + timedelta(hours=24)).timestamp())
+        attachments = [FakeAttachment(f.filename, f"https://cdn.example/{f.filename}?ex={expiry:x}") for f in uploads]
+        for f in uploads:
+            f.close()
+        FakeMessageable._next_message_id += 1
+        return FakeMessage(FakeMessageable._next_message_id, self, None, content or "", attachments)
+
+    async def typing(self):
+        await self.stats.request('typing')
+
+class FakeRole:
+    def __init__(self, guild, id, name, permissions=None, position=0):
+        self.guild = guild
+        self.id = id
+        self.name = name
+        self.permissions = permissions or discord.Permissions.none()
+        self.position = position
+
+    @property
+    def mention(self):
+        return f"<@&{self.id}>"
+
+    def __str__(self):
+        return self.name
+
+class FakeMember(FakeMessageable):
+    _send_route = 'dm'
+
+    def __init__(self, stats, guild, id, name, roles=(), bot=False, created_days_ago=400, avatar=True):
+        self.stats = stats
+        self.guild = guild
+        self.id = id
+        self.name = name
+        self.display_name = name
+        self.bot = bot
+        self.roles = list(roles)
+        self.avatar = object() if avatar else None
+        self.created_at = datetime.now(timezone.utc) - timedelta(days=created_days_ago)
+        self.timed_out_until = None
+
+    @property
+    def mention(self):
+        return f"<@{self.id}>"
+
+    @property
+    def guild_permissions(self):
+        value = 0
+        for role in self.roles:
+            value |= role.permissions.value
+        return discord.Permissions(value)
+
+    def __str__(self):
+        return self.name
+
+class FakeCategory:
+    def __init__(self, guild, id, name, overwrites=None):
+        self.guild = guild
+        self.id = id
+        self.name = name
+        self.overwrites = overwrites or {}
+
+    @property
+    def mention(self):
+        return f"<#{self.id}>"
+
+class FakeTextChannel(FakeMessageable):
+    _send_route = 'channel.send'
+
+    def __init__(self, stats, guild, id, name, category=None, overwrites=None, position=0):
+        self.stats = stats
+        self.guild = guild
+        self.id = id
+        self.name = name
+        self.category = category
+        self.overwrites = overwrites or {}
+        self.position = position
+        self.topic = None
+        self.nsfw = False
+        self.slowmode_delay = 0
+
+    @property
+    def mention(self):
+        return f"<#{self.id}>"
+
+    @property
+    def permissions_synced(self):
+        return self.category is not None and self.overwrites == self.category.overwrites
+
+    def copy(self, **changes):
+        clone = FakeTextChannel(self.stats, self.guild, self.id, self.name, self.category, dict(self.overwrites), self.position)
+        for key, value in changes.items():
+            setattr(clone, key, value)
+        return clone
+
+    def __str__(self):
+        return self.name
+
+class FakeGuild:
+    def __init__(self, stats, id, name="Benchmark guild"):
+        self.stats = stats
+        self.id = id
+        self.name = name
+        self.chunked = True
+        self.members = []
+        self.roles = []
+        self.channels = []
+        self.owner = None
+        self.owner_id = None
+        self.audit_entries = []
+
+    def get_member(self, member_id):
+        for member in self.members:
+            if member.id == member_id:
+                return member
+        return None
+
+    def get_role(self, role_id):
+        for role in self.roles:
+            if role.id == role_id:
+                return role
+        return None
+
+    async def chunk(self):
+        await self.stats.request('guild.chunk')
+
+    async def edit(self, **kwargs):
+        await self.stats.request('guild.edit')
+
+    async def fetch_ban(self, user):
+        await self.stats.request('guild.fetch_ban')
+        return None
+
+    async def audit_logs(self, limit=100, after=None, **kwargs):
+        await self.stats.request('guild.audit_logs')
+        for entry in self.audit_entries[:limit or None]:
+            yield entry
+
+    def __str__(self):
+        return self.name
+
+class FakeWorld:
+    def __init__(self, stats: Stats):
+        self.stats = stats
+        self.guilds = {}
+        self.channels = {}
+        self.users = {}
+
+    def add_guild(self, guild):
+        self.guilds[guild.id] = guild
+        return guild
+
+    def add_channel(self, channel):
+        self.channels[channel.id] = channel
+        channel.guild.channels.append(channel)
+        return channel
+
+    def add_member(self, member):
+        member.guild.members.append(member)
+        self.users[member.id] = member
+        return member
+
+    async def fetch_channel(self, channel_id):
+        await self.stats.request('fetch_channel')
+        channel = self.channels.get(channel_id)
+        if channel is None:
+            raise discord.NotFound(_FakeResponse(404), "Unknown Channel")
+        return channel
+
+    async def fetch_user(self, user_id):
+        await self.stats.request('fetch_user')
+        return self.users.get(user_id)
+
+class _FakeResponse:
+    def __init__(self, status):
+        self.status = status
+        self.reason = "Not Found"
@@ -0,0 +1,270 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import discord
+from discord.ext import commands
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.config_cache import GuildConfigCache
+from utils.channels import ChannelResolver
+from utils.log_queue import LogQueue
+from utils.assets import IconStore
+from utils.audit_cache import AuditLogCache
+from utils.attachments import AttachmentArchiver
+from utils.message_store import MessageStore
+from utils.event_log import EventLogWriter
+from utils.mod_cases import ModCaseStore
+from utils.db import PoolHealthMonitor
+from utils.latency import LatencyWindow
+from benchmarks.fakes import Stats, FakePool, FakeWorld, FakeGuild, FakeTextChannel, FakeCategory, FakeMember, FakeRole, FakeMessage
+
+# Replays synthetic gateway event streams against the real cogs and reports
+# events/sec, handler latency percentiles, DB queries per event and REST calls per event.
+#
+#   python benchmarks/run.py                       # every scenario
+#   python benchmarks/run.py raid purge --rest-ms 50 --db-ms 2
+#   python benchmarks/run.py --json > before.json  # machine readable, for before/after comparisons
+
+# only the cogs with gateway listeners, ping samples the heartbeat which needs a real login
+COGS = ["Raid", "greetings", "logging", "moderation", "settings"]
+
+GUILD_ID = 1000
+LOG_CHANNEL_ID = 2000
+WELCOME_CHANNEL_ID = 2001
+
+class Harness:
+    def __init__(self, db_latency: float, rest_latency: float):
+        self.stats = Stats(db_latency, rest_latency)
+        self.world = FakeWorld(self.stats)
+        self.guild = self.world.add_guild(FakeGuild(self.stats, GUILD_ID))
+        self.everyone = FakeRole(self.guild, GUILD_ID, "@everyone")
+        self.admin_role = FakeRole(self.guild, 3000, "Admin", discord.Permissions(administrator=True), position=10)
+        self.guild.roles += [self.everyone, self.admin_role]
+        self.log_channel = self.world.add_channel(FakeTextChannel(self.stats, self.guild, LOG_CHANNEL_ID, "logs"))
+        self.welcome_channel = self.world.add_channel(FakeTextChannel(self.stats, self.guild, WELCOME_CHANNEL_ID, "welcome"))
+        owner = self.world.add_member(FakeMember(self.stats, self.guild, 4000, "owner", roles=[self.everyone, self.admin_role]))
+        self.guild.owner = owner
+        self.guild.owner_id = owner.id
+        for i in range(3):
+            self.world.add_member(FakeMember(self.stats, self.guild, 4001 + i, f"admin{i}", roles=[self.everyone, self.admin_role]))
+
+        info_rows = {GUILD_ID: {
+            'guild_id': GUILD_ID, 'prefix': '!', 'log_id': LOG_CHANNEL_ID, 'wlc_id': WELCOME_CHANNEL_ID, 'bye_id': None,
+            'wlc_title': "Welcome!", 'wlc_msg': "Hi {mention}, welcome to {server}", 'wlc_hex': None, 'wlc_pic': None,
+            'bye_title': None, 'bye_msg': None, 'bye_hex': None, 'bye_pic': None, 'raid_response_enabled': True,
+        }}
+        self.pool = FakePool(self.stats, info_rows)
+
+    async def start(self):
+        intents = discord.Intents.default()
+        intents.members = True
+        intents.message_content = True
+        bot = commands.Bot(command_prefix="!", help_command=None, intents=intents)
+        # the same shared objects Main.py attaches, pointed at the fakes
+        bot.pool = self.pool
+        bot.get_channel = self.world.channels.get
+        bot.get_guild = self.world.guilds.get
+        bot.fetch_channel = self.world.fetch_channel
+        bot.fetch_user = self.world.fetch_user
+        bot.channel_resolver = ChannelResolver(bot)
+        bot.log_queue = LogQueue(bot, flush_interval=0.01, max_flush_interval=0.1)
+        bot.icons = IconStore()
+        bot.audit_cache = AuditLogCache()
+        bot.attachments = AttachmentArchiver()
+        bot.message_store = MessageStore()
+        bot.config_cache = GuildConfigCache(self.pool)
+        bot.event_log = EventLogWriter(self.pool)
+        bot.mod_cases = ModCaseStore(self.pool)
+        bot.pool_health = PoolHealthMonitor(self.pool)
+        await bot.event_log.start()
+        await asyncio.gather(*(bot.load_extension(f"cogs.{name}") for name in COGS))
+        # flush channel update bursts quickly, the scenario waits for them anyway
+        bot.get_cog('Logging')._channel_updates.delay = 0.05
+        self.bot = bot
+        return bot
+
+    def listeners(self, event):
+        found = []
+        for cog in self.bot.cogs.values():
+            for name, method in cog.get_listeners():
+                if name == f"on_{event}":
+                    found.append(method)
+        return found
+
+    # Run every listener for one event (concurrently, like discord.py does) and time it
+    async def dispatch(self, event, *args):
+        start = perf_counter()
+        await asyncio.gather(*(listener(*args) for listener in self.listeners(event)))
+        return (perf_counter() - start) * 1000
+
+    # Wait for background work (log queue, channel update buffer, event log) to finish
+    async def drain(self):
+        await asyncio.sleep(0.1)
+        # channel update flushes can sit on an audit log lookup for a while, wait for them too
+        await self.bot.get_cog('Logging')._channel_updates.close()
+        while self.bot.log_queue.pending():
+            await asyncio.sleep(0.02)
+        await asyncio.sleep(0.1)
+        await self.bot.event_log.flush()
+
+    async def stop(self):
+        for name in COGS:
+            await self.bot.unload_extension(f"cogs.{name}")
+        await self.bot.log_queue.close()
+        await self.bot.event_log.close()
+        await self.bot.attachments.close()
+
+# ---------- scenarios ----------
+# Each yields (event_name, args) and can set things up on the harness first.
+
+def scenario_raid(h: Harness, count: int):
+    # `count` brand new accounts joining as fast as the gateway delivers them
+    for i in range(count):
+        member = h.world.add_member(FakeMember(h.stats, h.guild, 10_000 + i, f"raider{i}", roles=[h.everyone], created_days_ago=1, avatar=False))
+        yield "member_join", (member,)
+
+def scenario_purge(h: Harness, count: int):
+    author = h.world.add_member(FakeMember(h.stats, h.guild, 5000, "chatter", roles=[h.everyone]))
+    channel = h.world.add_channel(FakeTextChannel(h.stats, h.guild, 2100, "general"))
+    ids = []
+    for i in range(count):
+        message = FakeMessage(20_000 + i, channel, author, f"message number {i}")
+        ids.append(message.id)
+        yield "message", (message,)
+    payload = discord.RawBulkMessageDeleteEvent({'ids': [str(i) for i in ids], 'channel_id': str(channel.id), 'guild_id': str(h.guild.id)})
+    yield "raw_bulk_message_delete", (payload,)
+
+def scenario_single_deletes(h: Harness, count: int):
+    author = h.world.add_member(FakeMember(h.stats, h.guild, 5001, "chatter2", roles=[h.everyone]))
+    channel = h.world.add_channel(FakeTextChannel(h.stats, h.guild, 2101, "general-2"))
+    messages = [FakeMessage(40_000 + i, channel, author, f"message number {i}") for i in range(count)]
+    for message in messages:
+        yield "message", (message,)
+    for message in messages:
+        payload = discord.RawMessageDeleteEvent({'id': str(message.id), 'channel_id': str(channel.id), 'guild_id': str(h.guild.id)})
+        yield "raw_message_delete", (payload,)
+
+def scenario_channel_sync(h: Harness, count: int):
+    # a role's permissions changed on a category and every child channel synced with it
+    role = FakeRole(h.guild, 3100, "Muted")
+    h.guild.roles.append(role)
+    old = {role: discord.PermissionOverwrite(send_messages=True)}
+    new = {role: discord.PermissionOverwrite(send_messages=False, add_reactions=False)}
+    category = FakeCategory(h.guild, 2500, "text", overwrites=new)
+    for i in range(count):
+        after = h.world.add_channel(FakeTextChannel(h.stats, h.guild, 30_000 + i, f"channel-{i}", category=category, overwrites=dict(new), position=i))
+        before = after.copy(overwrites=dict(old))
+        yield "guild_channel_update", (before, after)
+
+def scenario_ban_wave(h: Harness, count: int):
+    # half of the bans come from the bot's /ban (registered by the moderation cog), half from the client
+    moderation = h.bot.get_cog('moderation')
+    for i in range(count):
+        user = h.world.add_member(FakeMember(h.stats, h.guild, 60_000 + i, f"spammer{i}", roles=[h.everyone]))
+        if i % 2 == 0:
+            asyncio.create_task(moderation._register_action(h.guild.id, user.id, "banned", author_id=4000, reason="spam", log_channel_id=LOG_CHANNEL_ID))
+        yield "member_ban", (h.guild, user)
+
+def scenario_role_reorder(h: Harness, count: int):
+    # a staff reshuffle: every team role moves up one position and the overwrite it has on its
+    # team channel is edited, so the role update burst comes with one channel update per channel
+    # (only the channel updates reach the logging cog, the role updates only touch the admin index)
+    roles = [FakeRole(h.guild, 70_000 + i, f"role-{i}", position=i + 1) for i in range(count)]
+    h.guild.roles += roles
+    channels = [h.world.add_channel(FakeTextChannel(h.stats, h.guild, 80_000 + i, f"team-{i}", overwrites={role: discord.PermissionOverwrite(view_channel=True, send_messages=True)}, position=i))
+                for i, role in enumerate(roles)]
+    for role, after in zip(roles, channels):
+        before = FakeRole(h.guild, role.id, role.name, role.permissions, position=role.position)
+        role.position += 1
+        yield "guild_role_update", (before, role)
+        old = after.copy(overwrites=dict(after.overwrites))
+        after.overwrites = {role: discord.PermissionOverwrite(view_channel=True, send_messages=False)}
+        yield "guild_channel_update", (old, after)
+
+SCENARIOS = {
+    'raid': (scenario_raid, 1000),
+    'purge': (scenario_purge, 500),
+    'single_deletes': (scenario_single_deletes, 500),
+    'channel_sync': (scenario_channel_sync, 200),
+    'ban_wave': (scenario_ban_wave, 200),
+    'role_reorder': (scenario_role_reorder, 200),
+}
+
+async def run_scenario(name, count, db_latency, rest_latency):
+    build, default_count = SCENARIOS[name]
+    h = Harness(db_latency, rest_latency)
+    await h.start()
+    h.stats.reset()
+
+    # like the gateway, every event is dispatched without waiting for the previous one to finish
+    latencies = LatencyWindow(size=None)
+    pending = []
+    start = perf_counter()
+    for event, args in build(h, count or default_count):
+        pending.append(asyncio.create_task(h.dispatch(event, *args)))
+        await asyncio.sleep(0)
+    for task in pending:
+        latencies.add(await task)
+    events = len(pending)
+    handled = perf_counter() - start
+    await h.drain()
+    total = perf_counter() - start
+    await h.stop()
+
+    db_queries = sum(h.stats.db.values())
+    rest_calls = sum(h.stats.rest.values())
+    return {
+        'scenario': name,
+        'events': events,
+        'events_per_sec': events / handled if handled else 0.0,
+        'p50_ms': latencies.percentile(50),
+        'p99_ms': latencies.percentile(99),
+        'total_s': total,
+        'db_queries': db_queries,
+        'db_per_event': db_queries / events,
+        'rest_calls': rest_calls,
+        'rest_per_event': rest_calls / events,
+        'rest_routes': dict(h.stats.rest),
+        'db_kinds': dict(h.stats.db),
+    }
+
+def print_table(results):
+    header = f"{'scenario':<16}{'events':>8}{'events/s':>11}{'p50 ms':>9}{'p99 ms':>9}{'DB/event':>10}{'REST/event':>12}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['scenario']:<16}{r['events']:>8}{r['events_per_sec']:>11.0f}{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['db_per_event']:>10.3f}{r['rest_per_event']:>12.3f}")
+    print()
+    for r in results:
+        routes = ", ".join(f"{route}={n}" for route, n in sorted(r['rest_routes'].items())) or "none"
+        print(f"{r['scenario']}: REST {routes}")
+
+async def main():
+    parser = argparse.ArgumentParser(description="Replay synthetic gateway events against the cogs")
+    parser.add_argument('scenarios', nargs='*', metavar='scenario', help=f"scenarios to run: {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument('--count', type=int, default=None, help="events per scenario (default depends on the scenario)")
+    parser.add_argument('--db-ms', type=float, default=0.0, help="simulated latency of every DB query")
+    parser.add_argument('--rest-ms', type=float, default=0.0, help="simulated latency of every REST call")
+    parser.add_argument('--json', action='store_true', help="print JSON instead of a table")
+    args = parser.parse_args()
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+
+    logging.disable(logging.WARNING)
+    results = []
+    for name in args.scenarios or list(SCENARIOS):
+        results.append(await run_scenario(name, args.count, args.db_ms / 1000, args.rest_ms / 1000))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+
+if __name__ == "__main__":
+    asyncio.run(main())
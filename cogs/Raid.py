@@ -1,4 +1,5 @@
 import discord
+import asyncio
 import logging
 from discord import app_commands, File
 from discord.ext import commands
@@ -13,27 +14,64 @@ def current_time():
     return now.strftime("%Y-%m-%d %H:%M:%S")
 
 # Get logging channel
-async def get_logging_channel(guild_id, pool, bot):
+async def get_logging_channel(guild_id, bot):
     try:
-        row = await pool.fetchrow('SELECT log_id FROM info WHERE guild_id = $1', int(guild_id))
+        row = await bot.config_cache.get(guild_id)
         if not row:
             return False
         log_id = row.get('log_id')
         if not log_id:
             return False
-        channel = await bot.fetch_channel(int(log_id))
-        return channel
+        channel = await bot.channel_resolver.resolve(log_id)
+        return channel or False
     except Exception as e:
         logging.error(f"get_logging_channel failed: {e}")
         return False
 
+def _is_admin(member) -> bool:
+    return member.guild_permissions.administrator and not member.bot
+
+# Ids of the (non bot) administrators of each guild, built from the member cache when the guild
+# becomes available and kept up to date by the raid cog's member/role listeners, so a raid never scans.
+class AdminIndex:
+    def __init__(self):
+        self._admins = {}
+
+    def build(self, guild):
+        self._admins[guild.id] = {member.id for member in guild.members if _is_admin(member)}
+
+    def get(self, guild):
+        admin_ids = self._admins.get(guild.id)
+        if admin_ids is None:
+            # not indexed yet, scan whatever is cached (never chunk in the middle of a raid)
+            return [member for member in guild.members if _is_admin(member)]
+        members = [guild.get_member(member_id) for member_id in admin_ids]
+        return [member for member in members if member is not None]
+
+    def update_member(self, member):
+        admin_ids = self._admins.get(member.guild.id)
+        if admin_ids is None:
+            return
+        if _is_admin(member):
+            admin_ids.add(member.id)
+        else:
+            admin_ids.discard(member.id)
+
+    def remove_member(self, guild_id, member_id):
+        admin_ids = self._admins.get(guild_id)
+        if admin_ids is not None:
+            admin_ids.discard(member_id)
+
+    def forget_guild(self, guild_id):
+        self._admins.pop(guild_id, None)
+
+admin_index = AdminIndex()
+
 # Get all admin members
-async def get_admin_members(guild):
+def get_admin_members(guild):
     admins = []
     try:
-        async for member in guild.fetch_members():
-            if member.guild_permissions.administrator and not member.bot:
-                admins.append(member)
+        admins = admin_index.get(guild)
     except Exception as e:
         logging.error(f"Error fetching admin members: {e}")
     return admins
@@ -45,8 +83,53 @@ class raid(commands.Cog):
 
     @commands.Cog.listener()
     async def on_ready(self):
-        await self.bot.tree.sync()
         logging.info("---|raid       cog loaded!|---  %s", current_time())
+        for guild in self.bot.guilds:
+            admin_index.build(guild)
+            # one guild at a time, big member lists shouldn't hold the loop
+            await asyncio.sleep(0)
+
+    # Keep admin_index in sync with the member cache
+
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild):
+        admin_index.build(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        admin_index.build(guild)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        admin_index.update_member(member)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        admin_index.remove_member(member.guild.id, member.id)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        if before.roles != after.roles:
+            admin_index.update_member(after)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        if before.permissions.administrator != after.permissions.administrator:
+            admin_index.build(after.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        if role.permissions.administrator:
+            admin_index.build(role.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before, after):
+        if before.owner_id != after.owner_id:
+            admin_index.build(after)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        admin_index.forget_guild(guild.id)
 
     # ============== RAID LOGIC ==============
     # Configuration Commands
@@ -93,6 +176,7 @@ class raid(commands.Cog):
                 'ON CONFLICT (guild_id) DO UPDATE SET raid_response_enabled = $2',
                 guild_id, True
             )
+            self.bot.config_cache.invalidate(guild_id)
             msg = "✅ **Raid response enabled** for this server."
             if is_slash:
                 await interaction_or_ctx.response.send_message(msg, ephemeral=True)
@@ -116,6 +200,7 @@ class raid(commands.Cog):
                 'ON CONFLICT (guild_id) DO UPDATE SET raid_response_enabled = $2',
                 guild_id, False
             )
+            self.bot.config_cache.invalidate(guild_id)
             msg = "⛔ **Raid response disabled** for this server."
             if is_slash:
                 await interaction_or_ctx.response.send_message(msg, ephemeral=True)
@@ -134,10 +219,7 @@ class raid(commands.Cog):
         guild_id = interaction_or_ctx.guild.id if is_slash else interaction_or_ctx.guild.id
         
         try:
-            result = await self.pool.fetchrow(
-                'SELECT raid_response_enabled FROM info WHERE guild_id = $1',
-                guild_id
-            )
+            result = await self.bot.config_cache.get(guild_id)
             
             status = "🟢 Enabled" if (result and result['raid_response_enabled']) else "🔴 Disabled"
             
@@ -151,15 +233,15 @@ class raid(commands.Cog):
             embed.add_field(name="Trigger actions", value="Disables invites and DMs for 1 hour", inline=False)
             embed.add_field(name="Account Flags", value="New account (< 7 days), No avatar", inline=False)
             embed.set_footer(text=f"UTC: {current_time()}")
-            embed.set_thumbnail(url="attachment://raid_icon.png")
+            embed.set_thumbnail(url="attachment://moderation_icon.png")
             
-            # Try to send with icon, fallback if file doesn't exist
+            # Try to send with icon, fallback if the upload fails
             try:
-                file = File("Images/moderation_icon.png", filename="raid_icon.png")
+                files = self.bot.icons.attach(embed)
                 if is_slash:
-                    await interaction_or_ctx.response.send_message(file=file, embed=embed, ephemeral=True)
+                    await interaction_or_ctx.response.send_message(files=files, embed=embed, ephemeral=True)
                 else:
-                    await interaction_or_ctx.send(file=file, embed=embed)
+                    await interaction_or_ctx.send(files=files, embed=embed)
             except:
                 if is_slash:
                     await interaction_or_ctx.response.send_message(embed=embed, ephemeral=True)
@@ -179,14 +261,15 @@ class raid(commands.Cog):
     async def execute_raid_response(self, guild, joining_members):
         """
         Execute full raid response:
-        1. Send alert to logging channel
-        2. Send alerts to admin DMs
-        3. Send alert to guild owner
-        4. Lock down guild (pause invites and DMs)
+        1. Lock down guild (pause invites and DMs), started first and run alongside the rest
+        2. Send alert to logging channel
+        3. Send alerts to admin and guild owner DMs (concurrently, each with a timeout)
+        4. Send a delivery report of the DMs to the logging channel
         """
+        lockdown = asyncio.create_task(self._lockdown_guild(guild))
         try:
             # Get logging channel
-            log_channel = await get_logging_channel(guild.id, self.pool, self.bot)
+            log_channel = await get_logging_channel(guild.id, self.bot)
             
             # Build raid alert embed
             alert_embed = await self._build_raid_alert_embed(guild, joining_members)
@@ -194,41 +277,74 @@ class raid(commands.Cog):
             # Send to logging channel
             if log_channel:
                 try:
-                    file = File("Images/moderation_icon.png", filename="moderation_icon.png")
-                    await log_channel.send(file=file, embed=alert_embed)
+                    message = await log_channel.send(files=self.bot.icons.attach(alert_embed), embed=alert_embed)
+                    self.bot.icons.remember(message)
                 except:
                     await log_channel.send(embed=alert_embed)
             
-            # Send to all admins via DM (deduplicated)
-            admins = await get_admin_members(guild)
+            # Send to all admins and the owner via DM (deduplicated)
+            admins = get_admin_members(guild)
             admin_embed = await self._build_raid_alert_embed(guild, joining_members, is_dm=True)
             
-            # Track sent users to avoid duplicate DMs
-            notified_ids = set()
+            recipients = {admin.id: admin for admin in admins}
+            if guild.owner is not None:
+                recipients.setdefault(guild.owner.id, guild.owner)
             
-            for admin in admins:
-                try:
-                    await admin.send(embed=admin_embed)
-                    notified_ids.add(admin.id)
-                except:
-                    logging.warning(f"Could not send raid DM to {admin} ({admin.id})")
+            report = await self._notify_admins(list(recipients.values()), admin_embed)
+            logging.info("Raid DMs for guild %s: %s delivered, %s failed, %s timed out", guild.id, len(report['delivered']), len(report['failed']), len(report['timed_out']))
             
-            # Send to guild owner only if not already notified as admin
-            if guild.owner.id not in notified_ids:
+            if log_channel:
                 try:
-                    await guild.owner.send(embed=admin_embed)
-                except:
-                    logging.warning(f"Could not send raid DM to guild owner {guild.owner} ({guild.owner.id})")
-            
-            # Execute guild lockdown
-            await self._lockdown_guild(guild)
+                    await log_channel.send(embed=self._build_delivery_report_embed(report))
+                except Exception:
+                    logging.exception("Could not send raid DM delivery report")
             
         except Exception as e:
             logging.error(f"Error executing raid response: {e}")
+        finally:
+            # Make sure the lockdown has finished before we're done
+            await lockdown
+
+    # DM every recipient at once (bounded), returns who got it, who didn't and who timed out
+    async def _notify_admins(self, recipients, embed) -> dict:
+        report = {'delivered': [], 'failed': [], 'timed_out': []}
+        semaphore = asyncio.Semaphore(RAID_DM_CONCURRENCY)
+
+        # Resolve the icon once: every DM shares the hosted url, or goes without a thumbnail
+        # rather than uploading the icon again for each admin
+        files = self.bot.icons.attach(embed)
+        if files:
+            for f in files:
+                f.close()
+            embed.set_thumbnail(url=None)
+
+        async def notify(user):
+            async with semaphore:
+                try:
+                    await asyncio.wait_for(user.send(embed=embed), timeout=RAID_DM_TIMEOUT)
+                    report['delivered'].append(user)
+                except asyncio.TimeoutError:
+                    logging.warning(f"Raid DM to {user} ({user.id}) timed out")
+                    report['timed_out'].append(user)
+                except Exception:
+                    logging.warning(f"Could not send raid DM to {user} ({user.id})")
+                    report['failed'].append(user)
+
+        await asyncio.gather(*(notify(user) for user in recipients))
+        return report
+
+    def _build_delivery_report_embed(self, report) -> discord.Embed:
+        embed = discord.Embed(title="🚨 Raid alert delivery", color=discord.Color.orange())
+        for name, key in (("Delivered", 'delivered'), ("Failed (DMs closed?)", 'failed'), ("Timed out", 'timed_out')):
+            users = report[key]
+            value = "\n".join(f"{user} ({user.id})" for user in users) or "None"
+            embed.add_field(name=f"{name}: {len(users)}", value=value[:1024], inline=False)
+        embed.set_footer(text=f"UTC: {current_time()}")
+        return embed
 
     async def _build_raid_alert_embed(self, guild, joining_members, is_dm=False) -> discord.Embed:
         # Import here to avoid circular imports
-        from cogs.Greetings import is_suspicious_account, get_suspicious_flags_string
+        from cogs.greetings import is_suspicious_account, get_suspicious_flags_string
         
         embed = discord.Embed(
             title="🚨 RAID ALERT 🚨",
@@ -303,6 +419,8 @@ class raid(commands.Cog):
 
 # Constants (must be defined after imports)
 RAID_DETECTION_WINDOW = 2  # Seconds
+RAID_DM_CONCURRENCY = 5  # Admin DMs sent at the same time
+RAID_DM_TIMEOUT = 10  # Seconds before giving up on a single DM
 
 
 async def setup(bot):
@@ -1,17 +1,66 @@
 import discord
+import typing
 import logging
 from discord.ext import commands
 from datetime import datetime, timezone, timedelta
 import re
+from collections import deque
+from time import monotonic
 
 logging.basicConfig(format='%(levelname)s:  %(message)s', level=logging.INFO)
 
 # ============== RAID LOGIC ==============
-# Dictionary to track join timestamps per guild for raid detection
-raid_join_tracker = {}
 # Raid detection thresholds (hardcoded)
 RAID_JOIN_THRESHOLD = 5  # Number of joins to trigger alert
 RAID_DETECTION_WINDOW = 2  # Seconds window for threshold
+RAID_COOLDOWN = 60  # Seconds without a join burst before a new raid can be reported
+RAID_MAX_REPORTED_MEMBERS = 20  # Members listed in the alert (embeds hold 25 fields)
+
+# Join rate of one guild.
+# Only the last RAID_JOIN_THRESHOLD join times are kept: the threshold is crossed when the
+# oldest of them is still inside the detection window, so every join is O(1).
+# Once a raid fires the guild stays latched until no burst has been seen for RAID_COOLDOWN.
+class GuildJoinWindow:
+    __slots__ = ('times', 'joins', 'raid_active', 'last_burst')
+
+    def __init__(self):
+        self.times = deque(maxlen=RAID_JOIN_THRESHOLD)
+        self.joins = deque(maxlen=RAID_MAX_REPORTED_MEMBERS)
+        self.raid_active = False
+        self.last_burst = 0.0
+
+    # Record a join, returns the joins to report when a new raid starts (None otherwise)
+    def add(self, member, now: float):
+        self.times.append(now)
+        self.joins.append({'timestamp': datetime.now(timezone.utc), 'member': member, 'monotonic': now})
+
+        if self.raid_active and now - self.last_burst > RAID_COOLDOWN:
+            self.raid_active = False
+
+        burst = len(self.times) == RAID_JOIN_THRESHOLD and now - self.times[0] <= RAID_DETECTION_WINDOW
+        if not burst:
+            return None
+        self.last_burst = now
+        if self.raid_active:
+            return None
+        self.raid_active = True
+        return [j for j in self.joins if now - j['monotonic'] <= RAID_DETECTION_WINDOW]
+
+class RaidJoinTracker:
+    def __init__(self):
+        self._guilds = {}
+
+    def add(self, member, now: float = None):
+        window = self._guilds.get(member.guild.id)
+        if window is None:
+            window = self._guilds[member.guild.id] = GuildJoinWindow()
+        return window.add(member, monotonic() if now is None else now)
+
+    def forget(self, guild_id):
+        self._guilds.pop(guild_id, None)
+
+# Tracks join rates per guild for raid detection
+raid_join_tracker = RaidJoinTracker()
 # ========================================
 
 #time
@@ -20,89 +69,65 @@ def current_time ():
     current_time = now.strftime("%Y-%m-%d %H:%M:%S")
     return current_time
 
-async def get_welcome(guild_id, welcome, Type, member, guild_name):
-    if Type == "channel":
-        welcome_channel = await welcome.pool.fetchrow('SELECT wlc_id FROM info WHERE guild_id = $1', guild_id)
-        try:
-            wlc_id = welcome_channel["wlc_id"]
-            welcome_channel = await welcome.bot.fetch_channel(wlc_id)
-        except:
-            welcome_channel = False
-        return welcome_channel
-    elif Type == "title":
-        welcome_title = await welcome.pool.fetchrow('SELECT wlc_title FROM info WHERE guild_id = $1', guild_id)
-        try:
-            wlc_title = welcome_title["wlc_title"]
-            welcome_title = wlc_title
-        except:
-            welcome_title = False
-        return welcome_title
-    elif Type == "hex":
-        welcome_hex = await welcome.pool.fetchrow('SELECT wlc_hex FROM info WHERE guild_id = $1', guild_id)
-        wlc_hex = welcome_hex["wlc_hex"]
-        if wlc_hex is None:
-            welcome_hex = discord.Color.from_rgb(1, 134, 0)
-        else:
-            return wlc_hex
-    elif Type == "message":
-        welcome_message = await welcome.pool.fetchrow('SELECT wlc_msg FROM info WHERE guild_id = $1', guild_id)
-        try:
-            wlc_msg = welcome_message["wlc_msg"]
-            welcome_message = wlc_msg.format(user=member, mention=member.mention, server=guild_name)
-        except:
-            welcome_message = False
-        return welcome_message
-    elif Type == "image":
-        welcome_image = await welcome.pool.fetchrow('SELECT wlc_pic FROM info WHERE guild_id = $1', guild_id)
-        try:
-            wlc_pic = welcome_image["wlc_pic"]
-            welcome_image = wlc_pic
-        except:
-            welcome_image = False
-        return welcome_image
+DEFAULT_GREETING_COLOR = discord.Color.from_rgb(1, 134, 0)
+
+# All welcome (wlc_*) or goodbye (bye_*) settings for a guild, read from one info row
+class GreetingConfig:
+    def __init__(self, kind: str, channel_id: typing.Optional[int], title: typing.Optional[str], hex: typing.Optional[str], message: typing.Optional[str], image: typing.Optional[str]):
+        self.kind = kind
+        self.channel_id = channel_id
+        self.title = title
+        self.hex = hex
+        self.message = message
+        self.image = image
+
+    @classmethod
+    def from_row(cls, row, kind: str) -> "GreetingConfig":
+        row = row or {}
+        return cls(
+            kind=kind,
+            channel_id=row.get(f"{kind}_id"),
+            title=row.get(f"{kind}_title"),
+            # the settings cog stores colors in *_rgb, older setups use *_hex
+            hex=row.get(f"{kind}_hex") or row.get(f"{kind}_rgb"),
+            message=row.get(f"{kind}_msg"),
+            image=row.get(f"{kind}_pic"),
+        )
 
-async def get_goodbye(guild_id, goodbye, Type, member, guild_name):
-    if Type == "channel":
-        goodbye_channel = await goodbye.pool.fetchrow('SELECT bye_id FROM info WHERE guild_id = $1', guild_id)
-        try:
-            bye_id = goodbye_channel["bye_id"]
-            goodbye_channel = await goodbye.bot.fetch_channel(bye_id)
-        except:
-            goodbye_channel = False
-        return goodbye_channel
-    elif Type == "title":
-        goodbye_title = await goodbye.pool.fetchrow('SELECT bye_title FROM info WHERE guild_id = $1', guild_id)
+    @property
+    def color(self) -> discord.Color:
+        if not self.hex:
+            return DEFAULT_GREETING_COLOR
         try:
-            bye_title = goodbye_title["bye_title"]
-            goodbye_title = bye_title
-        except:
-            goodbye_title = False
-        return goodbye_title
-    elif Type == "hex":
-        goodbye_hex = await goodbye.pool.fetchrow('SELECT bye_hex FROM info WHERE guild_id = $1', guild_id)
-        bye_hex = goodbye_hex["bye_hex"]
-        if bye_hex is None:
-            goodbye_hex = discord.Color.from_rgb(1, 134, 0)
-            return goodbye_hex
-        else:
-            return bye_hex
-        
-    elif Type == "message":
-        goodbye_message = await goodbye.pool.fetchrow('SELECT bye_msg FROM info WHERE guild_id = $1', guild_id)
-        try:
-            bye_msg = goodbye_message["bye_msg"]
-            goodbye_message = bye_msg.format(user=member, mention=member.mention, server=guild_name)
-        except:
-            goodbye_message = False
-        return goodbye_message
-    elif Type == "image":
-        goodbye_image = await goodbye.pool.fetchrow('SELECT bye_pic FROM info WHERE guild_id = $1', guild_id)
+            return discord.Color.from_str(str(self.hex))
+        except ValueError:
+            return DEFAULT_GREETING_COLOR
+
+    def format_message(self, member, guild_name):
         try:
-            bye_pic = goodbye_image["bye_pic"]
-            goodbye_image = bye_pic
-        except:
-            goodbye_image = False
-        return goodbye_image
+            return self.message.format(user=member, mention=member.mention, server=guild_name)
+        except Exception:
+            return False
+
+    def build_embed(self, member, guild_name) -> typing.Optional[discord.Embed]:
+        message = self.format_message(member, guild_name) if self.message else False
+        if not (message or self.title or self.image):
+            return None
+        embed = discord.Embed(title=self.title or "", color=self.color)
+        if message:
+            embed.add_field(name="", value=message, inline=True)
+        if self.image:
+            embed.set_image(url=self.image)
+        embed.set_footer(text=f"{member} ({member.id})\nUTC: {current_time()}")
+        return embed
+
+async def get_greeting_config(cog, guild_id, kind: str) -> GreetingConfig:
+    row = await cog.bot.config_cache.get(guild_id)
+    return GreetingConfig.from_row(row, kind)
+
+async def get_greeting_channel(cog, config: GreetingConfig):
+    channel = await cog.bot.channel_resolver.resolve(config.channel_id)
+    return channel or False
 
 # ============== RAID LOGIC ==============
 def is_suspicious_account(member) -> dict:
@@ -123,12 +148,9 @@ def is_suspicious_account(member) -> dict:
     
     return flags
 
-async def check_raid_response_enabled(guild_id, pool) -> bool:
+async def check_raid_response_enabled(guild_id, config_cache) -> bool:
     try:
-        result = await pool.fetchrow(
-            'SELECT raid_response_enabled FROM info WHERE guild_id = $1', 
-            guild_id
-        )
+        result = await config_cache.get(guild_id)
         if result:
             return result['raid_response_enabled']
     except Exception as e:
@@ -151,67 +173,27 @@ class greetings(commands.Cog):
     
     @commands.Cog.listener()
     async def on_ready(self):
-        await self.bot.tree.sync()
         logging.info("---|greetings  cog loaded!|---  %s", current_time())
 
     @commands.Cog.listener()
     async def on_member_join(self, member):
         # ============== RAID LOGIC ==============
         # Check if raid response is enabled
-        raid_enabled = await check_raid_response_enabled(member.guild.id, self.pool)
+        raid_enabled = await check_raid_response_enabled(member.guild.id, self.bot.config_cache)
         
         if raid_enabled:
-            # Initialize guild tracker if not exists
-            if member.guild.id not in raid_join_tracker:
-                raid_join_tracker[member.guild.id] = []
-            
-            # Add current join with timestamp
-            current_time_obj = datetime.now(timezone.utc)
-            raid_join_tracker[member.guild.id].append({
-                'timestamp': current_time_obj,
-                'member': member
-            })
-            
-            # Remove joins older than detection window
-            cutoff_time = current_time_obj - timedelta(seconds=RAID_DETECTION_WINDOW)
-            raid_join_tracker[member.guild.id] = [
-                j for j in raid_join_tracker[member.guild.id]
-                if j['timestamp'] > cutoff_time
-            ]
-            
-            # Check if raid threshold exceeded
-            if len(raid_join_tracker[member.guild.id]) >= RAID_JOIN_THRESHOLD:
+            # Returns the recent joins only on the join that starts a raid
+            raid_joins = raid_join_tracker.add(member)
+            if raid_joins:
                 # Trigger raid response (will be handled in Raid.py)
-                await self.trigger_raid_alert(member.guild, raid_join_tracker[member.guild.id])
+                await self.trigger_raid_alert(member.guild, raid_joins)
         # ========================================
         
-        guild_id = member.guild.id
-        guild_name = member.guild
-        Type = "channel"
-        channel = await get_welcome(guild_id, self, Type, member, guild_name)
+        config = await get_greeting_config(self, member.guild.id, "wlc")
+        channel = await get_greeting_channel(self, config)
         if channel:
-            Type = "title"
-            title = await get_welcome(guild_id, self, Type, member, guild_name)
-
-            Type = "hex"
-            hex = await get_welcome(guild_id, self, Type, member, guild_name)
-
-            Type = "message"
-            message = await get_welcome(guild_id, self, Type, member, guild_name)
-
-            Type = "image"
-            image = await get_welcome(guild_id, self, Type, member, guild_name)
-
-            if message or title or image:
-                if title:
-                    welcome_embed = discord.Embed(title=title, color=discord.Color.from_str(hex))
-                else:
-                    welcome_embed = discord.Embed(title="", color=discord.Color.from_str(hex))      
-                if message:
-                    welcome_embed.add_field(name="", value=message, inline=True)
-                if image:
-                    welcome_embed.set_image(url=image)
-                welcome_embed.set_footer(text=f"{member} ({member.id})\nUTC: {current_time()}")
+            welcome_embed = config.build_embed(member, member.guild)
+            if welcome_embed:
                 await channel.send(member.mention, embed=welcome_embed)
     
     # ============== RAID LOGIC ==============
@@ -227,37 +209,19 @@ class greetings(commands.Cog):
             logging.error(f"Error triggering raid alert: {e}")
     # ========================================
             
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        raid_join_tracker.forget(guild.id)
+
     @commands.Cog.listener()
     async def on_member_remove(self, member):
-        guild_id = member.guild.id
-        guild_name = member.guild
-        Type = "channel"
-        channel = await get_goodbye(guild_id, self, Type, member, guild_name)
+        config = await get_greeting_config(self, member.guild.id, "bye")
+        channel = await get_greeting_channel(self, config)
         if channel == False:
             return  
         else:
-            Type = "title"
-            title = await get_goodbye(guild_id, self, Type, member, guild_name)
-
-            Type = "hex"
-            hex = await get_goodbye(guild_id, self, Type, member, guild_name)
-
-            Type = "message"
-            message = await get_goodbye(guild_id, self, Type, member, guild_name)
-
-            Type = "image"
-            image = await get_goodbye(guild_id, self, Type, member, guild_name)
-
-            if message or title or image:
-                if title:
-                    goodbye_embed = discord.Embed(title=title, color=discord.Color.from_str(hex))
-                else:
-                    goodbye_embed = discord.Embed(title="", color=discord.Color.from_str(hex))
-                if message:
-                    goodbye_embed.add_field(name="", value=f"" + message, inline=True)
-                if image:
-                    goodbye_embed.set_image(url=image)
-                goodbye_embed.set_footer(text=f"{member} ({member.id})\nUTC: {current_time()}")
+            goodbye_embed = config.build_embed(member, member.guild)
+            if goodbye_embed:
                 await channel.send(embed=goodbye_embed)
 
 async def setup(bot):
@@ -77,7 +77,6 @@ class help(commands.Cog):
     
     @commands.Cog.listener()
     async def on_ready(self):
-        await self.bot.tree.sync()
         logging.info("---|Help       cog loaded!|---  %s", current_time())
 
     @app_commands.command(name="help", description="command help list")
@@ -17,7 +17,6 @@ class issue(commands.Cog):
     
     @commands.Cog.listener()
     async def on_ready(self):
-        await self.bot.tree.sync()
         logging.info("---|Issue      cog loaded!|---  %s", current_time())
 
     @commands.hybrid_command(name="issue", description="report a bug", aliases=["Issue"])
@@ -1,8 +1,12 @@
+import asyncio
 import discord
 import logging
 from discord.ext import commands
 from datetime import datetime, timezone, timedelta
 import io
+from utils.permission_diff import changed_mask, compare_overwrites, format_overwrite, format_states, overwrite_bits, overwrites_of
+from utils.channel_updates import ChannelUpdateBuffer
+from utils.message_store import CachedMessage
 
 # Time
 
@@ -38,60 +42,18 @@ def create_standard_update_embed(title: str, description: str, before_value: str
         except Exception:
             return None
 
-# Permission labels for prettier display
-PERM_LABELS = {
-    'view_channel': 'View Channel',
-    'send_messages': 'Send Messages',
-    'send_tts_messages': 'Send TTS Messages',
-    'manage_messages': 'Manage Messages',
-    'embed_links': 'Embed Links',
-    'attach_files': 'Attach Files',
-    'read_message_history': 'Read Message History',
-    'mention_everyone': 'Mention everyone',
-    'use_external_emojis': 'Use External Emojis',
-    'add_reactions': 'Add Reactions',
-    'manage_roles': 'Manage Roles',
-    'manage_channels': 'Manage Channels',
-    'manage_webhooks': 'Manage Webhooks',
-    'connect': 'Connect (voice)',
-    'speak': 'Speak (voice)',
-    'mute_members': 'Mute Members',
-    'deafen_members': 'Deafen Members',
-    'move_members': 'Move Members',
-    'priority_speaker': 'Priority Speaker',
-    'create_instant_invite': 'Create Instant Invite',
-    'manage_threads': 'Manage Threads',
-    'send_messages_in_threads': 'Send Messages In Threads',
-    'use_application_commands': 'Use Application Commands',
-    'moderate_members': 'Moderate Members'
-}
-
-def _pretty_perm_label(key: str) -> str:
-    return PERM_LABELS.get(key, key.replace('_', ' ').title())
-
-def _perm_state_symbol(state: str) -> str:
-    if state == 'Allow':
-        return ':green_square:'
-    if state == 'Disallow':
-        return ':red_square:'
-    return ':white_large_square:'
-
-def _format_perm_state(key: str, state: str) -> str:
-    # place the emoji on the right side of permission
-    return f"{_pretty_perm_label(key)} {_perm_state_symbol(state)}"
-
 # Get logging channel
 
 async def get_logging_channel(cog, guild_id):
     try:
-        row = await cog.pool.fetchrow('SELECT log_id FROM info WHERE guild_id = $1', int(guild_id))
+        row = await cog.bot.config_cache.get(guild_id)
         if not row:
             return False
         log_id = row.get('log_id')
         if not log_id:
             return False
-        channel = await cog.bot.fetch_channel(int(log_id))
-        return channel
+        channel = await cog.bot.channel_resolver.resolve(log_id)
+        return channel or False
     except Exception:
         logging.exception("get_logging_channel failed")
         return False
@@ -165,76 +127,38 @@ def format_timeout_display(dt):
 # Find who executed an audit-log action for a given target id
 async def find_audit_executor(cog, guild, action, target_id, window: int = 30):
     try:
-        now = datetime.now(timezone.utc)
-        # normalize target id
-        try:
-            target_val = int(getattr(target_id, 'id', target_id))
-        except Exception:
-            target_val = getattr(target_id, 'id', None) if hasattr(target_id, 'id') else None
-        async for entry in guild.audit_logs(limit=24, action=action):
-            try:
-                entry_target_id = getattr(entry.target, 'id', None)
-                if entry_target_id is None:
-                    # some audit entries may store the target differently; compare string repr fallback
-                    if str(entry.target) == str(target_id):
-                        entry_target_id = getattr(entry.target, 'id', None)
-                if entry_target_id is None and target_val is None:
-                    continue
-                if entry_target_id is not None and target_val is not None and int(entry_target_id) == int(target_val):
-                    if (now - entry.created_at).total_seconds() <= window:
-                        author = entry.user
-                        reason = entry.reason if getattr(entry, 'reason', None) else None
-                        return (author, reason)
-            except Exception:
-                continue
-    except discord.Forbidden:
-        logging.warning("find_audit_executor: missing View Audit Log permission for guild %s", getattr(guild, 'id', None))
+        entry = await cog.bot.audit_cache.find(guild, action, target_id, window=window)
+        if entry is not None:
+            reason = entry.reason if getattr(entry, 'reason', None) else None
+            return (entry.user, reason)
     except Exception:
         logging.exception("find_audit_executor: error while reading audit logs")
     return (None, None)
 
 
+# True when a member_update audit entry changed the member's timeout
+def _is_timeout_entry(entry):
+    changes = getattr(entry, 'changes', None)
+    if not changes:
+        return False
+    try:
+        for ch in changes:
+            key = getattr(ch, 'key', None)
+            if key in ('communication_disabled_until', 'timed_out_until'):
+                return True
+    except Exception:
+        if 'communication_disabled_until' in str(changes) or 'timed_out_until' in str(changes):
+            return True
+    return False
+
+
 def _format_overwrite_obj(o):
     try:
-        # If it's a PermissionOverwrite, produce per-permission Allow/Disallow/N/A lines
+        # If it's a PermissionOverwrite, produce per-permission Allow/Disallow lines
         if isinstance(o, discord.PermissionOverwrite):
-            perms = [
-                'view_channel', 'send_messages', 'send_tts_messages', 'manage_messages', 'embed_links', 'attach_files',
-                'read_message_history', 'mention_everyone', 'use_external_emojis', 'add_reactions', 'manage_roles',
-                'manage_channels', 'manage_webhooks', 'connect', 'speak', 'mute_members', 'deafen_members', 'move_members',
-                'priority_speaker', 'create_instant_invite', 'manage_threads', 'send_messages_in_threads',
-                'use_application_commands', 'moderate_members'
-            ]
-            parts = []
-            try:
-                allow, deny = o.pair()
-            except Exception:
-                allow = None
-                deny = None
-            for p in perms:
-                a = getattr(allow, p, False) if allow is not None else False
-                d = getattr(deny, p, False) if deny is not None else False
-                # Only include permissions explicitly set (Allow or Disallow). If neither, treat as N/A and skip.
-                if a and not d:
-                    state = 'Allow'
-                elif d and not a:
-                    state = 'Disallow'
-                else:
-                    continue
-                parts.append(f"{p}: {state}")
-            # return one-per-line, indented for readability
-            if parts:
-                # map keys to pretty labels with emoji
-                pretty_lines = []
-                for raw in parts:
-                    try:
-                        if isinstance(raw, str) and ': ' in raw:
-                            k, st = raw.split(': ', 1)
-                            pretty_lines.append(_format_perm_state(k, st))
-                        else:
-                            pretty_lines.append(str(raw))
-                    except Exception:
-                        pretty_lines.append(str(raw))
+            # Only permissions explicitly set (Allow or Disallow) are listed
+            pretty_lines = format_overwrite(o)
+            if pretty_lines:
                 return "\n  " + "\n  ".join(pretty_lines)
             return str(o)
         # Role/User object keys - show a readable name
@@ -250,70 +174,24 @@ def _format_overwrite_obj(o):
 def diff_overwrites(before, after):
     lines = []
     try:
-        before_map = getattr(before, 'overwrites', None) or getattr(before, 'overwrites_map', None) or {}
-        after_map = getattr(after, 'overwrites', None) or getattr(after, 'overwrites_map', None) or {}
-        # Normalize to dicts
-        try:
-            before_items = dict(before_map.items())
-        except Exception:
-            before_items = dict(before_map) if isinstance(before_map, dict) else {}
-        try:
-            after_items = dict(after_map.items())
-        except Exception:
-            after_items = dict(after_map) if isinstance(after_map, dict) else {}
-
-        perms = [
-            'view_channel', 'send_messages', 'send_tts_messages', 'manage_messages', 'embed_links', 'attach_files',
-            'read_message_history', 'mention_everyone', 'use_external_emojis', 'add_reactions', 'manage_roles',
-            'manage_channels', 'manage_webhooks', 'connect', 'speak', 'mute_members', 'deafen_members', 'move_members',
-            'priority_speaker', 'create_instant_invite', 'manage_threads', 'send_messages_in_threads',
-            'use_application_commands', 'moderate_members'
-        ]
-
-        all_keys = set(list(before_items.keys()) + list(after_items.keys()))
-        for key in all_keys:
-            b = before_items.get(key)
-            a = after_items.get(key)
-
-            def build_state_map(obj):
-                state = {}
-                if obj is None:
-                    return state
-                try:
-                    allow, deny = obj.pair()
-                except Exception:
-                    allow = None
-                    deny = None
-                for p in perms:
-                    a_val = getattr(allow, p, False) if allow is not None else False
-                    d_val = getattr(deny, p, False) if deny is not None else False
-                    if a_val and not d_val:
-                        state[p] = 'Allow'
-                    elif d_val and not a_val:
-                        state[p] = 'Disallow'
-                    else:
-                        # N/A, skip
-                        continue
-                return state
+        before_items = overwrites_of(before)
+        after_items = overwrites_of(after)
 
-            state_b = build_state_map(b)
-            state_a = build_state_map(a)
-
-            if not state_b and state_a:
-                # Added overwrite: list only explicitly set perms in 'a'
-                block = "\n  ".join([_format_perm_state(p, state_a[p]) for p in perms if p in state_a])
+        for key in set(before_items) | set(after_items):
+            diff = compare_overwrites(before_items.get(key), after_items.get(key))
+            if diff is None:
+                continue
+            kind, before_lines, after_lines = diff
+            if kind == 'Added':
+                block = "\n  ".join(after_lines)
                 lines.append(f"Added overwrite for {key}:\n  {block}")
-            elif not state_a and state_b:
-                # Removed overwrite: list only explicitly set perms in 'b'
-                block = "\n  ".join([_format_perm_state(p, state_b[p]) for p in perms if p in state_b])
+            elif kind == 'Removed':
+                block = "\n  ".join(before_lines)
                 lines.append(f"Removed overwrite for {key}:\n  {block}")
             else:
-                # Compare per-permission and include only those that changed
-                changed_perms = [p for p in perms if state_b.get(p) != state_a.get(p)]
-                if changed_perms:
-                    before_block = "\n  ".join([_format_perm_state(p, state_b.get(p, 'N/A')) for p in changed_perms])
-                    after_block = "\n  ".join([_format_perm_state(p, state_a.get(p, 'N/A')) for p in changed_perms])
-                    lines.append(f"Changed overwrite for {key}:\nBefore:\n  {before_block}\nAfter:\n  {after_block}")
+                before_block = "\n  ".join(before_lines)
+                after_block = "\n  ".join(after_lines)
+                lines.append(f"Changed overwrite for {key}:\nBefore:\n  {before_block}\nAfter:\n  {after_block}")
     except Exception:
         logging.exception("diff_overwrites failed")
     return lines
@@ -334,13 +212,53 @@ def diff_integrations(before, after):
         logging.exception("diff_integrations failed")
     return lines
 
+# Plain text transcript of deleted messages, oldest first
+def _build_transcript(messages):
+    lines = []
+    for message in messages:
+        sent = discord.utils.snowflake_time(message.id).strftime("%Y-%m-%d %H:%M:%S")
+        lines.append(f"[{sent} UTC] {message.author_name} ({message.author_id}): {message.content}")
+        for a in message.attachments:
+            lines.append(f"    Attachment: {a.filename} {a.url}")
+    return "\n".join(lines) + "\n"
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.webp')
+
+# First image-like attachment, or None
+def _first_image(attachments):
+    for a in attachments:
+        ctype = getattr(a, 'content_type', None) or ''
+        name = getattr(a, 'filename', '') or ''
+        if ctype.startswith('image') or name.lower().endswith(IMAGE_EXTENSIONS):
+            return a
+    return None
+
+# Channel update coalescing
+CHANNEL_UPDATE_DELAY = 2.0  # Seconds without a new update before a channel's changes are logged
+CHANNEL_UPDATE_MAX_DELAY = 10.0  # Never hold updates longer than this
+CATEGORY_SYNC_MIN_CHANNELS = 3  # Permission-only syncs of this many channels are logged as one record
+CHANNEL_UPDATE_ATTRS = ["name", "topic", "nsfw", "position", "category", "bitrate", "user_limit", "rate_limit_per_user", "slowmode_delay", "rtc_region"]
+
+# True when the only thing that changed is the permission overwrites and the channel now matches its category
+def _is_category_sync(before, after):
+    if getattr(after, 'category', None) is None or not getattr(after, 'permissions_synced', False):
+        return False
+    before_lines, after_lines = diff_attrs(before, after, CHANNEL_UPDATE_ATTRS)
+    if before_lines or after_lines:
+        return False
+    return overwrites_of(before) != overwrites_of(after)
+
 # Logging
 
 class Logging(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.pool = bot.pool
-        self._recent_channel_updates = {}
+        # bursts of channel update events are merged per channel before they are logged
+        self._channel_updates = ChannelUpdateBuffer(self._flush_channel_updates, delay=CHANNEL_UPDATE_DELAY, max_delay=CHANNEL_UPDATE_MAX_DELAY)
+
+    async def cog_unload(self):
+        await self._channel_updates.close()
 
     # Check recent moderation actions from The Holy Roller
 
@@ -370,120 +288,116 @@ class Logging(commands.Cog):
     async def on_ready(self):
         logging.info("---|Logging    cog loaded!|---  %s", current_time())
 
-    # Log message deletions
+    # Show an image attachment in the embed, re-uploaded when it fits the archive limits (works when
+    # attachment URLs are restricted) and linked by URL otherwise
+    async def _attach_image(self, embed, attachment):
+        file_image = await self.bot.attachments.archive(attachment)
+        try:
+            if file_image is not None:
+                embed.set_image(url=f"attachment://{file_image.filename}")
+            else:
+                embed.set_image(url=attachment.url)
+        except Exception:
+            pass
+        return file_image
+
+    # Structured copy of an event for the event_log table (kept even when no logging channel is set)
+    def _record(self, guild_id, event, **fields):
+        try:
+            self.bot.event_log.record(guild_id, event, **fields)
+        except Exception:
+            logging.exception("failed to record %s event", event)
+
+    # Keep a copy of every guild message so deletions/edits can be logged after discord.py's cache has dropped it
 
     @commands.Cog.listener()
-    async def on_message_delete(self, message):
+    async def on_message(self, message):
         if message.guild is None or message.author.bot:
             return
-        channel = await get_logging_channel(self, message.guild.id)
+        self.bot.message_store.add(message)
+
+    # Stored copy of a message, falling back to discord.py's cache
+    def _cached_message(self, guild_id, message_id, discord_cached, pop=False):
+        store = self.bot.message_store
+        cached = store.pop(guild_id, message_id) if pop else store.get(guild_id, message_id)
+        if cached is None and discord_cached is not None and not discord_cached.author.bot:
+            cached = CachedMessage.from_message(discord_cached)
+        return cached
+
+    # Log message deletions
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload):
+        if payload.guild_id is None:
+            return
+        message = self._cached_message(payload.guild_id, payload.message_id, payload.cached_message, pop=True)
+        if message is not None:
+            self._record(payload.guild_id, "message_delete", target_id=message.author_id, channel_id=payload.channel_id, details={'message_id': payload.message_id, 'content': message.content, 'attachments': [a.url for a in message.attachments]})
+        # not seen since the bot started (or sent by a bot), nothing to show
+        if message is None:
+            return
+        channel = await get_logging_channel(self, payload.guild_id)
         if channel:
             # Build embed
             content = message.content or ""
             embed = discord.Embed(
                 title="Message Deleted",
-                description=f"**Author:** {message.author.mention}\n**Channel:** {message.channel.mention}\n**Content:** {content}",
+                description=f"**Author:** {message.author_mention}\n**Channel:** {message.channel_mention}\n**Content:** {content}",
                 color=discord.Color.red(),
                 timestamp=datetime.now(timezone.utc)
             )
-            embed.set_footer(text=f"Action made by: {message.author} ({message.author.id}).\nUTC: {current_time()}")
+            embed.set_footer(text=f"Action made by: {message.author_name} ({message.author_id}).\nUTC: {current_time()}")
 
             # If the message had attachments, try to include them (prefer images)
+            file_image = None
             try:
-                attachments = getattr(message, 'attachments', []) or []
+                attachments = message.attachments
                 if attachments:
                     # find first image-like attachment
-                    img_url = None
-                    img_exts = ('.png', '.jpg', '.jpeg', '.gif', '.webp')
-                    for a in attachments:
-                        try:
-                            ctype = getattr(a, 'content_type', None) or ''
-                        except Exception:
-                            ctype = ''
-                        name = getattr(a, 'filename', '') or ''
-                        if ctype.startswith('image') or name.lower().endswith(img_exts):
-                            img_url = getattr(a, 'url', None)
-                            break
-                    file_image = None
-                    if img_url:
-                        # Prefer embedding the attachment as a file (works when attachment URLs are restricted)
-                        try:
-                            data = await a.read()
-                            file_image = discord.File(io.BytesIO(data), filename=getattr(a, 'filename', 'attached_image'))
-                            embed.set_image(url=f"attachment://{getattr(a, 'filename', 'attached_image')}")
-                        except Exception:
-                            # fallback to remote URL if read() fails
-                            try:
-                                embed.set_image(url=img_url)
-                            except Exception:
-                                pass
+                    img = _first_image(attachments)
+                    if img is not None:
+                        file_image = await self._attach_image(embed, img)
                     # list attachments as field for reference
                     try:
-                        att_lines = [f"{getattr(a, 'filename', str(a))}: {getattr(a, 'url', '')}" for a in attachments]
+                        att_lines = [f"{a.filename}: {a.url}" for a in attachments]
                         embed.add_field(name="Attachments", value="\n".join(att_lines)[:1024], inline=False)
                     except Exception:
                         pass
             except Exception:
-                logging.exception("on_message_delete: failed to process attachments")
+                logging.exception("on_raw_message_delete: failed to process attachments")
 
-            icon_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")  
             embed.set_thumbnail(url="attachment://moderation_icon.png")
             try:
-                if file_image:
-                    await channel.send(files=[icon_file, file_image], embed=embed)
-                else:
-                    await channel.send(file=icon_file, embed=embed)
+                await self.bot.log_queue.send(channel, file=file_image, embed=embed)
             except Exception:
-                logging.exception("on_message_delete: failed to send embed")
+                logging.exception("on_raw_message_delete: failed to send embed")
 
     # Log message edits (before/after)
 
     @commands.Cog.listener()
-    async def on_message_edit(self, before, after):
-        if before.guild is None or before.author.bot or before.content == after.content:
+    async def on_raw_message_edit(self, payload):
+        after = payload.message
+        if payload.guild_id is None or after.author.bot:
             return
-        channel = await get_logging_channel(self, before.guild.id)
+        before = self._cached_message(payload.guild_id, payload.message_id, payload.cached_message)
+        self.bot.message_store.update(after)
+        # embed unfurls also send an update, only log real content changes of messages we have seen
+        if before is None or before.content == (after.content or ""):
+            return
+        self._record(payload.guild_id, "message_edit", target_id=after.author.id, channel_id=payload.channel_id, details={'message_id': payload.message_id, 'before': before.content, 'after': after.content})
+        channel = await get_logging_channel(self, payload.guild_id)
         if channel:
-            desc = f"The content of a message by {before.author.mention} in {before.channel.mention} was updated."
+            desc = f"The content of a message by {after.author.mention} in {after.channel.mention} was updated."
             embed = create_standard_update_embed("Message Edited", desc, before.content or "None", after.content or "None", color=discord.Color.orange())
 
             # If either version had attachments, include them. Prefer showing the 'before' image if available.
+            file_image = None
             try:
-                b_atts = getattr(before, 'attachments', []) or []
+                b_atts = before.attachments
                 a_atts = getattr(after, 'attachments', []) or []
-                img_url = None
-                img_exts = ('.png', '.jpg', '.jpeg', '.gif', '.webp')
-                for a in b_atts:
-                    try:
-                        ctype = getattr(a, 'content_type', None) or ''
-                    except Exception:
-                        ctype = ''
-                    name = getattr(a, 'filename', '') or ''
-                    if ctype.startswith('image') or name.lower().endswith(img_exts):
-                        img_url = getattr(a, 'url', None)
-                        break
-                if not img_url:
-                    for a in a_atts:
-                        try:
-                            ctype = getattr(a, 'content_type', None) or ''
-                        except Exception:
-                            ctype = ''
-                        name = getattr(a, 'filename', '') or ''
-                        if ctype.startswith('image') or name.lower().endswith(img_exts):
-                            img_url = getattr(a, 'url', None)
-                            break
-                file_image = None
-                if img_url:
-                    # Prefer embedding the attachment as a file (works when attachment URLs are restricted)
-                    try:
-                        data = await a.read()
-                        file_image = discord.File(io.BytesIO(data), filename=getattr(a, 'filename', 'attached_image'))
-                        embed.set_image(url=f"attachment://{getattr(a, 'filename', 'attached_image')}")
-                    except Exception:
-                        try:
-                            embed.set_image(url=img_url)
-                        except Exception:
-                            pass
+                img = _first_image(b_atts) or _first_image(a_atts)
+                if img is not None:
+                    file_image = await self._attach_image(embed, img)
                 # include attachments lists
                 try:
                     if b_atts:
@@ -495,21 +409,72 @@ class Logging(commands.Cog):
                 except Exception:
                     pass
             except Exception:
-                logging.exception("on_message_edit: failed to process attachments")
+                logging.exception("on_raw_message_edit: failed to process attachments")
 
-            icon_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")  
             try:
-                if file_image:
-                    await channel.send(files=[icon_file, file_image], embed=embed)
-                else:
-                    await channel.send(file=icon_file, embed=embed)
+                await self.bot.log_queue.send(channel, file=file_image, embed=embed)
+            except Exception:
+                logging.exception("on_raw_message_edit: failed to send embed")
+
+    # Log purges as one entry with a transcript of the deleted messages
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload):
+        if payload.guild_id is None:
+            return
+        discord_cached = {m.id: m for m in payload.cached_messages}
+        messages = []
+        for message_id in sorted(payload.message_ids):
+            message = self._cached_message(payload.guild_id, message_id, discord_cached.get(message_id), pop=True)
+            if message is not None:
+                messages.append(message)
+        self._record(payload.guild_id, "message_bulk_delete", channel_id=payload.channel_id, details={'count': len(payload.message_ids), 'message_ids': sorted(payload.message_ids)})
+
+        channel = await get_logging_channel(self, payload.guild_id)
+        if not channel:
+            return
+        total = len(payload.message_ids)
+        embed = discord.Embed(
+            title="Messages Bulk Deleted",
+            description=f"**{total}** messages were deleted in <#{payload.channel_id}>.",
+            color=discord.Color.red(),
+            timestamp=datetime.now(timezone.utc)
+        )
+        transcript = None
+        if messages:
+            authors = {}
+            for message in messages:
+                authors[message.author_mention] = authors.get(message.author_mention, 0) + 1
+            top = sorted(authors.items(), key=lambda item: item[1], reverse=True)[:15]
+            embed.add_field(name="Authors", value="\n".join(f"{mention}: {count}" for mention, count in top)[:1024], inline=False)
+            if len(messages) < total:
+                embed.add_field(name="Transcript", value=f"{len(messages)} of {total} messages were cached (messages from bots are not kept).", inline=False)
+            transcript = discord.File(io.BytesIO(_build_transcript(messages).encode('utf-8')), filename=f"deleted-messages-{payload.channel_id}.txt")
+        else:
+            embed.add_field(name="Transcript", value="None of the messages were cached.", inline=False)
+
+        guild = self.bot.get_guild(payload.guild_id)
+        executor = None
+        if guild is not None:
+            try:
+                executor, reason = await find_audit_executor(self, guild, discord.AuditLogAction.message_bulk_delete, payload.channel_id, window=30)
             except Exception:
-                logging.exception("on_message_edit: failed to send embed")
+                executor = None
+        if executor:
+            embed.set_footer(text=f"Action made by: {executor} ({executor.id}).\nUTC: {current_time()}")
+        else:
+            embed.set_footer(text=f"Action made by: Unknown.\nUTC: {current_time()}")
+        embed.set_thumbnail(url="attachment://moderation_icon.png")
+        try:
+            await self.bot.log_queue.send(channel, file=transcript, embed=embed)
+        except Exception:
+            logging.exception("on_raw_bulk_message_delete: failed to send embed")
 
     # New member joined the guild
 
     @commands.Cog.listener()
     async def on_member_join(self, member):
+        self._record(member.guild.id, "member_join", target_id=member.id, details={'created_at': member.created_at})
         channel = await get_logging_channel(self, member.guild.id)
         if channel:
             embed = discord.Embed(
@@ -519,10 +484,9 @@ class Logging(commands.Cog):
                 timestamp=datetime.now(timezone.utc)
             )
             embed.set_footer(text=f"Action made by: {member} ({member.id}).\nUTC: {current_time()}")
-            image_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")  
             embed.set_thumbnail(url="attachment://moderation_icon.png")
             try:
-                await channel.send(file=image_file, embed=embed)
+                await self.bot.log_queue.send(channel, embed=embed)
             except Exception:
                 logging.exception("on_member_join: failed to send embed")
 
@@ -530,55 +494,54 @@ class Logging(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_remove(self, member):
+        self._record(member.guild.id, "member_remove", target_id=member.id)
         channel = await get_logging_channel(self, member.guild.id)
         if not channel:
             return
         kicked = False
 
         # Look for a recent kick in the audit log
-        async for entry in member.guild.audit_logs(limit=3, action=discord.AuditLogAction.kick):
-            if entry.target.id == member.id and (datetime.now(timezone.utc) - entry.created_at).total_seconds() < 10:
-                entry_meta = self._pop_recent_action(member.guild.id, member.id, "kicked")
-                if entry_meta:
-                    try:
-                        _, _, author_id, reason, time_val, log_channel_id = entry_meta
-                    except Exception:
-                        author_id = None
-                        reason = None
-                        time_val = None
-                        log_channel_id = None
+        entry = await self.bot.audit_cache.find(member.guild, discord.AuditLogAction.kick, member.id, window=10)
+        if entry is not None:
+            entry_meta = self._pop_recent_action(member.guild.id, member.id, "kicked")
+            if entry_meta:
+                try:
+                    _, _, author_id, reason, time_val, log_channel_id = entry_meta
+                except Exception:
+                    author_id = None
+                    reason = None
+                    time_val = None
+                    log_channel_id = None
 
+                target_channel = None
+                try:
+                    if log_channel_id:
+                        target_channel = await self.bot.channel_resolver.resolve(log_channel_id)
+                except Exception:
+                    logging.exception("on_member_remove: failed to fetch stored log channel id for kick")
                     target_channel = None
-                    try:
-                        if log_channel_id:
-                            target_channel = await self.bot.fetch_channel(int(log_channel_id))
-                    except Exception:
-                        logging.exception("on_member_remove: failed to fetch stored log channel id for kick")
-                        target_channel = None
-                    if not target_channel:
-                        target_channel = channel
-
-                    try:
-                        author_name = await self.bot.fetch_user(int(author_id)) if author_id else None
-                    except Exception:
-                        author_name = None
+                if not target_channel:
+                    target_channel = channel
 
-                    image_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")
-                    log_entry_embed = discord.Embed(title="Moderation action!", color=discord.Color.from_rgb(140,27,27))
-                    if reason is None:
-                        log_entry_embed.add_field(name="", value=f"User **{member}** was kicked by **{author_name}**.", inline=True)
-                    else:
-                        log_entry_embed.add_field(name="", value=f"User **{member}** was kicked by **{author_name}** for **{reason}**.", inline=True)
-                    log_entry_embed.add_field(name="", value= f"User ID: **{member.id}**")
-                    log_entry_embed.set_thumbnail(url="attachment://moderation_icon.png")
-                    log_entry_embed.set_footer(text=f"Action made by: {author_name} ({author_id}).\nUTC: {current_time()}")
-                    try:
-                        await target_channel.send(file=image_file, embed=log_entry_embed)
-                    except Exception:
-                        logging.exception("on_member_remove: failed to send moderation embed for kick")
-                    kicked = True
-                    break
+                try:
+                    author_name = await self.bot.fetch_user(int(author_id)) if author_id else None
+                except Exception:
+                    author_name = None
 
+                log_entry_embed = discord.Embed(title="Moderation action!", color=discord.Color.from_rgb(140,27,27))
+                if reason is None:
+                    log_entry_embed.add_field(name="", value=f"User **{member}** was kicked by **{author_name}**.", inline=True)
+                else:
+                    log_entry_embed.add_field(name="", value=f"User **{member}** was kicked by **{author_name}** for **{reason}**.", inline=True)
+                log_entry_embed.add_field(name="", value= f"User ID: **{member.id}**")
+                log_entry_embed.set_thumbnail(url="attachment://moderation_icon.png")
+                log_entry_embed.set_footer(text=f"Action made by: {author_name} ({author_id}).\nUTC: {current_time()}")
+                try:
+                    await self.bot.log_queue.send(target_channel, embed=log_entry_embed)
+                except Exception:
+                    logging.exception("on_member_remove: failed to send moderation embed for kick")
+                kicked = True
+            else:
                 try:
                     author_name = entry.user if entry.user else None
                     author_id = entry.user.id if entry.user else None
@@ -587,7 +550,6 @@ class Logging(commands.Cog):
                     author_id = None
                 reason = entry.reason if getattr(entry, 'reason', None) else None
 
-                image_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")
                 log_entry_embed = discord.Embed(title="Moderation action!", color=discord.Color.from_rgb(140,27,27))
                 if reason is None:
                     log_entry_embed.add_field(name="", value=f"User **{member}** was kicked by **{author_name}**.", inline=True)
@@ -597,11 +559,10 @@ class Logging(commands.Cog):
                 log_entry_embed.set_thumbnail(url="attachment://moderation_icon.png")
                 log_entry_embed.set_footer(text=f"Action made by: {author_name} ({author_id}).\nUTC: {current_time()}")
                 try:
-                    await channel.send(file=image_file, embed=log_entry_embed)
+                    await self.bot.log_queue.send(channel, embed=log_entry_embed)
                 except Exception:
                     logging.exception("on_member_remove: failed to send moderation embed for kick (audit)")
                 kicked = True
-                break
 
         if not kicked:
             embed = discord.Embed(
@@ -611,16 +572,16 @@ class Logging(commands.Cog):
                 timestamp=datetime.now(timezone.utc)
             )
             embed.set_footer(text=f"Action made by: {member} ({member.id}).\nUTC: {current_time()}")
-            image_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")  
             embed.set_thumbnail(url="attachment://moderation_icon.png")
             try:
-                await channel.send(file=image_file, embed=embed)
+                await self.bot.log_queue.send(channel, embed=embed)
             except Exception:
                 logging.exception("on_member_remove: failed to send Member Left embed")
 
     # Log bans (uses audit log or stored metadata)
     @commands.Cog.listener()
     async def on_member_ban(self, guild, user):
+        self._record(guild.id, "member_ban", target_id=user.id)
         channel = await get_logging_channel(self, guild.id)
         if not channel:
             return
@@ -638,7 +599,7 @@ class Logging(commands.Cog):
             target_channel = None
             try:
                 if log_channel_id:
-                    target_channel = await self.bot.fetch_channel(int(log_channel_id))
+                    target_channel = await self.bot.channel_resolver.resolve(log_channel_id)
             except Exception:
                 logging.exception("on_member_ban: failed to fetch stored log channel id")
                 target_channel = None
@@ -651,7 +612,6 @@ class Logging(commands.Cog):
             except Exception:
                 author_name = None
 
-            image_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")
             log_entry_embed = discord.Embed(title="Moderation action!", color=discord.Color.from_rgb(140,27,27))
             if reason is None:
                 log_entry_embed.add_field(name="", value=f"User **{user}** was banned by **{author_name}**.", inline=True)
@@ -661,7 +621,7 @@ class Logging(commands.Cog):
             log_entry_embed.set_thumbnail(url="attachment://moderation_icon.png") 
             log_entry_embed.set_footer(text=f"Action made by: {author_name} ({author_id}).\nUTC: {current_time()}")
             try:
-                await target_channel.send(file=image_file, embed=log_entry_embed)
+                await self.bot.log_queue.send(target_channel, embed=log_entry_embed)
             except Exception:
                 logging.exception("on_member_ban: failed to send moderation embed")
             return
@@ -669,11 +629,10 @@ class Logging(commands.Cog):
         moderator = None
         mod_reason = None
         try:
-            async for entry in guild.audit_logs(limit=6, action=discord.AuditLogAction.ban):
-                if entry.target and getattr(entry.target, 'id', None) == getattr(user, 'id', None) and (datetime.now(timezone.utc) - entry.created_at).total_seconds() < 20:
-                    moderator = entry.user
-                    mod_reason = entry.reason
-                    break
+            entry = await self.bot.audit_cache.find(guild, discord.AuditLogAction.ban, user.id, window=20)
+            if entry is not None:
+                moderator = entry.user
+                mod_reason = entry.reason
         except discord.Forbidden:
             logging.warning("on_member_ban: missing permissions to read audit logs for guild %s", guild.id)
         except Exception:
@@ -698,7 +657,6 @@ class Logging(commands.Cog):
             author_name = None
             author_id = None
 
-        image_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")
         log_entry_embed = discord.Embed(title="Moderation action!", color=discord.Color.from_rgb(140,27,27))
         if mod_reason is None:
             log_entry_embed.add_field(name="", value=f"User **{user}** was banned by **{author_name}**.", inline=True)
@@ -708,13 +666,14 @@ class Logging(commands.Cog):
         log_entry_embed.set_thumbnail(url="attachment://moderation_icon.png")
         log_entry_embed.set_footer(text=f"Action made by: {author_name} ({author_id}).\nUTC: {current_time()}")
         try:
-            await channel.send(file=image_file, embed=log_entry_embed)
+            await self.bot.log_queue.send(channel, embed=log_entry_embed)
         except Exception:
             logging.exception("on_member_ban: failed to send moderation embed (fallback)")
 
     # Log unbans (uses audit log or stored metadata)
     @commands.Cog.listener()
     async def on_member_unban(self, guild, user):
+        self._record(guild.id, "member_unban", target_id=user.id)
         channel = await get_logging_channel(self, guild.id)
         if not channel:
             return
@@ -732,7 +691,7 @@ class Logging(commands.Cog):
             target_channel = None
             try:
                 if log_channel_id:
-                    target_channel = await self.bot.fetch_channel(int(log_channel_id))
+                    target_channel = await self.bot.channel_resolver.resolve(log_channel_id)
             except Exception:
                 logging.exception("on_member_unban: failed to fetch stored log channel id")
                 target_channel = None
@@ -744,7 +703,6 @@ class Logging(commands.Cog):
             except Exception:
                 author_name = None
 
-            image_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")
             log_entry_embed = discord.Embed(title="Moderation action!", color=discord.Color.from_rgb(140,27,27))
             if reason is None:
                 log_entry_embed.add_field(name="", value=f"User **{user}** was unbanned by **{author_name}**.", inline=True)
@@ -754,7 +712,7 @@ class Logging(commands.Cog):
             log_entry_embed.set_thumbnail(url="attachment://moderation_icon.png")
             log_entry_embed.set_footer(text=f"Action made by: {author_name} ({author_id}).\nUTC: {current_time()}")
             try:
-                await target_channel.send(file=image_file, embed=log_entry_embed)
+                await self.bot.log_queue.send(target_channel, embed=log_entry_embed)
             except Exception:
                 logging.exception("on_member_unban: failed to send moderation embed")
             return
@@ -762,11 +720,10 @@ class Logging(commands.Cog):
         moderator = None
         mod_reason = None
         try:
-            async for entry in guild.audit_logs(limit=6, action=discord.AuditLogAction.unban):
-                if entry.target and getattr(entry.target, 'id', None) == getattr(user, 'id', None) and (datetime.now(timezone.utc) - entry.created_at).total_seconds() < 20:
-                    moderator = entry.user
-                    mod_reason = entry.reason
-                    break
+            entry = await self.bot.audit_cache.find(guild, discord.AuditLogAction.unban, user.id, window=20)
+            if entry is not None:
+                moderator = entry.user
+                mod_reason = entry.reason
         except discord.Forbidden:
             logging.warning("on_member_unban: missing permissions to read audit logs for guild %s", guild.id)
         except Exception:
@@ -779,7 +736,6 @@ class Logging(commands.Cog):
             author_name = None
             author_id = None
 
-        image_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")
         log_entry_embed = discord.Embed(title="Moderation action!", color=discord.Color.from_rgb(140,27,27))
         if mod_reason is None:
             log_entry_embed.add_field(name="", value=f"User **{user}** was unbanned by **{author_name}**.", inline=True)
@@ -789,7 +745,7 @@ class Logging(commands.Cog):
         log_entry_embed.set_thumbnail(url="attachment://moderation_icon.png")
         log_entry_embed.set_footer(text=f"Action made by: {author_name} ({author_id}).\nUTC: {current_time()}")
         try:
-            await channel.send(file=image_file, embed=log_entry_embed)
+            await self.bot.log_queue.send(channel, embed=log_entry_embed)
         except Exception:
             logging.exception("on_member_unban: failed to send moderation embed (fallback)")
 
@@ -797,6 +753,13 @@ class Logging(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_update(self, before, after):
+        if before.timed_out_until != after.timed_out_until:
+            self._record(after.guild.id, "member_timeout" if after.timed_out_until else "member_timeout_removed", target_id=after.id, details={'until': after.timed_out_until})
+        if before.roles != after.roles:
+            self._record(after.guild.id, "member_roles", target_id=after.id, details={
+                'added': [r.id for r in after.roles if r not in before.roles],
+                'removed': [r.id for r in before.roles if r not in after.roles],
+            })
         channel = await get_logging_channel(self, after.guild.id)
         if channel:
             if before.timed_out_until != after.timed_out_until:
@@ -814,7 +777,7 @@ class Logging(commands.Cog):
                         target_channel = None
                         try:
                             if log_channel_id:
-                                target_channel = await self.bot.fetch_channel(int(log_channel_id))
+                                target_channel = await self.bot.channel_resolver.resolve(log_channel_id)
                         except Exception:
                             logging.exception("on_member_update: failed to fetch stored log channel id for mute")
                             target_channel = None
@@ -826,7 +789,6 @@ class Logging(commands.Cog):
                         except Exception:
                             author_name = None
 
-                        image_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")
                         log_entry_embed = discord.Embed(title="Moderation action!", color=discord.Color.from_rgb(140,27,27))
                         if reason is None:
                             log_entry_embed.add_field(name="", value=f"User **{after}** was muted by **{author_name}**.", inline=True)
@@ -851,7 +813,7 @@ class Logging(commands.Cog):
                         log_entry_embed.set_thumbnail(url="attachment://moderation_icon.png")
                         log_entry_embed.set_footer(text=f"Action made by: {author_name} ({author_id}).\nUTC: {current_time()}")
                         try:
-                            await target_channel.send(file=image_file, embed=log_entry_embed)
+                            await self.bot.log_queue.send(target_channel, embed=log_entry_embed)
                         except Exception:
                             logging.exception("on_member_update: failed to send moderation embed for mute")
                         return
@@ -870,7 +832,7 @@ class Logging(commands.Cog):
                         target_channel = None
                         try:
                             if log_channel_id:
-                                target_channel = await self.bot.fetch_channel(int(log_channel_id))
+                                target_channel = await self.bot.channel_resolver.resolve(log_channel_id)
                         except Exception:
                             logging.exception("on_member_update: failed to fetch stored log channel id for unmute")
                             target_channel = None
@@ -882,7 +844,6 @@ class Logging(commands.Cog):
                         except Exception:
                             author_name = None
 
-                        image_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")
                         log_entry_embed = discord.Embed(title="Moderation action!", color=discord.Color.from_rgb(140,27,27))
                         if reason is None:
                             log_entry_embed.add_field(name="", value=f"User **{after}** was unmuted by **{author_name}**.", inline=True)
@@ -892,7 +853,7 @@ class Logging(commands.Cog):
                         log_entry_embed.set_thumbnail(url="attachment://moderation_icon.png")
                         log_entry_embed.set_footer(text=f"Action made by: {author_name} ({author_id}).\nUTC: {current_time()}")
                         try:
-                            await target_channel.send(file=image_file, embed=log_entry_embed)
+                            await self.bot.log_queue.send(target_channel, embed=log_entry_embed)
                         except Exception:
                             logging.exception("on_member_update: failed to send moderation embed for unmute")
                         return
@@ -900,26 +861,10 @@ class Logging(commands.Cog):
                 moderator = None
                 mod_reason = None
                 try:
-                    now = datetime.now(timezone.utc)
-                    async for entry in after.guild.audit_logs(limit=12, action=discord.AuditLogAction.member_update):
-                        if entry.target and getattr(entry.target, 'id', None) == getattr(after, 'id', None):
-                            if (now - entry.created_at).total_seconds() <= 30:
-                                changes = getattr(entry, 'changes', None)
-                                found = False
-                                if changes:
-                                    try:
-                                        for ch in changes:
-                                            key = getattr(ch, 'key', None)
-                                            if key in ('communication_disabled_until', 'timed_out_until'):
-                                                found = True
-                                                break
-                                    except Exception:
-                                        if 'communication_disabled_until' in str(changes) or 'timed_out_until' in str(changes):
-                                            found = True
-                                if found:
-                                    moderator = entry.user
-                                    mod_reason = getattr(entry, 'reason', None)
-                                    break
+                    entry = await self.bot.audit_cache.find(after.guild, discord.AuditLogAction.member_update, after.id, window=30, predicate=_is_timeout_entry)
+                    if entry is not None:
+                        moderator = entry.user
+                        mod_reason = getattr(entry, 'reason', None)
                 except discord.Forbidden:
                     logging.warning("on_member_update: missing View Audit Log permission for guild %s", after.guild.id)
                 except Exception:
@@ -932,7 +877,6 @@ class Logging(commands.Cog):
                     author_name = None
                     author_id = None
 
-                image_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")
                 log_entry_embed = discord.Embed(title="Moderation action!", color=discord.Color.from_rgb(140,27,27))
                 if after.timed_out_until:
                     if mod_reason is None:
@@ -954,7 +898,7 @@ class Logging(commands.Cog):
                 log_entry_embed.set_thumbnail(url="attachment://moderation_icon.png")
                 log_entry_embed.set_footer(text=f"Action made by: {author_name} ({author_id}).\nUTC: {current_time()}")
                 try:
-                    await channel.send(file=image_file, embed=log_entry_embed)
+                    await self.bot.log_queue.send(channel, embed=log_entry_embed)
                 except Exception:
                     logging.exception("on_member_update: failed to send moderation embed for mute/unmute (fallback)")
 
@@ -968,10 +912,9 @@ class Logging(commands.Cog):
                     timestamp=datetime.now(timezone.utc)
                 )
                 embed.set_footer(text=f"Action made by: {after} ({after.id}).\nUTC: {current_time()}")
-                image_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")  
                 embed.set_thumbnail(url="attachment://moderation_icon.png")
                 try:
-                    await channel.send(file=image_file, embed=embed)
+                    await self.bot.log_queue.send(channel, embed=embed)
                 except Exception:
                     logging.exception("on_member_update: failed to send Role Assigned embed")
             if removed_roles:
@@ -982,10 +925,9 @@ class Logging(commands.Cog):
                     timestamp=datetime.now(timezone.utc)
                 )
                 embed.set_footer(text=f"Action made by: {after} ({after.id}).\nUTC: {current_time()}")
-                image_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")  
                 embed.set_thumbnail(url="attachment://moderation_icon.png")
                 try:
-                    await channel.send(file=image_file, embed=embed)
+                    await self.bot.log_queue.send(channel, embed=embed)
                 except Exception:
                     logging.exception("on_member_update: failed to send Role Removed embed")
 
@@ -993,6 +935,7 @@ class Logging(commands.Cog):
 
     @commands.Cog.listener()
     async def on_invite_create(self, invite):
+        self._record(invite.guild.id, "invite_create", actor_id=invite.inviter.id if invite.inviter else None, channel_id=invite.channel.id if invite.channel else None, details={'code': invite.code, 'max_uses': invite.max_uses, 'max_age': invite.max_age})
         channel = await get_logging_channel(self, invite.guild.id)
         if channel:
             embed = discord.Embed(
@@ -1008,10 +951,9 @@ class Logging(commands.Cog):
                 inviter_name = None
                 inviter_id = None
             embed.set_footer(text=f"Action made by: {inviter_name} ({inviter_id}).\nUTC: {current_time()}")
-            image_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")  
             embed.set_thumbnail(url="attachment://moderation_icon.png")
             try:
-                await channel.send(file=image_file, embed=embed)
+                await self.bot.log_queue.send(channel, embed=embed)
             except Exception:
                 logging.exception("on_invite_create: failed to send embed")
 
@@ -1019,6 +961,7 @@ class Logging(commands.Cog):
 
     @commands.Cog.listener()
     async def on_guild_channel_create(self, channel):
+        self._record(channel.guild.id, "channel_create", channel_id=channel.id, details={'name': channel.name})
         log_channel = await get_logging_channel(self, channel.guild.id)
         if log_channel:
             embed = discord.Embed(
@@ -1036,7 +979,6 @@ class Logging(commands.Cog):
                 embed.set_footer(text=f"Action made by: {executor} ({executor.id}).\nUTC: {current_time()}")
             else:
                 embed.set_footer(text=f"Action made by: Unknown.\nUTC: {current_time()}")
-            image_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")  
             embed.set_thumbnail(url="attachment://moderation_icon.png")
             # include initial permission overwrites if present
             try:
@@ -1052,13 +994,15 @@ class Logging(commands.Cog):
             except Exception:
                 logging.exception("on_guild_channel_create: failed to enumerate overwrites")
             try:
-                await log_channel.send(file=image_file, embed=embed)
+                await self.bot.log_queue.send(log_channel, embed=embed)
             except Exception:
                 logging.exception("on_guild_channel_create: failed to send embed")
 
     # Channel deleted
     @commands.Cog.listener()
     async def on_guild_channel_delete(self, channel):
+        self.bot.channel_resolver.mark_missing(channel.id)
+        self._record(channel.guild.id, "channel_delete", channel_id=channel.id, details={'name': channel.name})
         log_channel = await get_logging_channel(self, channel.guild.id)
         if log_channel:
             embed = discord.Embed(
@@ -1075,10 +1019,9 @@ class Logging(commands.Cog):
                 embed.set_footer(text=f"Action made by: {executor} ({executor.id}).\nUTC: {current_time()}")
             else:
                 embed.set_footer(text=f"Action made by: Unknown.\nUTC: {current_time()}")
-            image_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")  
             embed.set_thumbnail(url="attachment://moderation_icon.png")
             try:
-                await log_channel.send(file=image_file, embed=embed)
+                await self.bot.log_queue.send(log_channel, embed=embed)
             except Exception:
                 logging.exception("on_guild_channel_delete: failed to send embed")
 
@@ -1086,25 +1029,99 @@ class Logging(commands.Cog):
 
     @commands.Cog.listener()
     async def on_guild_channel_update(self, before, after):
-        log_channel = await get_logging_channel(self, after.guild.id)
+        # always buffered: the flush records the update and only then checks for a logging channel
+        self._channel_updates.push(before, after)
+
+    # One batch of merged channel updates for a guild
+    async def _flush_channel_updates(self, guild_id, updates):
+        for update in updates:
+            before_lines, after_lines = diff_attrs(update.before, update.after, CHANNEL_UPDATE_ATTRS)
+            self._record(guild_id, "channel_update", channel_id=update.after.id, details={
+                'before': before_lines,
+                'after': after_lines,
+                'overwrites_changed': overwrites_of(update.before) != overwrites_of(update.after),
+                'events': update.events,
+            })
+        log_channel = await get_logging_channel(self, guild_id)
         if not log_channel:
             return
 
-        attrs = ["name", "topic", "nsfw", "position", "category", "bitrate", "user_limit", "rate_limit_per_user", "slowmode_delay", "rtc_region"]
+        # category permission syncs touch every child channel, log them as one record per category
+        synced = {}
+        for update in updates:
+            if _is_category_sync(update.before, update.after):
+                synced.setdefault(update.after.category.id, []).append(update)
+        grouped = set()
+        for category_updates in synced.values():
+            if len(category_updates) >= CATEGORY_SYNC_MIN_CHANNELS:
+                grouped.update(id(u) for u in category_updates)
+                await self._log_category_sync(log_channel, category_updates)
+
+        # look the executors up together so a burst of misses shares one audit log refresh,
+        # one after another every miss would wait out the audit cache's min_interval
+        single = [update for update in updates if id(update) not in grouped]
+        audits = await asyncio.gather(*(find_audit_executor(self, update.after.guild, discord.AuditLogAction.channel_update, update.after, window=60) for update in single))
+        for update, audit in zip(single, audits):
+            await self._log_channel_update(log_channel, update.before, update.after, audit)
+
+    async def _log_category_sync(self, log_channel, updates):
+        category = updates[0].after.category
+        guild = category.guild
+        embed = discord.Embed(
+            title="Channel Permissions Synced",
+            description=f"{len(updates)} channels in {category.mention} were synced with the category permissions.",
+            color=discord.Color.orange(),
+            timestamp=datetime.now(timezone.utc)
+        )
+        mentions = [getattr(u.after, 'mention', None) or str(u.after) for u in updates]
+        embed.add_field(name="Channels", value=", ".join(mentions)[:1024], inline=False)
+
+        # the channels now share the category's overwrites, so show the resulting state of every changed permission
+        masks = {}
+        for update in updates:
+            before_items = overwrites_of(update.before)
+            after_items = overwrites_of(update.after)
+            for key in set(before_items) | set(after_items):
+                mask = changed_mask(before_items.get(key), after_items.get(key))
+                if mask:
+                    masks[key] = masks.get(key, 0) | mask
+        category_items = overwrites_of(category)
+        for key, mask in list(masks.items())[:20]:
+            allow, deny = overwrite_bits(category_items.get(key))
+            if getattr(key, 'id', None) == guild.id:
+                # do not mention @everyone (its id equals the guild id)
+                target = getattr(key, 'name', str(key))
+            else:
+                target = getattr(key, 'mention', None) or str(key)
+            lines = format_states(allow, deny, mask)
+            embed.add_field(name="Permissions changed", value=f"{target}\n" + "\n".join(lines)[:1000], inline=False)
+
+        executor = None
+        for action in (discord.AuditLogAction.overwrite_update, discord.AuditLogAction.overwrite_create, discord.AuditLogAction.overwrite_delete):
+            try:
+                executor, reason = await find_audit_executor(self, guild, action, updates[0].after, window=60)
+            except Exception:
+                executor = None
+            if executor:
+                break
+        if executor:
+            embed.set_footer(text=f"Action made by: {executor} ({executor.id}).  \nUTC: {current_time()}")
+        else:
+            embed.set_footer(text=f"Action made by: N/A (N/A).  \nUTC: {current_time()}")
+        embed.set_thumbnail(url="attachment://moderation_icon.png")
+        try:
+            await self.bot.log_queue.send(log_channel, embed=embed)
+        except Exception:
+            logging.exception("on_guild_channel_update: failed to send category sync embed")
+
+    async def _log_channel_update(self, log_channel, before, after, audit=None):
+        attrs = CHANNEL_UPDATE_ATTRS
         name_changed = getattr(before, 'name', None) != getattr(after, 'name', None)
         other_attrs = [a for a in attrs if a != 'name']
         before_other, after_other = diff_attrs(before, after, other_attrs)
 
         desc_target = getattr(before, 'mention', None) or getattr(before, 'name', None) or str(before)
 
-        # suppress near-duplicate channel update events (occurs when discord emits multiple events)
-        try:
-            now_dt = datetime.now(timezone.utc)
-            key_recent = (after.guild.id, after.id)
-            last = self._recent_channel_updates.get(key_recent)
-            self._recent_channel_updates[key_recent] = now_dt
-        except Exception:
-            pass
         # build compact Before/After blocks for the standard embed
         try:
             before_parts = []
@@ -1138,68 +1155,22 @@ class Logging(commands.Cog):
         # compute permission diffs per role/user
         perm_map = {}
         try:
-            before_map = getattr(before, 'overwrites', None) or getattr(before, 'overwrites_map', None) or {}
-            after_map = getattr(after, 'overwrites', None) or getattr(after, 'overwrites_map', None) or {}
-            try:
-                before_items = dict(before_map.items())
-            except Exception:
-                before_items = dict(before_map) if isinstance(before_map, dict) else {}
-            try:
-                after_items = dict(after_map.items())
-            except Exception:
-                after_items = dict(after_map) if isinstance(after_map, dict) else {}
+            before_items = overwrites_of(before)
+            after_items = overwrites_of(after)
 
-            perms = [
-                'view_channel', 'send_messages', 'send_tts_messages', 'manage_messages', 'embed_links', 'attach_files',
-                'read_message_history', 'mention_everyone', 'use_external_emojis', 'add_reactions', 'manage_roles',
-                'manage_channels', 'manage_webhooks', 'connect', 'speak', 'mute_members', 'deafen_members', 'move_members',
-                'priority_speaker', 'create_instant_invite', 'manage_threads', 'send_messages_in_threads',
-                'use_application_commands', 'moderate_members'
-            ]
-
-            all_keys = list(set(list(before_items.keys()) + list(after_items.keys())))
+            all_keys = list(set(before_items) | set(after_items))
             for key in all_keys:
-                b = before_items.get(key)
-                a = after_items.get(key)
-
-                def build_state_map(obj):
-                    state = {}
-                    if obj is None:
-                        return state
-                    try:
-                        allow, deny = obj.pair()
-                    except Exception:
-                        allow = None
-                        deny = None
-                    for p in perms:
-                        a_val = getattr(allow, p, False) if allow is not None else False
-                        d_val = getattr(deny, p, False) if deny is not None else False
-                        if a_val and not d_val:
-                            state[p] = 'Allow'
-                        elif d_val and not a_val:
-                            state[p] = 'Disallow'
-                        else:
-                            continue
-                    return state
-
-                state_b = build_state_map(b)
-                state_a = build_state_map(a)
-
-                if not state_b and state_a:
-                    kind = 'Added'
-                    lines = [_format_perm_state(p, state_a[p]) for p in perms if p in state_a]
-                    text = "\n".join(lines)
-                elif not state_a and state_b:
-                    kind = 'Removed'
-                    lines = [_format_perm_state(p, state_b[p]) for p in perms if p in state_b]
-                    text = "\n".join(lines)
+                diff = compare_overwrites(before_items.get(key), after_items.get(key))
+                if diff is None:
+                    continue
+                kind, before_lines, after_lines = diff
+                if kind == 'Added':
+                    text = "\n".join(after_lines)
+                elif kind == 'Removed':
+                    text = "\n".join(before_lines)
                 else:
-                    changed_perms = [p for p in perms if state_b.get(p) != state_a.get(p)]
-                    if not changed_perms:
-                        continue
-                    kind = 'Changed'
-                    before_block = "\n".join([_format_perm_state(p, state_b.get(p, 'N/A')) for p in changed_perms])
-                    after_block = "\n".join([_format_perm_state(p, state_a.get(p, 'N/A')) for p in changed_perms])
+                    before_block = "\n".join(before_lines)
+                    after_block = "\n".join(after_lines)
                     text = f"Before:\n{before_block}\nAfter:\n{after_block}"
 
                 # try to resolve canonical object for mentions (role/member)
@@ -1246,17 +1217,10 @@ class Logging(commands.Cog):
         except Exception:
             logging.exception("on_guild_channel_update: diff_overwrites failed")
 
-        try:
-            int_lines = diff_integrations(before, after)
-            if int_lines:
-                embed.add_field(name="Integrations", value="\n".join(int_lines)[:1024], inline=False)
-        except Exception:
-            logging.exception("on_guild_channel_update: diff_integrations failed")
-
-        try:
-            executor, reason = await find_audit_executor(self, after.guild, discord.AuditLogAction.channel_update, after, window=60)
-        except Exception:
-            executor, reason = (None, None)
+        # (executor, reason), looked up by the flush for the whole batch
+        if audit is None:
+            audit = await find_audit_executor(self, after.guild, discord.AuditLogAction.channel_update, after, window=60)
+        executor, reason = audit
         try:
             if executor:
                 try:
@@ -1274,6 +1238,7 @@ class Logging(commands.Cog):
         embed.set_footer(text=f"Action made by: {exec_name} ({exec_id}).  \nUTC: {ts}")
 
         # decide whether to send the main embed or only per-role permission embeds
+        int_lines = []
         try:
             int_lines = diff_integrations(before, after)
             if int_lines:
@@ -1287,16 +1252,15 @@ class Logging(commands.Cog):
         if not only_perms:
             # send main embed
             try:
-                image_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")  
                 embed.set_thumbnail(url="attachment://moderation_icon.png")
                 try:
-                    await log_channel.send(file=image_file, embed=embed)
+                    await self.bot.log_queue.send(log_channel, embed=embed)
                 except Exception:
                     logging.exception("on_guild_channel_update: failed to send embed (main)")
             except Exception:
                 logging.exception("on_guild_channel_update: preparing main embed failed")
 
-        # send one message per changed overwrite
+        # one embed per changed overwrite, the log queue packs them into as few messages as possible
         try:
             if perm_map:
                 for key_id, val in perm_map.items():
@@ -1351,8 +1315,7 @@ class Logging(commands.Cog):
                                 perm_embed.set_footer(text=f"Action made by: {exec_name} ({exec_id}).  \nUTC: {ts_perm}")
                             except Exception:
                                 pass
-                            file_for_perm = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")
-                            await log_channel.send(file=file_for_perm, embed=perm_embed)
+                            await self.bot.log_queue.send(log_channel, embed=perm_embed)
                         except Exception:
                             logging.exception("on_guild_channel_update: failed to send perm entry embed for %s", key_display)
                     except Exception:
@@ -1364,6 +1327,7 @@ class Logging(commands.Cog):
 
     @commands.Cog.listener()
     async def on_guild_role_create(self, role):
+        self._record(role.guild.id, "role_create", target_id=role.id, details={'name': role.name, 'permissions': role.permissions.value})
         log_channel = await get_logging_channel(self, role.guild.id)
         if not log_channel:
             return
@@ -1375,10 +1339,9 @@ class Logging(commands.Cog):
         )
         embed.add_field(name="Role Summary", value=format_role_summary(role), inline=False)
         embed.set_footer(text=f"Action made by: Unknown.\nUTC: {current_time()}")
-        image_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")  
         embed.set_thumbnail(url="attachment://moderation_icon.png")
         try:
-            await log_channel.send(file=image_file, embed=embed)
+            await self.bot.log_queue.send(log_channel, embed=embed)
         except Exception:
             logging.exception("on_guild_role_create: failed to send embed")
 
@@ -1386,10 +1349,6 @@ class Logging(commands.Cog):
 
     @commands.Cog.listener()
     async def on_guild_update(self, before, after):
-        log_channel = await get_logging_channel(self, after.id)
-        if not log_channel:
-            return
-        
         # Capture standard guild attribute changes
         attrs = ["name", "region", "icon", "verification_level", "default_notifications", "afk_channel"]
         before_lines, after_lines = diff_attrs(before, after, attrs)
@@ -1425,6 +1384,22 @@ class Logging(commands.Cog):
         inv_after_str = format_lockdown_status(inv_after)
         dms_before_str = format_lockdown_status(dms_before)
         dms_after_str = format_lockdown_status(dms_after)
+
+        # same changes as the embed, as {field: [before, after]}
+        changes = {}
+        for a in attrs:
+            b = getattr(before, a, None)
+            c = getattr(after, a, None)
+            if str(b) != str(c):
+                changes[a] = [None if b is None else str(b), None if c is None else str(c)]
+        if inv_before_str != inv_after_str:
+            changes['invites_paused_until'] = [inv_before, inv_after]
+        if dms_before_str != dms_after_str:
+            changes['dms_paused_until'] = [dms_before, dms_after]
+        self._record(after.id, "guild_update", details=changes)
+        log_channel = await get_logging_channel(self, after.id)
+        if not log_channel:
+            return
         
         # Always add these lines (even if not changed, for clarity on raid events)
         before_lines.append(f"Paused invites: {inv_before_str}")
@@ -1477,10 +1452,9 @@ class Logging(commands.Cog):
             exec_id = executor_id or "N/A"
             embed.set_footer(text=f"Action made by: {exec_name} ({exec_id}).\nUTC: {current_time()}")
         
-        image_file = discord.File("Images/moderation_icon.png", filename="moderation_icon.png")  
         embed.set_thumbnail(url="attachment://moderation_icon.png")
         try:
-            await log_channel.send(file=image_file, embed=embed)
+            await self.bot.log_queue.send(log_channel, embed=embed)
         except Exception:
             logging.exception("on_guild_update: failed to send embed")
 
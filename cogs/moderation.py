@@ -8,8 +8,14 @@ from discord.ext.commands import has_permissions, MissingPermissions, CheckFailu
 from datetime import datetime, timezone
 from datetime import timedelta
 
+from utils.expiring import ExpiringDict
+
 logging.basicConfig(format='%(levelname)s:  %(message)s', level=logging.INFO)
 
+# recent_mod_actions: how long an action is kept for the logging cog and how many are kept at once
+RECENT_ACTION_TTL = 8
+RECENT_ACTION_MAX = 5000
+
 #Time
 def current_time():
     now = datetime.now(timezone.utc)
@@ -18,10 +24,10 @@ def current_time():
 
 #Get logging channel
 async def get_logging_channel(self, ctx):
-    logging_channel = await self.pool.fetchrow('SELECT log_id FROM info WHERE guild_id = $1', ctx.guild.id)
+    logging_channel = await self.bot.config_cache.get(ctx.guild.id)
     try:
         log_id = logging_channel["log_id"]
-        logging_channel = await self.bot.fetch_channel(log_id)
+        logging_channel = await self.bot.channel_resolver.resolve(log_id) or False
     except:
         logging_channel = False
     return logging_channel
@@ -31,36 +37,36 @@ class moderation(commands.Cog):
         self.bot = bot
         self.pool = bot.pool
         if not hasattr(bot, 'recent_mod_actions'):
-            bot.recent_mod_actions = {}
+            bot.recent_mod_actions = ExpiringDict(ttl=RECENT_ACTION_TTL, max_size=RECENT_ACTION_MAX)
 
     # Register action in audit logs
-    async def _register_action(self, guild_id: int, user_id: int, action: str, author_id: typing.Optional[int] = None, reason: typing.Optional[str] = None, time_val: typing.Optional[str] = None, log_channel_id: typing.Optional[int] = None, ttl: int = 8):
+    async def _register_action(self, guild_id: int, user_id: int, action: str, author_id: typing.Optional[int] = None, reason: typing.Optional[str] = None, time_val: typing.Optional[str] = None, log_channel_id: typing.Optional[int] = None, ttl: int = RECENT_ACTION_TTL):
         try:
             now = datetime.now(timezone.utc)
             bot_store = getattr(self.bot, 'recent_mod_actions', None)
             if bot_store is None:
-                self.bot.recent_mod_actions = {}
+                self.bot.recent_mod_actions = ExpiringDict(ttl=RECENT_ACTION_TTL, max_size=RECENT_ACTION_MAX)
                 bot_store = self.bot.recent_mod_actions
 
-            bot_store[(int(guild_id), int(user_id))] = (action, now, author_id, reason, time_val, log_channel_id)
-
-            asyncio.create_task(self._clear_action_after(guild_id, int(user_id), ttl))
+            # entries expire on their own, re-registering a user replaces the entry and its deadline
+            bot_store.set((int(guild_id), int(user_id)), (action, now, author_id, reason, time_val, log_channel_id), ttl=ttl)
         except Exception:
             logging.exception("_register_action failed")
 
-    async def _clear_action_after(self, guild_id: int, user_id: int, ttl: int):
-        await asyncio.sleep(ttl)
+    # Write the action to the event_log table and the user's case history
+    async def _record_action(self, ctx, user_id: int, action: str, reason: typing.Optional[str] = None, duration: typing.Optional[timedelta] = None):
+        duration_seconds = int(duration.total_seconds()) if duration is not None else None
         try:
-            bot_store = getattr(self.bot, 'recent_mod_actions', None)
-            if bot_store is None:
-                return
-            bot_store.pop((guild_id, int(user_id)), None)
+            details = {'reason': reason}
+            if duration_seconds is not None:
+                details['duration_seconds'] = duration_seconds
+            self.bot.event_log.record(ctx.guild.id, f"mod_{action}", actor_id=ctx.author.id, target_id=user_id, channel_id=ctx.channel.id, details=details)
         except Exception:
-            logging.exception("_clear_action_after failed")
+            logging.exception("failed to record %s action", action)
+        await self.bot.mod_cases.add(ctx.guild.id, int(user_id), ctx.author.id, action, reason, duration_seconds)
 
     @commands.Cog.listener()
     async def on_ready(self):
-        await self.bot.tree.sync()
         logging.info("---|moderation cog loaded!|---   %s", current_time())
     
     # kick
@@ -121,6 +127,7 @@ class moderation(commands.Cog):
                         logging.exception("failed to register kick action")
                 
                 await ctx.guild.kick(user, reason=reason)
+                await self._record_action(ctx, user_id, "kick", reason)
 
     # Ban
     @commands.hybrid_command(name = "ban", description='Bans a member', aliases=["Ban"])
@@ -183,6 +190,7 @@ class moderation(commands.Cog):
                         logging.exception("failed to register ban action")
                     
                 await ctx.guild.ban(user, reason=reason, delete_message_days=0)
+                await self._record_action(ctx, user_id, "ban", reason)
 
         else:
             await ctx.send("Unable to ban a user who's already banned")
@@ -235,6 +243,7 @@ class moderation(commands.Cog):
                         logging.exception("failed to register unban action")
                     
                 await ctx.guild.unban(discord.Object(int(user_id)))
+                await self._record_action(ctx, user_id, "unban", reason)
 
     # Mute 
     @commands.hybrid_command(name = "mute", description='Mutes a member', aliases = ["Mute"])
@@ -313,6 +322,7 @@ class moderation(commands.Cog):
             try:
                 member = await ctx.guild.fetch_member(user_id)
                 await member.edit(timed_out_until=discord.utils.utcnow() + tdelta)
+                await self._record_action(ctx, user_id, "mute", reason, duration=tdelta)
             except discord.NotFound:
                 await ctx.send("Unable to mute a member who's not in the server.")
 
@@ -351,9 +361,19 @@ class moderation(commands.Cog):
             try:
                 member = await ctx.guild.fetch_member(user_id)
                 await member.edit(timed_out_until=None)
+                await self._record_action(ctx, user_id, "unmute", reason)
             except discord.NotFound:
                 await ctx.send("Unable to unmute a member who's not in the server.")
 
+    # Case history
+    @commands.hybrid_command(name = "cases", description="Shows a user's moderation history", aliases = ["Cases", "history"])
+    @commands.has_permissions(moderate_members = True)
+    @commands.guild_only()
+    async def cases(self, ctx: commands.Context, user: discord.Member|discord.User):
+        view = CasesView(self.bot.mod_cases, ctx.guild.id, user, ctx.author.id)
+        embed = await view.load_page()
+        view.message = await ctx.send(embed=embed, view=view)
+
     # Errors 
     @kick.error
     async def kick_error(self, ctx: commands.Context, error):
@@ -435,6 +455,23 @@ class moderation(commands.Cog):
             logging.error("----!!ERROR!!----")
             raise error
     
+    @cases.error
+    async def cases_error(self, ctx: commands.Context, error):
+        if isinstance(error, commands.CommandInvokeError):
+            await ctx.send("!!ERROR!! Please contact <@1184901953885585490>", ephemeral=True)
+            logging.error("----!!ERROR!!----")
+            raise error
+        elif isinstance(error, commands.MissingPermissions):
+            await ctx.send("You don't have permissions to do that :)", ephemeral=True)
+            return 
+        elif isinstance(error, commands.MissingRequiredArgument):
+            await ctx.send("You're missing one or more required arguments", ephemeral=True)
+            return 
+        else:
+            await ctx.send("!!ERROR!! Please contact <@1184901953885585490>", ephemeral=True)
+            logging.error("----!!ERROR!!----")
+            raise error
+
     @unmute.error
     async def unmute_error(self, ctx: commands.Context, error):
         if isinstance(error, commands.CommandInvokeError):
@@ -455,5 +492,67 @@ class moderation(commands.Cog):
             logging.error("----!!ERROR!!----")
             raise error
 
+# Older/Newer buttons for /cases, each page is fetched from the cursor of the previous one
+class CasesView(discord.ui.View):
+    def __init__(self, store, guild_id, user, author_id, timeout=180):
+        super().__init__(timeout=timeout)
+        self.store = store
+        self.guild_id = guild_id
+        self.user = user
+        self.author_id = author_id
+        # start cursor of every page shown so far, the last one is the current page
+        self.cursors = [None]
+        self.next_cursor = None
+        self.message = None
+
+    async def load_page(self):
+        rows, has_more = await self.store.page(self.guild_id, self.user.id, after=self.cursors[-1])
+        self.next_cursor = (rows[-1]['created_at'], rows[-1]['id']) if has_more else None
+        self.older.disabled = self.next_cursor is None
+        self.newer.disabled = len(self.cursors) == 1
+
+        embed = discord.Embed(title=f"Cases for {self.user}", color=discord.Color.from_rgb(140,27,27))
+        if not rows and len(self.cursors) == 1:
+            embed.description = "This user has no moderation history."
+        for row in rows:
+            moderator = f"<@{row['moderator_id']}>" if row['moderator_id'] else "Unknown"
+            value = f"By {moderator} <t:{int(row['created_at'].timestamp())}:R>"
+            if row['duration_seconds']:
+                value += f"\nDuration: **{timedelta(seconds=row['duration_seconds'])}**"
+            if row['reason']:
+                value += f"\nReason: {row['reason']}"
+            embed.add_field(name=f"#{row['id']} {row['action']}", value=value[:1024], inline=False)
+        embed.set_footer(text=f"User ID: {self.user.id} | Page {len(self.cursors)}\nUTC: {current_time()}")
+        return embed
+
+    async def _show(self, interaction: discord.Interaction):
+        embed = await self.load_page()
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    @discord.ui.button(label="Newer", style=discord.ButtonStyle.grey)
+    async def newer(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("You are not allowed to use this button.", ephemeral=True)
+            return
+        if len(self.cursors) > 1:
+            self.cursors.pop()
+        await self._show(interaction)
+
+    @discord.ui.button(label="Older", style=discord.ButtonStyle.grey)
+    async def older(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("You are not allowed to use this button.", ephemeral=True)
+            return
+        if self.next_cursor is not None:
+            self.cursors.append(self.next_cursor)
+        await self._show(interaction)
+
+    async def on_timeout(self):
+        if self.message is not None:
+            try:
+                await self.message.edit(view=None)
+            except discord.HTTPException:
+                pass
+
 async def setup(bot):
   await bot.add_cog(moderation(bot))
\ No newline at end of file
@@ -1,7 +1,11 @@
 import discord
 import logging
-from discord.ext import commands
+import math
+from discord.ext import commands, tasks
 from datetime import datetime, timezone
+from time import perf_counter
+
+from utils.latency import LatencyWindow
 
 logging.basicConfig(format='%(levelname)s:  %(message)s', level=logging.INFO)
 #time
@@ -10,27 +14,67 @@ def current_time ():
     current_time = now.strftime("%Y-%m-%d %H:%M:%S")
     return current_time
 
+SHARDS_SHOWN = 15
+
 class ping(commands.Cog):
     def __init__(self, bot: commands.bot):
         self.bot = bot
         self.pool = bot.pool
+        # rolling samples so /ping shows p50/p95 instead of a single reading
+        self.gateway_ms = LatencyWindow()
+        self.rest_ms = LatencyWindow()
+
+    async def cog_load(self):
+        self.sample_gateway.start()
+
+    async def cog_unload(self):
+        self.sample_gateway.cancel()
+
+    # bot.latency only changes once per heartbeat, sampling it every 30 seconds is enough
+    @tasks.loop(seconds=30)
+    async def sample_gateway(self):
+        latency = self.bot.latency
+        if math.isfinite(latency):
+            self.gateway_ms.add(latency * 1000)
+
+    @sample_gateway.before_loop
+    async def before_sample_gateway(self):
+        await self.bot.wait_until_ready()
     
     @commands.Cog.listener()
     async def on_ready(self):
-        await self.bot.tree.sync()
         logging.info("---|Ping       cog loaded!|---  %s", current_time())
 
     @commands.hybrid_command(name="ping", description="you ping i pong! ;)", aliases=["Ping"])
     async def ping(self, ctx: commands.Context):
-        bot_latency = round(self.bot.latency * 1000)
+        if math.isfinite(self.bot.latency):
+            self.gateway_ms.add(self.bot.latency * 1000)
+
+        # one typing request is the cheapest REST round trip
+        start = perf_counter()
+        await ctx.channel.typing()
+        self.rest_ms.add((perf_counter() - start) * 1000)
+
         Ping_embed = discord.Embed(title="Pong! :ping_pong:", color=discord.Color.from_rgb(41,134,0))
-        Ping_embed.add_field(name=":satellite: API:", value= f"**{bot_latency} ms.**", inline=False)
+        Ping_embed.add_field(name=":satellite: Gateway:", value= f"**{self.gateway_ms.describe()}**", inline=False)
+        Ping_embed.add_field(name=":globe_with_meridians: REST:", value= f"**{self.rest_ms.describe()}**", inline=False)
+
+        tracker = getattr(self.bot, 'shard_tracker', None)
+        if tracker is not None and self.bot.shard_count:
+            shard_id = ctx.guild.shard_id if ctx.guild else 0
+            Ping_embed.add_field(name=":jigsaw: Shard:", value= f"**#{shard_id} of {self.bot.shard_count}: {tracker.describe(shard_id)}**", inline=False)
+            if self.bot.shard_count > 1:
+                Ping_embed.add_field(name=":bar_chart: All shards:", value= "\n".join(tracker.summary(limit=SHARDS_SHOWN))[:1024], inline=False)
 
+        # SELECT 1 on a pooled connection, the same probe the pool health monitor runs
+        health = self.bot.pool_health
         try:
-            await self.pool.fetchrow('SELECT guild_id FROM info') #WHERE guild_id = $1', ctx.guild.id )
-            Ping_embed.add_field(name=":file_cabinet: Database:", value= "**DB connection: __Normal__**", inline=False)
+            await health.probe()
+            Ping_embed.add_field(name=":file_cabinet: Database:", value= f"**Query: {health.query_ms.describe()}\nPool acquire: {health.acquire_ms.describe()}**", inline=False)
         except:
             Ping_embed.add_field(name=":file_cabinet: Database:", value= "**DB connection: __Dead__**", inline=False)
+        cache_stats = self.bot.config_cache.stats()
+        Ping_embed.add_field(name=":card_box: Config cache:", value= f"**{cache_stats['hits']} hits / {cache_stats['misses']} misses ({cache_stats['hit_rate']:.0%})**", inline=False)
         Ping_embed.set_footer(text=f"UTC: {current_time()}")
         await ctx.send(embed=Ping_embed)
 
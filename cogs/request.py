@@ -17,7 +17,6 @@ class request(commands.Cog):
     
     @commands.Cog.listener()
     async def on_ready(self):
-        await self.bot.tree.sync()
         logging.info("---|Request    cog loaded!|---  %s", current_time())
 
     @commands.hybrid_command(name="request", description="Request a feature", aliases=["Request"])
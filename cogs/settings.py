@@ -15,10 +15,10 @@ def current_time():
 
 #Logging channel
 async def get_logging_channel(guild_id, self):
-    logging_channel = await self.pool.fetchrow('SELECT log_id FROM info WHERE guild_id = $1', guild_id)
+    logging_channel = await self.bot.config_cache.get(guild_id)
     try:
         log_id = logging_channel["log_id"]
-        logging_channel = await self.bot.fetch_channel(log_id)
+        logging_channel = await self.bot.channel_resolver.resolve(log_id) or False
     except:
         logging_channel = False
     return logging_channel
@@ -28,14 +28,14 @@ async def log_entry(self, author_id, guild_id, What, Type, To):
     author_name = await self.bot.fetch_user(int(author_id))
     channel = await get_logging_channel(guild_id, self)
     if channel:
-        image_file = File("Images/settings_icon.png", filename="settings_icon.png")
         log_entry_embed = discord.Embed(title="Server config action!", description="Someone has made a changed a server config for The Holy Roller!", color=discord.Color.from_rgb(140,27,27))
         log_entry_embed.add_field(name="", value=f"**{What}** **{Type}** was changed to **{To}**")
         log_entry_embed.set_thumbnail(url="attachment://settings_icon.png") 
         if Type == "attachment":
             log_entry_embed.set_image(url=To)
         log_entry_embed.set_footer(text=f"Action made by: {author_name} ({author_id}).\nUTC: {current_time()}")
-        await channel.send(file=image_file, embed=log_entry_embed)
+        message = await channel.send(files=self.bot.icons.attach(log_entry_embed), embed=log_entry_embed)
+        self.bot.icons.remember(message)
     else:
         return
     
@@ -43,7 +43,6 @@ async def delete_log_entry(self, author_id, guild_id, message_type, setting):
     author_name = await self.bot.fetch_user(int(author_id))
     channel = await get_logging_channel(guild_id, self)
     if channel:
-        image_file = File("Images/settings_icon.png", filename="settings_icon.png")
         log_entry_embed = discord.Embed(title="Server config action!", description="Someone has made a changed a server config for The Holy Roller!", color=discord.Color.from_rgb(140,27,27))
         log_entry_embed.set_thumbnail(url="attachment://settings_icon.png") 
         if message_type == None:
@@ -59,7 +58,8 @@ async def delete_log_entry(self, author_id, guild_id, message_type, setting):
             else:
                 log_entry_embed.add_field(name="", value=f"**{message_type} {setting}** message setting have been deleted for this server.")
         log_entry_embed.set_footer(text=f"Action made by: {author_name} ({author_id}).\nUTC: {current_time()}")
-        await channel.send(file=image_file, embed=log_entry_embed)
+        message = await channel.send(files=self.bot.icons.attach(log_entry_embed), embed=log_entry_embed)
+        self.bot.icons.remember(message)
     else:
         return
 
@@ -72,7 +72,6 @@ class settings(commands.Cog):
     
     @commands.Cog.listener()
     async def on_ready(self):
-        await self.bot.tree.sync()
         logging.info("---|settings   cog loaded!|---  %s", current_time())
 
 # settings channels
@@ -83,16 +82,22 @@ class settings(commands.Cog):
         guild_id = interaction.guild.id
         if channel_type == "Logging/Logs":
             await self.pool.execute('INSERT INTO info (guild_id, log_id) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET log_id = $2', guild_id, channel.id)
+            self.bot.config_cache.invalidate(guild_id)
+            self.bot.channel_resolver.forget(channel.id)
             await interaction.response.send_message(f"**Logging channel** was changed to {channel.mention}")
             What = "Logging/Logs" 
 
         elif channel_type == "Welcome":
             await self.pool.execute('INSERT INTO info (guild_id, wlc_id) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET wlc_id = $2', guild_id, channel.id)
+            self.bot.config_cache.invalidate(guild_id)
+            self.bot.channel_resolver.forget(channel.id)
             await interaction.response.send_message(f"**Welcome channel** was changed to {channel.mention}")
             What = "Welcome"
 
         elif channel_type == "Goodbye":
             await self.pool.execute('INSERT INTO info (guild_id, bye_id) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET bye_id = $2', guild_id, channel.id)
+            self.bot.config_cache.invalidate(guild_id)
+            self.bot.channel_resolver.forget(channel.id)
             await interaction.response.send_message(f"**Goodbye channel** was changed to {channel.mention}")
             What = "Goodbye"
 
@@ -125,16 +130,22 @@ class settings(commands.Cog):
 
         if channel_type == "Logging/Logs":
             await self.pool.execute('INSERT INTO info (guild_id, log_id) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET log_id = $2', guild_id, channel.id)
+            self.bot.config_cache.invalidate(guild_id)
+            self.bot.channel_resolver.forget(channel.id)
             await ctx.send(f"**Logging channel** was changed to {channel.mention}")
             What = "Logging/Logs" 
 
         elif channel_type == "Welcome":
             await self.pool.execute('INSERT INTO info (guild_id, wlc_id) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET wlc_id = $2', guild_id, channel.id)
+            self.bot.config_cache.invalidate(guild_id)
+            self.bot.channel_resolver.forget(channel.id)
             await ctx.send(f"**Welcome channel** was changed to {channel.mention}")
             What = "Welcome"
 
         elif channel_type == "Goodbye":
             await self.pool.execute('INSERT INTO info (guild_id, bye_id) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET bye_id = $2', guild_id, channel.id)
+            self.bot.config_cache.invalidate(guild_id)
+            self.bot.channel_resolver.forget(channel.id)
             await ctx.send(f"**Goodbye channel** was changed to {channel.mention}")
             What = "Goodbye"
             
@@ -156,18 +167,21 @@ class settings(commands.Cog):
             text = user_input
             if setting == "Attachment":
                 await self.pool.execute('INSERT INTO info (guild_id, wlc_pic) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET wlc_pic = $2', guild_id, media_link)  
+                self.bot.config_cache.invalidate(guild_id)
                 await interaction.response.send_message(f"**Welcome image** was changed to {media_link}")
                 Type = "attachment"
                 To = media_link
 
             elif setting == "Title":
                 await self.pool.execute('INSERT INTO info (guild_id, wlc_title) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET wlc_title = $2', guild_id, text)
+                self.bot.config_cache.invalidate(guild_id)
                 await interaction.response.send_message(f"**Welcome image** was changed to {text}")
                 Type = "title"
                 To = text
 
             elif setting == "Message":
                 await self.pool.execute('INSERT INTO info (guild_id, wlc_msg) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET wlc_msg = $2', guild_id, media_link)
+                self.bot.config_cache.invalidate(guild_id)
                 await interaction.response.send_message(f"**Welcome message** was changed to {text}")
                 Type = "message"
                 To = text
@@ -182,6 +196,7 @@ class settings(commands.Cog):
                         b = int(b)
                         hex = discord.Color.from_rgb(r, g, b)
                         await self.pool.execute('INSERT INTO info (guild_id, wlc_rgb) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET wlc_rgb = $2', guild_id, str(hex))
+                        self.bot.config_cache.invalidate(guild_id)
                         await interaction.response.send_message(f"**Welcome embed color** was changed to {hex}")
                     except:
                         await interaction.response.send_message(f"`{user_input}` is not a valid rgb or hex code, please use rgb or hex")
@@ -189,6 +204,7 @@ class settings(commands.Cog):
                 elif '#' in user_input:
                     hex = user_input
                     await self.pool.execute('INSERT INTO info (guild_id, wlc_rgb) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET wlc_rgb = $2', guild_id, str(user_input))
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction.response.send_message(f"**Welcome embed color** was changed to {hex}")
                 else:
                     await interaction.response.send_message(f"`{user_input}` is not a valid rgb or hex code, please use rgb or hex")
@@ -206,18 +222,21 @@ class settings(commands.Cog):
             text = user_input
             if setting == "Attachment":
                 await self.pool.execute('INSERT INTO info (guild_id, bye_pic) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET bye_pic = $2', guild_id, media_link)
+                self.bot.config_cache.invalidate(guild_id)
                 await interaction.response.send_message(f"**Goodbye image** was changed to {media_link}")
                 Type = "attachment"
                 To = media_link
 
             elif setting == "Title":
                 await self.pool.execute('INSERT INTO info (guild_id, bye_title) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET bye_title = $2', guild_id, text)
+                self.bot.config_cache.invalidate(guild_id)
                 await interaction.response.send_message(f"**Goodbye image** was changed to {text}")
                 Type = "title"
                 To = text
 
             elif setting == "Message":
                 await self.pool.execute('INSERT INTO info (guild_id, bye_msg) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET bye_msg = $2', guild_id, media_link)
+                self.bot.config_cache.invalidate(guild_id)
                 await interaction.response.send_message(f"**Goodbye message** was changed to {text}")
                 Type = "message"
                 To = text
@@ -232,6 +251,7 @@ class settings(commands.Cog):
                         b = int(b)
                         hex = discord.Color.from_rgb(r, g, b)
                         await self.pool.execute('INSERT INTO info (guild_id, bye_rgb) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET bye_rgb = $2', guild_id, str(hex))
+                        self.bot.config_cache.invalidate(guild_id)
                         await interaction.response.send_message(f"**Goodbye embed color** was changed to {hex}")
                     except:
                         await interaction.response.send_message(f"`{user_input}` is not a valid rgb or hex code, please use rgb or hex")
@@ -239,6 +259,7 @@ class settings(commands.Cog):
                 elif '#' in user_input:
                     hex = user_input
                     await self.pool.execute('INSERT INTO info (guild_id, bye_rgb) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET bye_rgb = $2', guild_id, str(user_input))
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction.response.send_message(f"**Goodbye embed color** was changed to {hex}")
                 else:
                     await interaction.response.send_message(f"`{user_input}` is not a valid rgb or hex code, please use rgb or hex")
@@ -264,18 +285,21 @@ class settings(commands.Cog):
             text = user_input
             if setting == "Attachment":
                 await self.pool.execute('INSERT INTO info (guild_id, wlc_pic) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET wlc_pic = $2', guild_id, media_link)  
+                self.bot.config_cache.invalidate(guild_id)
                 await ctx.send(f"**Welcome image** was changed to {media_link}")
                 Type = "attachment"
                 To = media_link
 
             elif setting == "Title":
                 await self.pool.execute('INSERT INTO info (guild_id, wlc_title) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET wlc_title = $2', guild_id, text)
+                self.bot.config_cache.invalidate(guild_id)
                 await ctx.send(f"**Welcome image** was changed to {text}")
                 Type = "title"
                 To = text
 
             elif setting == "Message":
                 await self.pool.execute('INSERT INTO info (guild_id, wlc_msg) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET wlc_msg = $2', guild_id, media_link)
+                self.bot.config_cache.invalidate(guild_id)
                 await ctx.send(f"**Welcome message** was changed to {text}")
                 Type = "message"
                 To = text
@@ -290,6 +314,7 @@ class settings(commands.Cog):
                         b = int(b)
                         hex = discord.Color.from_rgb(r, g, b)
                         await self.pool.execute('INSERT INTO info (guild_id, wlc_rgb) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET wlc_rgb = $2', guild_id, str(hex))
+                        self.bot.config_cache.invalidate(guild_id)
                         await ctx.send(f"**Welcome embed color** was changed to {hex}")
                     except:
                         await ctx.send(f"`{user_input}` is not a valid rgb or hex code, please use rgb or hex")
@@ -297,6 +322,7 @@ class settings(commands.Cog):
                 elif '#' in user_input:
                     hex = user_input
                     await self.pool.execute('INSERT INTO info (guild_id, bye_rgb) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET bye_rgb = $2', guild_id, str(user_input))
+                    self.bot.config_cache.invalidate(guild_id)
                     await ctx.send(f"**Welcome embed color** was changed to {hex}")
                 else:
                     await ctx.send(f"`{user_input}` is not a valid rgb or hex code, please use rgb or hex")
@@ -314,18 +340,21 @@ class settings(commands.Cog):
 
             if setting == "Attachment":
                 await self.pool.execute('INSERT INTO info (guild_id, bye_pic) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET bye_pic = $2', guild_id, media_link)
+                self.bot.config_cache.invalidate(guild_id)
                 await ctx.send(f"**Goodbye image** was changed to {media_link}")
                 Type = "attachment"
                 To = media_link
 
             elif setting == "Title":
                 await self.pool.execute('INSERT INTO info (guild_id, bye_title) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET bye_title = $2', guild_id, text)
+                self.bot.config_cache.invalidate(guild_id)
                 await ctx.send(f"**Goodbye image** was changed to {text}")
                 Type = "title"
                 To = text
 
             elif setting == "Message":
                 await self.pool.execute('INSERT INTO info (guild_id, bye_msg) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET bye_msg = $2', guild_id, media_link)
+                self.bot.config_cache.invalidate(guild_id)
                 await ctx.send(f"**Goodbye message** was changed to {text}")
                 Type = "message"
                 To = text
@@ -340,6 +369,7 @@ class settings(commands.Cog):
                         b = int(b)
                         hex = discord.Color.from_rgb(r, g, b)
                         await self.pool.execute('INSERT INTO info (guild_id, wlc_rgb) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET wlc_rgb = $2', guild_id, str(hex))
+                        self.bot.config_cache.invalidate(guild_id)
                         await ctx.send(f"**Welcome embed color** was changed to {hex}")
                     except:
                         await ctx.send(f"`{user_input}` is not a valid rgb or hex code, please use rgb or hex")
@@ -347,6 +377,7 @@ class settings(commands.Cog):
                 elif '#' in user_input:
                     hex = user_input
                     await self.pool.execute('INSERT INTO info (guild_id, bye_rgb) VALUES ($1, $2) ON CONFLICT (guild_id) DO UPDATE SET bye_rgb = $2', guild_id, str(user_input))
+                    self.bot.config_cache.invalidate(guild_id)
                     await ctx.send(f"**Welcome embed color** was changed to {hex}")
                 else:
                     await ctx.send(f"`{user_input}` is not a valid rgb or hex code, please use rgb or hex")
@@ -365,31 +396,34 @@ class settings(commands.Cog):
         setup_pics = 0
         guild_id = interaction.guild.id
         #Log channel
-        log_id_record = await self.pool.fetchrow('SELECT log_id FROM info WHERE guild_id = $1', guild_id)
+        log_id_record = await self.bot.config_cache.get(guild_id)
         try:
             log_id = log_id_record["log_id"]
-            log_channel = await interaction.client.fetch_channel(log_id)
-            setup_channels += 1
+            log_channel = await interaction.client.channel_resolver.resolve(log_id) or False
+            if log_channel:
+                setup_channels += 1
         except:
             log_channel = False
         #Welcome channel
-        wlc_id_record = await self.pool.fetchrow('SELECT wlc_id FROM info WHERE guild_id = $1', guild_id)
+        wlc_id_record = await self.bot.config_cache.get(guild_id)
         try:
             wlc_id = wlc_id_record["wlc_id"]
-            wlc_channel = await interaction.client.fetch_channel(wlc_id)
-            setup_channels += 1
+            wlc_channel = await interaction.client.channel_resolver.resolve(wlc_id) or False
+            if wlc_channel:
+                setup_channels += 1
         except:
             wlc_channel = False
         #Goodbye channel
-        bye_id_record = await self.pool.fetchrow('SELECT bye_id FROM info WHERE guild_id = $1', guild_id)
+        bye_id_record = await self.bot.config_cache.get(guild_id)
         try:
             bye_id = bye_id_record["bye_id"]
-            bye_channel = await interaction.client.fetch_channel(bye_id)
-            setup_channels += 1
+            bye_channel = await interaction.client.channel_resolver.resolve(bye_id) or False
+            if bye_channel:
+                setup_channels += 1
         except:
             bye_channel = False
         #Welcome attachment
-        wlc_pic_record = await self.pool.fetchrow('SELECT wlc_pic FROM info WHERE guild_id = $1', guild_id)
+        wlc_pic_record = await self.bot.config_cache.get(guild_id)
         try:
             wlc_pic = wlc_pic_record["wlc_pic"]
             if wlc_pic != None and wlc_pic.lower() != "none":
@@ -397,7 +431,7 @@ class settings(commands.Cog):
         except:
             wlc_pic = False
         #Goodbye attachment
-        bye_pic_record = await self.pool.fetchrow('SELECT bye_pic FROM info WHERE guild_id = $1', guild_id)
+        bye_pic_record = await self.bot.config_cache.get(guild_id)
         try:
             bye_pic = bye_pic_record["bye_pic"]
             if bye_pic != None and bye_pic.lower() != "none":
@@ -447,31 +481,34 @@ class settings(commands.Cog):
         setup_pics = 0
         guild_id = ctx.guild.id
         #Log channel
-        log_id_record = await self.pool.fetchrow('SELECT log_id FROM info WHERE guild_id = $1', guild_id)
+        log_id_record = await self.bot.config_cache.get(guild_id)
         try:
             log_id = log_id_record["log_id"]
-            log_channel = await self.bot.fetch_channel(log_id)
-            setup_channels += 1
+            log_channel = await self.bot.channel_resolver.resolve(log_id) or False
+            if log_channel:
+                setup_channels += 1
         except:
             log_channel = False
         #Welcome channel
-        wlc_id_record = await self.pool.fetchrow('SELECT wlc_id FROM info WHERE guild_id = $1', guild_id)
+        wlc_id_record = await self.bot.config_cache.get(guild_id)
         try:
             wlc_id = wlc_id_record["wlc_id"]
-            wlc_channel = await self.bot.fetch_channel(wlc_id)
-            setup_channels += 1
+            wlc_channel = await self.bot.channel_resolver.resolve(wlc_id) or False
+            if wlc_channel:
+                setup_channels += 1
         except:
             wlc_channel = False
         #Goodbye channel
-        bye_id_record = await self.pool.fetchrow('SELECT bye_id FROM info WHERE guild_id = $1', guild_id)
+        bye_id_record = await self.bot.config_cache.get(guild_id)
         try:
             bye_id = bye_id_record["bye_id"]
-            bye_channel = await self.bot.fetch_channel(bye_id)
-            setup_channels += 1
+            bye_channel = await self.bot.channel_resolver.resolve(bye_id) or False
+            if bye_channel:
+                setup_channels += 1
         except:
             bye_channel = False
         #Welcome attachment
-        wlc_pic_record = await self.pool.fetchrow('SELECT wlc_pic FROM info WHERE guild_id = $1', guild_id)
+        wlc_pic_record = await self.bot.config_cache.get(guild_id)
         try:
             wlc_pic = wlc_pic_record["wlc_pic"]
             if wlc_pic != None and wlc_pic.lower() != "none":
@@ -479,7 +516,7 @@ class settings(commands.Cog):
         except:
             wlc_pic = False
         #Goodbye attachment
-        bye_pic_record = await self.pool.fetchrow('SELECT bye_pic FROM info WHERE guild_id = $1', guild_id)
+        bye_pic_record = await self.bot.config_cache.get(guild_id)
         try:
             bye_pic = bye_pic_record["bye_pic"]
             if bye_pic != None and bye_pic.lower() != "none":
@@ -558,18 +595,23 @@ class settings(commands.Cog):
             await delete_log_entry(self, author_id, guild_id, None, setting)
             if setting == "Logging/Logs":
                 await self.pool.execute('UPDATE info SET log_id = NULL WHERE guild_id = $1', guild_id)
+                self.bot.config_cache.invalidate(guild_id)
                 await interaction_confirm.response.edit_message(content="Logging channel setting has been reset.", view=None)
             elif setting == "Welcome":
                 await self.pool.execute('UPDATE info SET wlc_id = NULL WHERE guild_id = $1', guild_id)
+                self.bot.config_cache.invalidate(guild_id)
                 await interaction_confirm.response.edit_message(content="Welcome channel setting have been reset.", view=None)
             elif setting == "Goodbye":
                 await self.pool.execute('UPDATE info SET bye_id = NULL WHERE guild_id = $1', guild_id)
+                self.bot.config_cache.invalidate(guild_id)
                 await interaction_confirm.response.edit_message(content="Goodbye channel setting have been reset.", view=None)
             elif setting == "Prefix":
                 await self.pool.execute('UPDATE info SET prefix = $1 WHERE guild_id = $2', '!', guild_id)
+                self.bot.config_cache.invalidate(guild_id)
                 await interaction_confirm.response.edit_message(content='Prefix setting has been reset to default (!).', view=None)
             elif setting == "All":
                 await self.pool.execute('UPDATE info SET log_id = NULL, wlc_id = NULL, bye_id = NULL, prefix = $1 WHERE guild_id = $2', '!', guild_id)
+                self.bot.config_cache.invalidate(guild_id)
                 await interaction_confirm.response.edit_message(content="All channel settings have been deleted for this server.", view=None)
 
         async def on_cancel(interaction_cancel):
@@ -597,18 +639,23 @@ class settings(commands.Cog):
             await delete_log_entry(self, author_id, guild_id, None, setting)
             if setting in {"logging", "logs", "log"}:
                 await self.pool.execute('UPDATE info SET log_id = NULL WHERE guild_id = $1', guild_id)
+                self.bot.config_cache.invalidate(guild_id)
                 await interaction_confirm.edit_original_response(content="Logging channel setting has been reset.", view=None)
             elif setting in {"welcome", "wlc"}:
                 await self.pool.execute('UPDATE info SET wlc_id = NULL WHERE guild_id = $1', guild_id)
+                self.bot.config_cache.invalidate(guild_id)
                 await interaction_confirm.edit_original_response(content="Welcome channel setting have been reset.", view=None)
             elif setting in {"goodbye", "bye"}:
                 await self.pool.execute('UPDATE info SET bye_id = NULL WHERE guild_id = $1', guild_id)
+                self.bot.config_cache.invalidate(guild_id)
                 await interaction_confirm.edit_original_response(content="Goodbye channel setting have been reset.", view=None)
             elif setting in {"prefix"}:
                 await self.pool.execute('UPDATE info SET prefix = $1 WHERE guild_id = $2', '!', guild_id)
+                self.bot.config_cache.invalidate(guild_id)
                 await interaction_confirm.edit_original_response(content='Prefix setting has been reset to default (!).', view=None)
             elif setting == "all":
                 await self.pool.execute('UPDATE info SET log_id = NULL, wlc_id = NULL, bye_id = NULL, prefix = $1 WHERE guild_id = $2', '!', guild_id)
+                self.bot.config_cache.invalidate(guild_id)
                 await interaction_confirm.edit_original_response(content="All channel setting have been deleted for this server.", view=None)
             else:
                 await interaction_confirm.edit_original_response(content="Invalid setting. Use logging, welcome, goodbye, prefix, or all.", view=None)
@@ -638,34 +685,44 @@ class settings(commands.Cog):
             if message_type == "Welcome":
                 if setting == "Attachment":
                     await self.pool.execute('UPDATE info SET wlc_pic = NULL WHERE guild_id = $1', guild_id)
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction_confirm.response.edit_message(content="Welcome image has been reset.", view=None)
                 elif setting == "Title":
                     await self.pool.execute('UPDATE info SET wlc_title = NULL WHERE guild_id = $1', guild_id)
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction_confirm.response.edit_message(content="Welcome title has been reset.", view=None)
                 elif setting == "Message":
                     await self.pool.execute('UPDATE info SET wlc_msg = NULL WHERE guild_id = $1', guild_id)
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction_confirm.response.edit_message(content="Welcome message has been reset.", view=None)
                 elif setting == "Color":
                     await self.pool.execute('UPDATE info SET wlc_rgb = NULL WHERE guild_id = $1', guild_id)
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction_confirm.response.edit_message(content="Welcome color has been reset.", view=None)
                 elif setting == "All":
                     await self.pool.execute('UPDATE info SET wlc_pic = NULL, wlc_title = NULL, wlc_msg = NULL, wlc_rgb = NULL WHERE guild_id = $1', guild_id)
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction_confirm.response.edit_message(content="All welcome message settings have been reset.", view=None)
             elif message_type == "Goodbye":
                 if setting == "Attachment":
                     await self.pool.execute('UPDATE info SET bye_pic = NULL WHERE guild_id = $1', guild_id)
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction_confirm.response.edit_message(content="Goodbye image has been reset.", view=None)
                 elif setting == "Title":
                     await self.pool.execute('UPDATE info SET bye_title = NULL WHERE guild_id = $1', guild_id)
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction_confirm.response.edit_message(content="Goodbye title has been reset.", view=None)
                 elif setting == "Message":
                     await self.pool.execute('UPDATE info SET bye_msg = NULL WHERE guild_id = $1', guild_id)
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction_confirm.response.edit_message(content="Goodbye message has been reset.", view=None)
                 elif setting == "Color":
                     await self.pool.execute('UPDATE info SET bye_rgb = NULL WHERE guild_id = $1', guild_id)
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction_confirm.response.edit_message(content="Goodbye color has been reset.", view=None)
                 elif setting == "All":
                     await self.pool.execute('UPDATE info SET bye_pic = NULL, bye_title = NULL, bye_msg = NULL, bye_rgb = NULL WHERE guild_id = $1', guild_id)
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction_confirm.response.edit_message(content="All goodbye message settings have been reset.", view=None)
             else:
                 await interaction_confirm.response.edit_message(content="Invalid choice.", view=None)
@@ -697,34 +754,44 @@ class settings(commands.Cog):
             if message_type in {"welcome", "wlc"}:
                 if setting == "attachment":
                     await self.pool.execute('UPDATE info SET wlc_pic = NULL WHERE guild_id = $1', guild_id)
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction_confirm.edit_original_response(content="Welcome image has been reset.", view=None)
                 elif setting == "title":
                     await self.pool.execute('UPDATE info SET wlc_title = NULL WHERE guild_id = $1', guild_id)
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction_confirm.edit_original_response(content="Welcome title has been reset.", view=None)
                 elif setting == "message":
                     await self.pool.execute('UPDATE info SET wlc_msg = NULL WHERE guild_id = $1', guild_id)
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction_confirm.edit_original_response(content="Welcome message has been reset.", view=None)
                 elif setting == "color":
                     await self.pool.execute('UPDATE info SET wlc_rgb = NULL WHERE guild_id = $1', guild_id)
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction_confirm.edit_original_response(content="Welcome color has been reset.", view=None)
                 elif setting == "all":
                     await self.pool.execute('UPDATE info SET wlc_pic = NULL, wlc_title = NULL, wlc_msg = NULL, wlc_rgb = NULL WHERE guild_id = $1', guild_id)
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction_confirm.edit_original_response(content="All welcome message settings have been reset.", view=None)
             elif message_type in {"goodbye", "bye"}:
                 if setting == "attachment":
                     await self.pool.execute('UPDATE info SET bye_pic = NULL WHERE guild_id = $1', guild_id)
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction_confirm.edit_original_response(content="Goodbye image has been reset.", view=None)
                 elif setting == "title":
                     await self.pool.execute('UPDATE info SET bye_title = NULL WHERE guild_id = $1', guild_id)
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction_confirm.edit_original_response(content="Goodbye title has been reset.", view=None)
                 elif setting == "message":
                     await self.pool.execute('UPDATE info SET bye_msg = NULL WHERE guild_id = $1', guild_id)
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction_confirm.edit_original_response(content="Goodbye message has been reset.", view=None)
                 elif setting == "color":
                     await self.pool.execute('UPDATE info SET bye_rgb = NULL WHERE guild_id = $1', guild_id)
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction_confirm.edit_original_response(content="Goodbye color has been reset.", view=None)
                 elif setting == "all":
                     await self.pool.execute('UPDATE info SET bye_pic = NULL, bye_title = NULL, bye_msg = NULL, bye_rgb = NULL WHERE guild_id = $1', guild_id)
+                    self.bot.config_cache.invalidate(guild_id)
                     await interaction_confirm.edit_original_response(content="All goodbye message settings have been reset.", view=None)
             else:
                 await interaction_confirm.edit_original_response(content="Invalid choice. Use welcome/goodbye and attachment/title/message/color/all.", view=None)
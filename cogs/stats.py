@@ -0,0 +1,68 @@
+import discord
+import typing
+import logging
+from discord.ext import commands
+from datetime import datetime, timezone
+
+logging.basicConfig(format='%(levelname)s:  %(message)s', level=logging.INFO)
+#time
+def current_time ():
+    now = datetime.now(timezone.utc)
+    current_time = now.strftime("%Y-%m-%d %H:%M:%S")
+    return current_time
+
+STATS_HANDLERS_SHOWN = 15
+
+def handler_line(stats) -> str:
+    line = (f"{stats.calls} calls, {stats.errors} errors\n"
+            f"p50 {stats.recent_ms.percentile(50):.1f} ms / p95 {stats.recent_ms.percentile(95):.1f} ms / max {stats.max_ms:.0f} ms\n"
+            f"DB {stats.per_call(stats.db_queries):.2f}/call, REST {stats.per_call(stats.rest_requests):.2f}/call")
+    if stats.rest_rate_limited:
+        line += f" ({stats.rest_rate_limited} rate limited)"
+    if stats.last_error:
+        line += f"\nLast error: {stats.last_error[:100]}"
+    return line
+
+class stats(commands.Cog):
+    def __init__(self, bot: commands.bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        logging.info("---|Stats      cog loaded!|---  %s", current_time())
+
+    @commands.hybrid_command(name="stats", description="Handler latency, errors and DB/REST calls (bot owner only)")
+    @commands.is_owner()
+    async def stats(self, ctx: commands.Context, sort: typing.Literal["time", "calls", "errors"] = "time"):
+        metrics = getattr(self.bot, 'metrics', None)
+        if metrics is None:
+            await ctx.send("Metrics are not enabled.", ephemeral=True)
+            return
+
+        stats_embed = discord.Embed(title="Handler stats", description=f"Top {STATS_HANDLERS_SHOWN} handlers by {sort}", color=discord.Color.from_rgb(41,134,0))
+        for handler in metrics.top(sort, STATS_HANDLERS_SHOWN):
+            if handler.calls:
+                stats_embed.add_field(name=f"{handler.name} ({handler.kind})", value=handler_line(handler), inline=False)
+        background = metrics.background
+        stats_embed.add_field(name="Background", value=f"DB {background.db_queries} queries, REST {background.rest_requests} requests ({background.rest_rate_limited} rate limited)", inline=False)
+        loop_monitor = getattr(self.bot, 'loop_monitor', None)
+        if loop_monitor is not None and len(loop_monitor.lag_ms):
+            loop_value = f"Lag {loop_monitor.lag_ms.describe()}, max {loop_monitor.max_lag_ms:.0f} ms\n{loop_monitor.slow_callbacks} slow callbacks"
+            if loop_monitor.recent:
+                last = loop_monitor.recent[-1]
+                loop_value += f"\nLast: {last.blocked_ms:.0f} ms at {last.where} ({last.task})"
+            stats_embed.add_field(name="Event loop", value=loop_value[:1024], inline=False)
+        stats_embed.set_footer(text=f"UTC: {current_time()}")
+        await ctx.send(embed=stats_embed, ephemeral=True)
+
+    @stats.error
+    async def stats_error(self, ctx: commands.Context, error):
+        if isinstance(error, commands.NotOwner):
+            await ctx.send("Only the bot owner can use this command.", ephemeral=True)
+            return
+        await ctx.send("!!ERROR!! Please contact <@1184901953885585490>", ephemeral=True)
+        logging.error("----!!ERROR!!----")
+        raise error
+
+async def setup(bot):
+  await bot.add_cog(stats(bot))
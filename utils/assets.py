@@ -0,0 +1,72 @@
+import io
+import discord
+from time import time
+from urllib.parse import urlparse, parse_qs
+
+ICONS = {
+    "moderation_icon.png": "Images/moderation_icon.png",
+    "settings_icon.png": "Images/settings_icon.png",
+}
+
+# How long to trust a hosted url that doesn't say when it expires
+DEFAULT_URL_LIFETIME = 12 * 60 * 60
+
+# Icon images kept in memory and uploaded to Discord once.
+# Embeds keep using "attachment://<icon>" as their thumbnail, attach() swaps that for the
+# hosted CDN url once we have one and only hands back a file to upload when we don't.
+# remember() picks the url up from the message that carried the upload.
+
+class IconStore:
+    def __init__(self, icons: dict = ICONS):
+        self._data = {}
+        self._urls = {}
+        for filename, path in icons.items():
+            with open(path, 'rb') as f:
+                self._data[filename] = f.read()
+
+    def file(self, filename) -> discord.File:
+        return discord.File(io.BytesIO(self._data[filename]), filename=filename)
+
+    def url(self, filename):
+        hosted = self._urls.get(filename)
+        if hosted is None:
+            return None
+        url, expires = hosted
+        # refresh a bit early so we never hand out a dead link
+        if expires - 300 <= time():
+            self._urls.pop(filename, None)
+            return None
+        return url
+
+    # Rewrite icon thumbnails to the hosted url, returns the icon files that still need uploading
+    def attach(self, *embeds) -> list:
+        needed = []
+        for embed in embeds:
+            thumbnail = getattr(embed.thumbnail, 'url', None) if embed is not None else None
+            if not thumbnail or not thumbnail.startswith("attachment://"):
+                continue
+            filename = thumbnail[len("attachment://"):]
+            if filename not in self._data:
+                continue
+            hosted = self.url(filename)
+            if hosted:
+                embed.set_thumbnail(url=hosted)
+            elif filename not in needed:
+                needed.append(filename)
+        return [self.file(filename) for filename in needed]
+
+    # Store the CDN url of any icon uploaded with this message
+    def remember(self, message):
+        for attachment in getattr(message, 'attachments', None) or []:
+            if attachment.filename in self._data and attachment.filename not in self._urls:
+                self._urls[attachment.filename] = (attachment.url, _url_expiry(attachment.url))
+
+def _url_expiry(url) -> float:
+    # Discord signs attachment urls with ex=<hex unix timestamp>
+    try:
+        ex = parse_qs(urlparse(url).query).get('ex')
+        if ex:
+            return float(int(ex[0], 16))
+    except ValueError:
+        pass
+    return time() + DEFAULT_URL_LIFETIME
@@ -0,0 +1,111 @@
+import asyncio
+import aiohttp
+import discord
+import logging
+import tempfile
+
+# Re-uploads attachments of deleted/edited messages without holding them all in memory.
+# Downloads are streamed into a spooled temp file (kept in memory up to spool_bytes, then on disk),
+# a file larger than max_file_bytes is skipped, and all archived files that have not been
+# uploaded yet share a max_total_bytes budget. Only `concurrency` downloads run at once.
+# Callers get None when a file is skipped and should link the attachment URL instead.
+
+CHUNK_SIZE = 64 * 1024
+
+class ArchivedFile(discord.File):
+    # discord.File doesn't close file objects it didn't open, this one also frees the spool
+    # and gives the bytes back to the archiver's budget once it has been uploaded
+    def __init__(self, spool, filename, size, release):
+        super().__init__(spool, filename=filename)
+        self._spool = spool
+        self._size = size
+        self._release = release
+
+    def close(self):
+        super().close()
+        if self._release is not None:
+            self._spool.close()
+            self._release(self._size)
+            self._release = None
+
+class AttachmentArchiver:
+    def __init__(self, max_file_bytes: int = 8 * 1024 * 1024, max_total_bytes: int = 32 * 1024 * 1024, concurrency: int = 3, spool_bytes: int = 1024 * 1024, timeout: float = 30.0):
+        self.max_file_bytes = max_file_bytes
+        self.max_total_bytes = max_total_bytes
+        self.spool_bytes = spool_bytes
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._session = None
+        self.reserved = 0
+        self.archived = 0
+        self.skipped = 0
+        self.failed = 0
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self._session
+
+    def _reserve(self, size: int) -> bool:
+        if size > self.max_file_bytes or self.reserved + size > self.max_total_bytes:
+            return False
+        self.reserved += size
+        return True
+
+    def _release(self, size: int):
+        self.reserved = max(0, self.reserved - size)
+
+    # Download an attachment into a discord.File, or None when it is too large or the download fails
+    async def archive(self, attachment):
+        size = getattr(attachment, 'size', None) or 0
+        if not self._reserve(size):
+            self.skipped += 1
+            return None
+
+        spool = tempfile.SpooledTemporaryFile(max_size=self.spool_bytes)
+        received = 0
+        try:
+            async with self._semaphore:
+                async with self._get_session().get(attachment.url) as resp:
+                    if resp.status != 200:
+                        raise discord.HTTPException(resp, f"attachment download failed with status {resp.status}")
+                    async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                        received += len(chunk)
+                        # don't trust the reported size, stop as soon as the file is over the limit
+                        if received > self.max_file_bytes:
+                            raise ValueError("attachment larger than the archive limit")
+                        spool.write(chunk)
+        except ValueError:
+            spool.close()
+            self._release(size)
+            self.skipped += 1
+            return None
+        except Exception:
+            spool.close()
+            self._release(size)
+            self.failed += 1
+            logging.warning("AttachmentArchiver: could not download %s", getattr(attachment, 'filename', attachment))
+            return None
+
+        if received != size:
+            # keep the budget in line with what is actually held
+            self._release(size)
+            if not self._reserve(received):
+                spool.close()
+                self.skipped += 1
+                return None
+        spool.seek(0)
+        self.archived += 1
+        return ArchivedFile(spool, getattr(attachment, 'filename', None) or 'attached_file', received, self._release)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    def stats(self) -> dict:
+        return {
+            'reserved_bytes': self.reserved,
+            'archived': self.archived,
+            'skipped': self.skipped,
+            'failed': self.failed,
+        }
@@ -0,0 +1,115 @@
+import asyncio
+import discord
+import logging
+from datetime import datetime, timezone
+from time import monotonic
+
+# Per-guild audit log cache shared by all listeners.
+# Each guild keeps the entries it has seen for the last `retention` seconds indexed by
+# (action, target_id), and a cursor (newest entry id) so a refresh only asks Discord for
+# entries newer than what we already have. A lookup that misses only triggers a refresh when
+# nobody has fetched since the lookup started, and refreshes are at least min_interval seconds
+# apart: a miss right after a fetch waits for the next one, so a burst of events shares requests.
+
+class _GuildAuditState:
+    def __init__(self):
+        self.index = {}
+        self.last_id = None
+        self.last_fetch = 0.0
+        self.forbidden_until = 0.0
+        self.lock = asyncio.Lock()
+
+class AuditLogCache:
+    def __init__(self, retention: int = 120, page_limit: int = 100, forbidden_ttl: int = 300, min_interval: float = 1.5):
+        self.retention = retention
+        self.min_interval = min_interval
+        self.page_limit = page_limit
+        self.forbidden_ttl = forbidden_ttl
+        self._guilds = {}
+        self.hits = 0
+        self.fetches = 0
+
+    # Newest entry for (action, target_id) created in the last `window` seconds, or None
+    async def find(self, guild, action, target_id, window: int = 30, predicate=None):
+        asked_at = monotonic()
+        state = self._guilds.get(guild.id)
+        if state is None:
+            state = self._guilds[guild.id] = _GuildAuditState()
+
+        entry = self._lookup(state, action, target_id, window, predicate)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        if state.forbidden_until > asked_at:
+            return None
+        async with state.lock:
+            # someone else refreshed while we waited, their result is as fresh as ours would be
+            if state.last_fetch < asked_at:
+                # misses that queue up on the lock during this wait are answered by the same refresh
+                wait = state.last_fetch + self.min_interval - monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                await self._refresh(guild, state)
+        return self._lookup(state, action, target_id, window, predicate)
+
+    def _lookup(self, state, action, target_id, window, predicate):
+        try:
+            target_id = int(getattr(target_id, 'id', target_id))
+        except (TypeError, ValueError):
+            return None
+        now = datetime.now(timezone.utc)
+        for entry in state.index.get((action, target_id), ()):
+            if (now - entry.created_at).total_seconds() > window:
+                break
+            if predicate is None or predicate(entry):
+                return entry
+        return None
+
+    async def _refresh(self, guild, state):
+        # start over from the newest entries if we haven't looked in a while
+        if monotonic() - state.last_fetch > self.retention:
+            state.last_id = None
+        state.last_fetch = monotonic()
+        self.fetches += 1
+        try:
+            if state.last_id is None:
+                entries = [e async for e in guild.audit_logs(limit=self.page_limit)]
+            else:
+                entries = [e async for e in guild.audit_logs(limit=None, after=discord.Object(id=state.last_id))]
+        except discord.Forbidden:
+            logging.warning("AuditLogCache: missing View Audit Log permission for guild %s", guild.id)
+            state.forbidden_until = monotonic() + self.forbidden_ttl
+            return
+        except Exception:
+            logging.exception("AuditLogCache: failed to fetch audit logs for guild %s", guild.id)
+            return
+
+        for entry in entries:
+            target = getattr(getattr(entry, 'target', None), 'id', None)
+            if target is None:
+                continue
+            key = (entry.action, int(target))
+            bucket = state.index.setdefault(key, [])
+            if any(e.id == entry.id for e in bucket):
+                continue
+            bucket.append(entry)
+            bucket.sort(key=lambda e: e.id, reverse=True)
+            if state.last_id is None or entry.id > state.last_id:
+                state.last_id = entry.id
+        self._prune(state)
+
+    def _prune(self, state):
+        now = datetime.now(timezone.utc)
+        for key in list(state.index):
+            bucket = [e for e in state.index[key] if (now - e.created_at).total_seconds() <= self.retention]
+            if bucket:
+                state.index[key] = bucket
+            else:
+                del state.index[key]
+
+    def forget_guild(self, guild_id):
+        self._guilds.pop(guild_id, None)
+
+    def stats(self):
+        return {"guilds": len(self._guilds), "hits": self.hits, "fetches": self.fetches}
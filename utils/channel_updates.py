@@ -0,0 +1,90 @@
+import asyncio
+import logging
+from time import monotonic
+
+# Debounce stage for on_guild_channel_update.
+# Discord sends several update events for a single edit (and one per child channel when a
+# category is synced), so updates are buffered per (guild_id, channel_id): the first `before`
+# and the latest `after` are kept, and the guild's batch is flushed once no new update has
+# arrived for `delay` seconds (or `max_delay` after the first one, whichever comes first).
+
+class PendingChannelUpdate:
+    __slots__ = ('before', 'after', 'events')
+
+    def __init__(self, before, after):
+        self.before = before
+        self.after = after
+        self.events = 1
+
+class _GuildBatch:
+    __slots__ = ('updates', 'first_seen', 'handle')
+
+    def __init__(self, now: float):
+        self.updates = {}
+        self.first_seen = now
+        self.handle = None
+
+class ChannelUpdateBuffer:
+    def __init__(self, flush, delay: float = 2.0, max_delay: float = 10.0):
+        # flush(guild_id, [PendingChannelUpdate, ...]) is awaited once per batch
+        self._flush = flush
+        self.delay = delay
+        self.max_delay = max_delay
+        self._guilds = {}
+        self._tasks = set()
+        self.events = 0
+        self.flushed = 0
+
+    def push(self, before, after):
+        guild_id = after.guild.id
+        now = monotonic()
+        batch = self._guilds.get(guild_id)
+        if batch is None:
+            batch = self._guilds[guild_id] = _GuildBatch(now)
+
+        pending = batch.updates.get(after.id)
+        if pending is None:
+            batch.updates[after.id] = PendingChannelUpdate(before, after)
+        else:
+            pending.after = after
+            pending.events += 1
+        self.events += 1
+
+        if batch.handle is not None:
+            batch.handle.cancel()
+        wait = min(self.delay, max(0.0, batch.first_seen + self.max_delay - now))
+        batch.handle = asyncio.get_running_loop().call_later(wait, self._fire, guild_id)
+
+    def _fire(self, guild_id):
+        batch = self._guilds.pop(guild_id, None)
+        if batch is None or not batch.updates:
+            return
+        task = asyncio.get_running_loop().create_task(self._run(guild_id, list(batch.updates.values())))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, guild_id, updates):
+        self.flushed += len(updates)
+        try:
+            await self._flush(guild_id, updates)
+        except Exception:
+            logging.exception("ChannelUpdateBuffer: flush failed for guild %s", guild_id)
+
+    def pending(self) -> int:
+        return sum(len(batch.updates) for batch in self._guilds.values())
+
+    # Flush everything that is still buffered (used when the cog unloads)
+    async def close(self):
+        for guild_id, batch in list(self._guilds.items()):
+            if batch.handle is not None:
+                batch.handle.cancel()
+            self._fire(guild_id)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            'events': self.events,
+            'flushed': self.flushed,
+            'pending': self.pending(),
+        }
@@ -0,0 +1,76 @@
+import discord
+import logging
+from time import monotonic
+
+# Resolves channel ids to channel objects, gateway cache first and REST only on a miss.
+# Channels that 404 are remembered so they're never fetched again, channels we can't
+# see (403) are skipped for a while since permissions can change.
+
+class ChannelResolver:
+    def __init__(self, bot, forbidden_ttl: int = 300):
+        self.bot = bot
+        self.forbidden_ttl = forbidden_ttl
+        self._missing = set()
+        self._forbidden = {}
+        self.cache_hits = 0
+        self.rest_calls = 0
+        self.skipped = 0
+        self.not_found = 0
+        self.forbidden = 0
+
+    async def resolve(self, channel_id):
+        if not channel_id:
+            return None
+        try:
+            channel_id = int(channel_id)
+        except (TypeError, ValueError):
+            return None
+
+        channel = self.bot.get_channel(channel_id)
+        if channel is not None:
+            self.cache_hits += 1
+            return channel
+
+        if channel_id in self._missing:
+            self.skipped += 1
+            return None
+        blocked_until = self._forbidden.get(channel_id)
+        if blocked_until is not None:
+            if blocked_until > monotonic():
+                self.skipped += 1
+                return None
+            self._forbidden.pop(channel_id, None)
+
+        self.rest_calls += 1
+        try:
+            return await self.bot.fetch_channel(channel_id)
+        except discord.NotFound:
+            self.not_found += 1
+            self._missing.add(channel_id)
+        except discord.Forbidden:
+            self.forbidden += 1
+            self._forbidden[channel_id] = monotonic() + self.forbidden_ttl
+        except Exception:
+            logging.exception("ChannelResolver: failed to fetch channel %s", channel_id)
+        return None
+
+    # Channel was deleted, don't try it again
+    def mark_missing(self, channel_id):
+        self._missing.add(int(channel_id))
+
+    # Channel id was (re)configured, give it a fresh chance
+    def forget(self, channel_id):
+        channel_id = int(channel_id)
+        self._missing.discard(channel_id)
+        self._forbidden.pop(channel_id, None)
+
+    def stats(self):
+        return {
+            "cache_hits": self.cache_hits,
+            "rest_calls": self.rest_calls,
+            "skipped": self.skipped,
+            "not_found": self.not_found,
+            "forbidden": self.forbidden,
+            "missing": len(self._missing),
+            "blocked": len(self._forbidden),
+        }
@@ -0,0 +1,81 @@
+import asyncio
+
+from utils.db import INFO_ROW_QUERY
+
+# In-memory copy of each guild's row in the info table.
+# Rows are loaded once and kept until a write command invalidates/updates them.
+# Guilds without a row are cached as None so they don't hit the DB on every event either.
+
+class GuildConfigCache:
+    def __init__(self, pool):
+        self.pool = pool
+        self._rows = {}
+        self._pending = {}
+        self._generation = {}
+        self.hits = 0
+        self.misses = 0
+
+    # Get the info row for a guild as a dict (None if the guild has no row)
+    async def get(self, guild_id):
+        guild_id = int(guild_id)
+        if guild_id in self._rows:
+            self.hits += 1
+            return self._rows[guild_id]
+
+        self.misses += 1
+        # share one query between concurrent misses for the same guild
+        pending = self._pending.get(guild_id)
+        if pending is None:
+            pending = asyncio.ensure_future(self._load(guild_id))
+            self._pending[guild_id] = pending
+        return await asyncio.shield(pending)
+
+    async def _load(self, guild_id):
+        generation = self._generation.get(guild_id, 0)
+        try:
+            record = await self.pool.fetchrow(INFO_ROW_QUERY, guild_id)
+            row = dict(record) if record else None
+            # only store the row if nothing was written while we were loading it
+            if self._generation.get(guild_id, 0) == generation:
+                self._rows[guild_id] = row
+            return row
+        finally:
+            if self._generation.get(guild_id, 0) == generation:
+                self._pending.pop(guild_id, None)
+
+    # Get a single column, falls back to default when the row or value is missing
+    async def get_value(self, guild_id, column, default=None):
+        row = await self.get(guild_id)
+        if not row:
+            return default
+        value = row.get(column)
+        return default if value is None else value
+
+    # Drop a guild's row, the next get() reloads it from the DB
+    def invalidate(self, guild_id):
+        guild_id = int(guild_id)
+        self._generation[guild_id] = self._generation.get(guild_id, 0) + 1
+        self._rows.pop(guild_id, None)
+        self._pending.pop(guild_id, None)
+
+    # Patch already cached columns in place after a write (unknown rows are just invalidated)
+    def update(self, guild_id, **columns):
+        guild_id = int(guild_id)
+        row = self._rows.get(guild_id)
+        if row is None:
+            self.invalidate(guild_id)
+            return
+        row.update(columns)
+
+    def clear(self):
+        for guild_id in list(self._rows):
+            self.invalidate(guild_id)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "guilds": len(self._rows),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
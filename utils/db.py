@@ -0,0 +1,127 @@
+import asyncio
+import asyncpg
+import logging
+import random
+from time import perf_counter
+
+from utils.latency import LatencyWindow
+
+# Database pool setup shared by Main.py.
+# Pool sizes and timeouts can be overridden from apikeys.py (see apikeys-template.py).
+
+POOL_SETTINGS = {
+    # apikeys.py name: (create_pool argument, default)
+    'Pool_Min_Size': ('min_size', 2),
+    'Pool_Max_Size': ('max_size', 10),
+    'Pool_Command_Timeout': ('command_timeout', 10.0),
+    'Pool_Statement_Cache_Size': ('statement_cache_size', 256),
+    'Pool_Max_Inactive_Lifetime': ('max_inactive_connection_lifetime', 300.0),
+}
+
+# Queries run on (almost) every event. Each new connection runs them once in its init hook so their
+# prepared statements are already in asyncpg's per-connection statement cache when traffic arrives.
+INFO_ROW_QUERY = 'SELECT * FROM info WHERE guild_id = $1'
+HOT_QUERIES = [
+    (INFO_ROW_QUERY, (0,)),
+]
+
+def pool_settings(config) -> dict:
+    settings = {}
+    for name, (argument, default) in POOL_SETTINGS.items():
+        value = getattr(config, name, None)
+        settings[argument] = default if value is None else value
+    return settings
+
+async def init_connection(con):
+    for query, args in HOT_QUERIES:
+        try:
+            await con.fetch(query, *args)
+        except Exception:
+            logging.warning("Could not prepare query: %s", query)
+
+# query_logger (e.g. Metrics.on_query) is added to every connection after the warm-up queries
+async def create_pool(config, query_logger=None, **connect_kwargs):
+    async def init(con):
+        await init_connection(con)
+        if query_logger is not None:
+            con.add_query_logger(query_logger)
+    return await asyncpg.create_pool(init=init, **pool_settings(config), **connect_kwargs)
+
+# Exponential backoff with full jitter for reconnect attempts (attempt starts at 0)
+# The exponent is capped so a long outage can't overflow the float
+BACKOFF_MAX_EXPONENT = 16
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    return random.uniform(0, min(cap, base * 2 ** min(attempt, BACKOFF_MAX_EXPONENT)))
+
+# Periodically checks out a connection to see how long the pool makes callers wait
+class PoolHealthMonitor:
+    def __init__(self, pool, interval: float = 30.0, warn_saturation: float = 0.8, warn_wait_ms: float = 100.0):
+        self.pool = pool
+        self.interval = interval
+        self.warn_saturation = warn_saturation
+        self.warn_wait_ms = warn_wait_ms
+        self._task = None
+        self.last = {}
+        self.max_wait_ms = 0.0
+        self.acquire_ms = LatencyWindow()
+        self.query_ms = LatencyWindow()
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def probe(self) -> dict:
+        start = perf_counter()
+        async with self.pool.acquire() as con:
+            acquired = perf_counter()
+            await con.fetchval('SELECT 1')
+        done = perf_counter()
+
+        size = self.pool.get_size()
+        idle = self.pool.get_idle_size()
+        max_size = self.pool.get_max_size()
+        wait_ms = (acquired - start) * 1000
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        self.acquire_ms.add(wait_ms)
+        self.query_ms.add((done - acquired) * 1000)
+        self.last = {
+            'size': size,
+            'idle': idle,
+            'max_size': max_size,
+            'saturation': (size - idle) / max_size if max_size else 0.0,
+            'acquire_wait_ms': wait_ms,
+            'query_ms': (done - acquired) * 1000,
+        }
+        return self.last
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                stats = await self.probe()
+            except Exception:
+                logging.exception("PoolHealthMonitor: probe failed")
+                continue
+            if stats['saturation'] >= self.warn_saturation or stats['acquire_wait_ms'] >= self.warn_wait_ms:
+                logging.warning("DB pool under pressure: %s/%s connections busy, acquire took %.1f ms",
+                                stats['size'] - stats['idle'], stats['max_size'], stats['acquire_wait_ms'])
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return dict(
+            self.last,
+            max_acquire_wait_ms=self.max_wait_ms,
+            acquire_p50_ms=self.acquire_ms.percentile(50),
+            acquire_p95_ms=self.acquire_ms.percentile(95),
+            query_p50_ms=self.query_ms.percentile(50),
+            query_p95_ms=self.query_ms.percentile(95),
+        )
@@ -0,0 +1,109 @@
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+
+# Buffered writer for the event_log table.
+# Listeners call record() which only appends a tuple in memory; rows are written with one
+# COPY (copy_records_to_table) once flush_rows are waiting or every flush_interval seconds,
+# so logging history takes one pool connection per batch instead of one per event.
+# If a flush fails the rows are kept for the next one, up to max_buffered rows.
+
+EVENT_LOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS event_log (
+    id bigserial PRIMARY KEY,
+    created_at timestamptz NOT NULL,
+    guild_id bigint NOT NULL,
+    event text NOT NULL,
+    actor_id bigint,
+    target_id bigint,
+    channel_id bigint,
+    details jsonb
+);
+CREATE INDEX IF NOT EXISTS event_log_guild_created_idx ON event_log (guild_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS event_log_guild_target_idx ON event_log (guild_id, target_id, created_at DESC);
+"""
+
+EVENT_LOG_COLUMNS = ('created_at', 'guild_id', 'event', 'actor_id', 'target_id', 'channel_id', 'details')
+
+class EventLogWriter:
+    def __init__(self, pool, flush_rows: int = 500, flush_interval: float = 5.0, max_buffered: int = 50000):
+        self.pool = pool
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self._rows = []
+        self._task = None
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.failed_flushes = 0
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        async with self.pool.acquire() as con:
+            await con.execute(EVENT_LOG_SCHEMA)
+
+    def record(self, guild_id, event: str, *, actor_id=None, target_id=None, channel_id=None, details=None):
+        if guild_id is None:
+            return
+        if len(self._rows) >= self.max_buffered:
+            self.dropped += 1
+            return
+        self._rows.append((
+            datetime.now(timezone.utc),
+            int(guild_id),
+            event,
+            int(actor_id) if actor_id is not None else None,
+            int(target_id) if target_id is not None else None,
+            int(channel_id) if channel_id is not None else None,
+            json.dumps(details, default=str) if details else None,
+        ))
+        if len(self._rows) >= self.flush_rows:
+            self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self):
+        async with self._flush_lock:
+            if not self._rows:
+                return
+            rows, self._rows = self._rows, []
+            try:
+                async with self.pool.acquire() as con:
+                    await con.copy_records_to_table('event_log', records=rows, columns=EVENT_LOG_COLUMNS)
+                self.written += len(rows)
+            except Exception:
+                self.failed_flushes += 1
+                logging.exception("EventLogWriter: failed to write %s event(s)", len(rows))
+                # keep them for the next flush, newest rows win if the buffer is full
+                keep = max(0, self.max_buffered - len(self._rows))
+                self.dropped += max(0, len(rows) - keep)
+                self._rows = rows[-keep:] + self._rows if keep else self._rows
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            'buffered': len(self._rows),
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed_flushes': self.failed_flushes,
+        }
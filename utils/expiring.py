@@ -0,0 +1,99 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from time import monotonic
+
+# Dict whose entries expire after a ttl.
+# Deadlines live in a heap and a single sweeper task removes expired keys, so there's no
+# task per entry. Re-setting a key gives it a new deadline and the old heap entry is ignored,
+# which means an older entry's expiry can't remove a newer value. When max_size is reached
+# the entries closest to expiring are dropped first.
+
+class ExpiringDict:
+    def __init__(self, ttl: float, max_size: int = 10000, sweep_interval: float = 1.0):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.sweep_interval = sweep_interval
+        self._data = {}
+        self._heap = []
+        self._sweeper = None
+        self._counter = itertools.count()
+
+    def set(self, key, value, ttl: float = None):
+        deadline = monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (value, deadline)
+        heapq.heappush(self._heap, (deadline, next(self._counter), key))
+        while len(self._data) > self.max_size:
+            self._pop_earliest()
+        # drop stale heap entries once they clearly outnumber live ones
+        if len(self._heap) > 2 * len(self._data) + 64:
+            self._heap = [(d, i, k) for d, i, k in self._heap if self._data.get(k, (None, None))[1] == d]
+            heapq.heapify(self._heap)
+        self._ensure_sweeper()
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        value, deadline = entry
+        if deadline <= monotonic():
+            self._data.pop(key, None)
+            return default
+        return value
+
+    def __getitem__(self, key):
+        entry = self._data.get(key)
+        if entry is None or entry[1] <= monotonic():
+            raise KeyError(key)
+        return entry[0]
+
+    def pop(self, key, default=None):
+        entry = self._data.pop(key, None)
+        if entry is None or entry[1] <= monotonic():
+            return default
+        return entry[0]
+
+    def __contains__(self, key):
+        entry = self._data.get(key)
+        return entry is not None and entry[1] > monotonic()
+
+    def __len__(self):
+        return len(self._data)
+
+    def _pop_earliest(self):
+        while self._heap:
+            deadline, _, key = heapq.heappop(self._heap)
+            entry = self._data.get(key)
+            if entry is not None and entry[1] == deadline:
+                del self._data[key]
+                return
+
+    def expire(self):
+        now = monotonic()
+        while self._heap and self._heap[0][0] <= now:
+            deadline, _, key = heapq.heappop(self._heap)
+            entry = self._data.get(key)
+            if entry is not None and entry[1] == deadline:
+                del self._data[key]
+
+    def _ensure_sweeper(self):
+        if self._sweeper is not None and not self._sweeper.done():
+            return
+        try:
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep())
+        except RuntimeError:
+            # no running loop (e.g. set up before the bot starts), get() still expires lazily
+            self._sweeper = None
+
+    async def _sweep(self):
+        try:
+            while self._data:
+                await asyncio.sleep(self.sweep_interval)
+                self.expire()
+            self._heap.clear()
+        except Exception:
+            logging.exception("ExpiringDict sweeper failed")
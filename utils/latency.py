@@ -0,0 +1,30 @@
+from collections import deque
+
+# Rolling window of latency samples (ms) with nearest-rank percentiles
+
+class LatencyWindow:
+    def __init__(self, size: int = 100):
+        self.samples = deque(maxlen=size)
+
+    def add(self, ms: float):
+        self.samples.append(ms)
+
+    @property
+    def last(self):
+        return self.samples[-1] if self.samples else None
+
+    def percentile(self, p: float):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        rank = max(1, -(-len(ordered) * p // 100))  # ceil(n * p / 100)
+        return ordered[int(rank) - 1]
+
+    def __len__(self):
+        return len(self.samples)
+
+    # "12 ms (p50 10 ms / p95 31 ms, 40 samples)"
+    def describe(self) -> str:
+        if not self.samples:
+            return "no samples"
+        return f"{self.last:.0f} ms (p50 {self.percentile(50):.0f} ms / p95 {self.percentile(95):.0f} ms, {len(self)} samples)"
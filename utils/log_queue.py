@@ -0,0 +1,262 @@
+import asyncio
+import discord
+import logging
+from time import monotonic
+
+# Discord limits for a single message
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_FILES_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+# Outbound queue for log embeds, one worker per logging channel.
+# Embeds are packed up to 10 per message and flushed after flush_interval seconds or when
+# a message is full. When sends slow down (discord.py sleeping on a 429) or fail with a 429
+# the channel's flush interval grows so more embeds go out per request, and once max_pending
+# embeds are waiting send() blocks the caller until the worker catches up.
+# A batch rejected with a 400 is resent one embed at a time so only the bad entry is lost, and
+# close() sends whatever is still queued (up to a timeout) before stopping the workers.
+
+# Wakes a worker up during close()
+_STOP = object()
+
+class _Batch:
+    def __init__(self):
+        self.embeds = []
+        self.files = {}
+        self.chars = 0
+        # filenames each embed was queued with, to resend embeds one by one
+        self.item_files = []
+
+    @property
+    def full(self):
+        return len(self.embeds) >= MAX_EMBEDS_PER_MESSAGE or len(self.files) >= MAX_FILES_PER_MESSAGE
+
+    # Returns False when the item doesn't fit, the caller sends this batch and starts a new one
+    def add(self, embed, files) -> bool:
+        size = len(embed)
+        new_files = {}
+        duplicates = []
+        for f in files:
+            existing = self.files.get(f.filename) or new_files.get(f.filename)
+            if existing is None:
+                new_files[f.filename] = f
+            elif _same_source(existing, f):
+                duplicates.append(f)
+            elif self.embeds:
+                return False
+            else:
+                duplicates.append(f)
+        if self.embeds:
+            if len(self.embeds) >= MAX_EMBEDS_PER_MESSAGE or self.chars + size > MAX_EMBED_CHARS_PER_MESSAGE:
+                return False
+            if len(self.files) + len(new_files) > MAX_FILES_PER_MESSAGE:
+                return False
+
+        self.embeds.append(embed)
+        self.item_files.append([f.filename for f in files])
+        self.files.update(new_files)
+        self.chars += size
+        # the same image on disk only has to be uploaded once per message
+        for f in duplicates:
+            f.close()
+        return True
+
+# discord.py closes every file passed to send(), even when the request fails. Sending a fresh File
+# over the same data keeps the original usable for a retry (and its close() for the final cleanup).
+def _borrow(f):
+    f.reset()
+    return discord.File(f.fp, filename=f.filename, spoiler=f.spoiler, description=f.description)
+
+def _uses_file(embed, filename) -> bool:
+    return f"attachment://{filename}" in str(embed.to_dict())
+
+def _same_source(a, b) -> bool:
+    a_path = getattr(a.fp, 'name', None)
+    b_path = getattr(b.fp, 'name', None)
+    return isinstance(a_path, str) and a_path == b_path
+
+class _ChannelQueue:
+    def __init__(self, owner, channel):
+        self.owner = owner
+        self.channel = channel
+        self.queue = asyncio.Queue(maxsize=owner.max_pending)
+        self.delay = owner.flush_interval
+        self.carry = None
+        self.task = None
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        batch = None
+        try:
+            while True:
+                if self.carry is not None:
+                    first, self.carry = self.carry, None
+                elif self.owner.closing and self.queue.empty():
+                    return
+                else:
+                    try:
+                        first = await asyncio.wait_for(self.queue.get(), timeout=self.owner.idle_timeout)
+                    except asyncio.TimeoutError:
+                        return
+                if first is _STOP:
+                    continue
+
+                batch = _Batch()
+                batch.add(*first)
+                deadline = loop.time() + self.delay
+                while not batch.full:
+                    # while closing, pack what is already queued without waiting for more
+                    if self.owner.closing:
+                        try:
+                            item = self.queue.get_nowait()
+                        except asyncio.QueueEmpty:
+                            break
+                    else:
+                        timeout = deadline - loop.time()
+                        if timeout <= 0:
+                            break
+                        try:
+                            item = await asyncio.wait_for(self.queue.get(), timeout=timeout)
+                        except asyncio.TimeoutError:
+                            break
+                    if item is _STOP:
+                        continue
+                    if not batch.add(*item):
+                        self.carry = item
+                        break
+
+                await self.deliver(batch)
+                batch = None
+        except asyncio.CancelledError:
+            # files of a batch that never made it to deliver() still hold their budget
+            if batch is not None:
+                for f in batch.files.values():
+                    f.close()
+            raise
+        finally:
+            if self.owner._queues.get(self.channel.id) is self:
+                self.owner._queues.pop(self.channel.id, None)
+
+    async def deliver(self, batch):
+        start = monotonic()
+        rate_limited = False
+        icons = getattr(self.owner.bot, 'icons', None)
+        files = list(batch.files.values())
+        if icons is not None:
+            files += icons.attach(*batch.embeds)
+        try:
+            await self.send(batch.embeds, files)
+        except discord.HTTPException as e:
+            rate_limited = e.status == 429
+            if e.status == 400 and len(batch.embeds) > 1:
+                # one invalid embed rejects the whole message, resend them one at a time
+                await self.deliver_each(batch, files)
+            else:
+                logging.exception("LogQueue: failed to send %s embed(s) to channel %s", len(batch.embeds), self.channel.id)
+        except Exception:
+            logging.exception("LogQueue: failed to send %s embed(s) to channel %s", len(batch.embeds), self.channel.id)
+        finally:
+            # discord.py closes files it uploaded, this also covers sends that failed before the upload
+            for f in files:
+                f.close()
+
+        # discord.py waits out 429s inside send(), so a slow send means the bucket is empty
+        if rate_limited or monotonic() - start > self.owner.slow_send:
+            self.owner.rate_limited += 1
+            self.delay = min(self.delay * 2, self.owner.max_flush_interval)
+        else:
+            self.delay = max(self.owner.flush_interval, self.delay * 0.75)
+
+    async def send(self, embeds, files):
+        message = await self.channel.send(embeds=embeds, files=[_borrow(f) for f in files])
+        icons = getattr(self.owner.bot, 'icons', None)
+        if icons is not None:
+            icons.remember(message)
+        self.owner.messages_sent += 1
+        self.owner.embeds_sent += len(embeds)
+
+    async def deliver_each(self, batch, files):
+        for embed, filenames in zip(batch.embeds, batch.item_files):
+            needed = [f for f in files if f.filename in filenames or _uses_file(embed, f.filename)]
+            try:
+                await self.send([embed], needed)
+            except Exception:
+                self.owner.dropped += 1
+                logging.exception("LogQueue: dropped a log embed (%r) rejected by channel %s", embed.title, self.channel.id)
+
+class LogQueue:
+    def __init__(self, bot, flush_interval: float = 1.5, max_flush_interval: float = 15.0, max_pending: int = 200, slow_send: float = 1.0, idle_timeout: float = 60.0):
+        self.bot = bot
+        self.flush_interval = flush_interval
+        self.max_flush_interval = max_flush_interval
+        self.max_pending = max_pending
+        self.slow_send = slow_send
+        self.idle_timeout = idle_timeout
+        self._queues = {}
+        self.closing = False
+        self.dropped = 0
+        self.messages_sent = 0
+        self.embeds_sent = 0
+        self.rate_limited = 0
+
+    # Queue an embed (and its files) for a logging channel
+    async def send(self, channel, *, embed, file=None, files=None):
+        attached = list(files or [])
+        if file is not None:
+            attached.append(file)
+
+        channel_queue = self._queues.get(channel.id)
+        if channel_queue is None:
+            channel_queue = _ChannelQueue(self, channel)
+            self._queues[channel.id] = channel_queue
+        if channel_queue.task is None or channel_queue.task.done():
+            channel_queue.task = asyncio.create_task(channel_queue.run())
+        await channel_queue.queue.put((embed, attached))
+
+    def pending(self):
+        return sum(q.queue.qsize() for q in self._queues.values())
+
+    # Send what is still queued, then stop. Whatever isn't out after `timeout` seconds is dropped.
+    async def close(self, timeout: float = 10.0):
+        self.closing = True
+        queues = list(self._queues.values())
+        tasks = []
+        for channel_queue in queues:
+            if channel_queue.task is None or channel_queue.task.done():
+                continue
+            tasks.append(channel_queue.task)
+            try:
+                channel_queue.queue.put_nowait(_STOP)
+            except asyncio.QueueFull:
+                pass  # the worker is busy and exits once the queue is empty
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+                logging.warning("LogQueue: gave up on %s channel(s) after %.0f seconds", len(pending), timeout)
+
+        # release the files (and archived attachment budgets) of anything that didn't go out
+        for channel_queue in queues:
+            leftovers = [channel_queue.carry] if channel_queue.carry is not None else []
+            while not channel_queue.queue.empty():
+                leftovers.append(channel_queue.queue.get_nowait())
+            for item in leftovers:
+                if item is _STOP:
+                    continue
+                self.dropped += 1
+                for f in item[1]:
+                    f.close()
+            channel_queue.carry = None
+        self._queues.clear()
+
+    def stats(self):
+        return {
+            "channels": len(self._queues),
+            "pending": self.pending(),
+            "messages_sent": self.messages_sent,
+            "embeds_sent": self.embeds_sent,
+            "rate_limited": self.rate_limited,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import traceback
+from collections import deque
+from time import monotonic
+
+from utils.latency import LatencyWindow
+
+# Event loop lag sampler and slow callback reporter.
+# A task on the loop wakes up every `interval` seconds and records how late it woke up (the lag).
+# A watchdog thread checks when that task last ran: once the loop has been stuck for more than
+# slow_ms it grabs the loop thread's stack and the running task, which is the code blocking it.
+# When the loop gets going again the report is logged with the measured lag and kept in `recent`.
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAX_STACK_FRAMES = 15
+
+class SlowCallback:
+    __slots__ = ('task', 'where', 'stack', 'blocked_ms', 'at')
+
+    def __init__(self, task, where, stack, at):
+        self.task = task
+        self.where = where
+        self.stack = stack
+        self.blocked_ms = None
+        self.at = at
+
+# Innermost frame from the bot's own code, e.g. "cogs/logging.py:412 in _log_channel_update"
+def _own_frame(frames) -> str:
+    for frame in reversed(frames):
+        if frame.filename.startswith(REPO_ROOT) and not frame.filename.endswith('loop_monitor.py'):
+            return f"{os.path.relpath(frame.filename, REPO_ROOT)}:{frame.lineno} in {frame.name}"
+    if frames:
+        return f"{frames[-1].filename}:{frames[-1].lineno} in {frames[-1].name}"
+    return "unknown"
+
+class LoopMonitor:
+    def __init__(self, interval: float = 0.25, slow_ms: float = 100.0, keep: int = 20):
+        self.interval = interval
+        self.slow_ms = slow_ms
+        self.lag_ms = LatencyWindow(size=240)
+        self.max_lag_ms = 0.0
+        self.slow_callbacks = 0
+        self.recent = deque(maxlen=keep)
+        self._loop = None
+        self._loop_thread_id = None
+        self._last_tick = monotonic()
+        self._blocked = None
+        self._task = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        if self._task is not None and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._sample())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def _sample(self):
+        while True:
+            expected = monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = monotonic()
+            self._last_tick = now
+            lag = max(0.0, (now - expected) * 1000)
+            self.lag_ms.add(lag)
+            self.max_lag_ms = max(self.max_lag_ms, lag)
+
+            blocked, self._blocked = self._blocked, None
+            if blocked is not None:
+                blocked.blocked_ms = lag
+                self.slow_callbacks += 1
+                self.recent.append(blocked)
+                logging.warning("Event loop blocked for %.0f ms at %s (task %s)\n%s", lag, blocked.where, blocked.task, blocked.stack)
+
+    # Runs on the watchdog thread
+    def _watch(self):
+        while not self._stop.wait(self.slow_ms / 2000):
+            stalled_ms = (monotonic() - self._last_tick - self.interval) * 1000
+            if stalled_ms < self.slow_ms or self._blocked is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            frames = traceback.extract_stack(frame)[-MAX_STACK_FRAMES:]
+            try:
+                task = asyncio.current_task(self._loop)
+            except RuntimeError:
+                task = None
+            self._blocked = SlowCallback(
+                task.get_name() if task is not None else None,
+                _own_frame(frames),
+                "".join(traceback.format_list(frames)),
+                monotonic(),
+            )
+            del frame
+
+    async def close(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            'lag_ms': self.lag_ms.last,
+            'lag_p50_ms': self.lag_ms.percentile(50),
+            'lag_p95_ms': self.lag_ms.percentile(95),
+            'max_lag_ms': self.max_lag_ms,
+            'slow_callbacks': self.slow_callbacks,
+        }
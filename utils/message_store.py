@@ -0,0 +1,174 @@
+from collections import OrderedDict
+from time import monotonic
+
+# Compact copy of recent guild messages so deletions and edits can be logged after discord.py's
+# own message cache (1000 messages for the whole bot) has moved on.
+# Messages are kept per guild in insertion order, so a busy guild only evicts its own history:
+# each guild holds at most max_per_guild messages and nothing older than max_age seconds.
+# On top of that the whole store is capped at max_messages / max_bytes (estimated), past which
+# the oldest messages of any guild are evicted, so memory doesn't grow with the guild count.
+
+# Rough per-object overhead used for the byte estimate
+MESSAGE_OVERHEAD_BYTES = 200
+ATTACHMENT_OVERHEAD_BYTES = 100
+
+class CachedAttachment:
+    __slots__ = ('filename', 'url', 'content_type', 'size')
+
+    def __init__(self, filename, url, content_type, size):
+        self.filename = filename
+        self.url = url
+        self.content_type = content_type
+        self.size = size
+
+class CachedMessage:
+    __slots__ = ('id', 'guild_id', 'channel_id', 'author_id', 'author_name', 'content', 'attachments', 'stored_at', 'size')
+
+    def __init__(self, id, guild_id, channel_id, author_id, author_name, content, attachments, stored_at):
+        self.id = id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.author_id = author_id
+        self.author_name = author_name
+        self.content = content
+        self.attachments = attachments
+        self.stored_at = stored_at
+        self.size = (MESSAGE_OVERHEAD_BYTES + len(content) + len(author_name)
+                     + sum(ATTACHMENT_OVERHEAD_BYTES + len(a.url) + len(a.filename) for a in attachments))
+
+    @classmethod
+    def from_message(cls, message, now: float = None):
+        attachments = tuple(
+            CachedAttachment(a.filename, a.url, a.content_type, a.size) for a in message.attachments
+        )
+        return cls(
+            message.id,
+            message.guild.id if message.guild else None,
+            message.channel.id,
+            message.author.id,
+            str(message.author),
+            message.content or "",
+            attachments,
+            monotonic() if now is None else now,
+        )
+
+    @property
+    def author_mention(self):
+        return f"<@{self.author_id}>"
+
+    @property
+    def channel_mention(self):
+        return f"<#{self.channel_id}>"
+
+class MessageStore:
+    def __init__(self, max_per_guild: int = 5000, max_age: float = 3 * 24 * 3600, prune_every: int = 1000, max_messages: int = 200_000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_per_guild = max_per_guild
+        self.max_age = max_age
+        self.prune_every = prune_every
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self._guilds = {}
+        # every stored message in insertion order, for the global limits and age pruning
+        self._all = OrderedDict()
+        self.bytes = 0
+        self.evicted = 0
+        self._adds = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _store(self, guild_id, cached):
+        key = (guild_id, cached.id)
+        previous = self._all.get(key)
+        if previous is not None:
+            self.bytes -= previous.size
+        self._all[key] = cached
+        self._guilds[guild_id][cached.id] = cached
+        self.bytes += cached.size
+
+    def _remove(self, guild_id, message_id):
+        cached = self._all.pop((guild_id, message_id), None)
+        if cached is None:
+            return None
+        self.bytes -= cached.size
+        messages = self._guilds.get(guild_id)
+        if messages is not None:
+            messages.pop(message_id, None)
+            if not messages:
+                del self._guilds[guild_id]
+        return cached
+
+    def add(self, message):
+        if message.guild is None:
+            return
+        now = monotonic()
+        guild_id = message.guild.id
+        messages = self._guilds.get(guild_id)
+        if messages is None:
+            messages = self._guilds[guild_id] = OrderedDict()
+        self._store(guild_id, CachedMessage.from_message(message, now))
+        if len(messages) > self.max_per_guild:
+            self._remove(guild_id, next(iter(messages)))
+
+        # oldest messages across all guilds go first once the whole store is too big
+        while self._all and (len(self._all) > self.max_messages or self.bytes > self.max_bytes):
+            oldest_guild, oldest_id = next(iter(self._all))
+            self._remove(oldest_guild, oldest_id)
+            self.evicted += 1
+
+        self._adds += 1
+        if self._adds % self.prune_every == 0:
+            self.prune(now)
+
+    # Keep the stored copy in line with an edit, returns the previous copy (or None)
+    def update(self, message):
+        messages = self._guilds.get(message.guild.id) if message.guild else None
+        if not messages or message.id not in messages:
+            return None
+        previous = messages[message.id]
+        self._store(message.guild.id, CachedMessage.from_message(message, previous.stored_at))
+        return previous
+
+    def get(self, guild_id, message_id):
+        messages = self._guilds.get(guild_id)
+        cached = messages.get(message_id) if messages else None
+        if cached is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return cached
+
+    def pop(self, guild_id, message_id):
+        cached = self._remove(guild_id, message_id)
+        if cached is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return cached
+
+    # Drop messages older than max_age in every guild
+    def prune(self, now: float = None):
+        cutoff = (monotonic() if now is None else now) - self.max_age
+        while self._all:
+            (guild_id, message_id), oldest = next(iter(self._all.items()))
+            if oldest.stored_at >= cutoff:
+                break
+            self._remove(guild_id, message_id)
+
+    def forget_guild(self, guild_id):
+        for message_id in list(self._guilds.get(guild_id, ())):
+            self._remove(guild_id, message_id)
+
+    def __len__(self):
+        return len(self._all)
+
+    def stats(self) -> dict:
+        return {
+            'guilds': len(self._guilds),
+            'messages': len(self),
+            'bytes': self.bytes,
+            'max_messages': self.max_messages,
+            'max_bytes': self.max_bytes,
+            'evicted': self.evicted,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
@@ -0,0 +1,270 @@
+import aiohttp
+import contextvars
+import discord
+import logging
+from aiohttp import web
+from discord import app_commands
+from discord.ext import commands
+from time import perf_counter
+
+from utils.latency import LatencyWindow
+
+# Per-handler instrumentation: every listener and command gets a call count, an error count,
+# a latency histogram and the DB queries / REST requests made while it ran.
+# The running handler is kept in a context variable (each listener and command runs in its own
+# task), so the asyncpg query logger and the aiohttp trace hooks can charge their calls to it.
+# Calls made outside any handler (log queue, event log flushes, the gateway) count as "background".
+
+# Histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRIC_PREFIX = "holyroller"
+
+_current_handler = contextvars.ContextVar('current_handler', default=None)
+
+class HandlerStats:
+    __slots__ = ('kind', 'name', 'calls', 'errors', 'last_error', 'buckets', 'total_seconds', 'max_ms', 'recent_ms',
+                 'db_queries', 'db_seconds', 'rest_requests', 'rest_seconds', 'rest_rate_limited')
+
+    def __init__(self, kind: str, name: str):
+        self.kind = kind
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.last_error = None
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.total_seconds = 0.0
+        self.max_ms = 0.0
+        self.recent_ms = LatencyWindow()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.rest_requests = 0
+        self.rest_seconds = 0.0
+        self.rest_rate_limited = 0
+
+    def observe(self, seconds: float, error=None):
+        self.calls += 1
+        self.total_seconds += seconds
+        ms = seconds * 1000
+        self.max_ms = max(self.max_ms, ms)
+        self.recent_ms.add(ms)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+        if error is not None:
+            self.errors += 1
+            self.last_error = error if isinstance(error, str) else f"{type(error).__name__}: {error}"[:200]
+
+    def per_call(self, value) -> float:
+        return value / self.calls if self.calls else 0.0
+
+class Metrics:
+    def __init__(self):
+        self.handlers = {}
+        self.background = HandlerStats('background', 'background')
+        self._collectors = {}
+
+    def handler(self, kind: str, name: str) -> HandlerStats:
+        stats = self.handlers.get((kind, name))
+        if stats is None:
+            stats = self.handlers[(kind, name)] = HandlerStats(kind, name)
+        return stats
+
+    # Export the numbers from a stats() method (log queue, caches, pool...) as gauges
+    def add_collector(self, name: str, collect):
+        self._collectors[name] = collect
+
+    # Wrap an event handler so each call is timed and charged with its DB/REST calls
+    def wrap(self, coro, kind: str = 'listener', name: str = None):
+        stats = self.handler(kind, name or getattr(coro, '__qualname__', repr(coro)))
+
+        async def instrumented(*args, **kwargs):
+            token = _current_handler.set(stats)
+            start = perf_counter()
+            error = None
+            try:
+                return await coro(*args, **kwargs)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                stats.observe(perf_counter() - start, error)
+                _current_handler.reset(token)
+        return instrumented
+
+    # Run an awaitable as the given handler (commands, where errors are reported through a flag)
+    async def track(self, kind: str, name: str, awaitable, failed):
+        stats = self.handler(kind, name)
+        token = _current_handler.set(stats)
+        start = perf_counter()
+        try:
+            await awaitable
+        finally:
+            stats.observe(perf_counter() - start, "command failed" if failed() else None)
+            _current_handler.reset(token)
+
+    # asyncpg query logger, runs right after each query in the caller's context
+    def on_query(self, record):
+        stats = _current_handler.get() or self.background
+        stats.db_queries += 1
+        stats.db_seconds += record.elapsed
+
+    # aiohttp trace hooks for discord.py's HTTP session (REST calls)
+    def http_trace(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_end)
+        trace.on_request_exception.append(self._on_request_end)
+        return trace
+
+    async def _on_request_start(self, session, trace_ctx, params):
+        stats = _current_handler.get() or self.background
+        stats.rest_requests += 1
+        trace_ctx.handler = stats
+        trace_ctx.start = perf_counter()
+
+    async def _on_request_end(self, session, trace_ctx, params):
+        stats = getattr(trace_ctx, 'handler', None)
+        if stats is None:
+            return
+        stats.rest_seconds += perf_counter() - trace_ctx.start
+        response = getattr(params, 'response', None)
+        if response is not None and response.status == 429:
+            stats.rest_rate_limited += 1
+
+    # Handlers sorted by total time (default), calls or errors
+    def top(self, sort: str = 'time', limit: int = 10):
+        keys = {
+            'time': lambda s: s.total_seconds,
+            'calls': lambda s: s.calls,
+            'errors': lambda s: s.errors,
+        }
+        return sorted(self.handlers.values(), key=keys[sort], reverse=True)[:limit]
+
+    # Prometheus text exposition format
+    def render(self) -> str:
+        lines = []
+        handlers = [self.background] + list(self.handlers.values())
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+
+        def sample(name, labels, value):
+            label_text = ",".join(f'{key}="{_escape_label(val)}"' for key, val in labels.items())
+            lines.append(f"{METRIC_PREFIX}_{name}{{{label_text}}} {value}")
+
+        def labels_of(stats, **extra):
+            return dict(kind=stats.kind, handler=stats.name, **extra)
+
+        family("handler_calls_total", "counter", "Handler invocations.")
+        for stats in handlers[1:]:
+            sample("handler_calls_total", labels_of(stats), stats.calls)
+        family("handler_errors_total", "counter", "Handler invocations that raised or failed.")
+        for stats in handlers[1:]:
+            sample("handler_errors_total", labels_of(stats), stats.errors)
+
+        family("handler_duration_seconds", "histogram", "Handler latency.")
+        for stats in handlers[1:]:
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                cumulative += count
+                sample("handler_duration_seconds_bucket", labels_of(stats, le=repr(bound)), cumulative)
+            sample("handler_duration_seconds_bucket", labels_of(stats, le="+Inf"), stats.calls)
+            sample("handler_duration_seconds_sum", labels_of(stats), stats.total_seconds)
+            sample("handler_duration_seconds_count", labels_of(stats), stats.calls)
+
+        family("db_queries_total", "counter", "DB queries made while the handler ran.")
+        for stats in handlers:
+            sample("db_queries_total", labels_of(stats), stats.db_queries)
+        family("db_seconds_total", "counter", "Time spent in DB queries made while the handler ran.")
+        for stats in handlers:
+            sample("db_seconds_total", labels_of(stats), stats.db_seconds)
+        family("rest_requests_total", "counter", "Discord REST requests made while the handler ran.")
+        for stats in handlers:
+            sample("rest_requests_total", labels_of(stats), stats.rest_requests)
+        family("rest_seconds_total", "counter", "Time spent in Discord REST requests made while the handler ran.")
+        for stats in handlers:
+            sample("rest_seconds_total", labels_of(stats), stats.rest_seconds)
+        family("rest_rate_limited_total", "counter", "Discord REST requests answered with a 429.")
+        for stats in handlers:
+            sample("rest_rate_limited_total", labels_of(stats), stats.rest_rate_limited)
+
+        for collector, collect in self._collectors.items():
+            try:
+                values = collect()
+            except Exception:
+                logging.debug("Metrics: collector %s failed", collector, exc_info=True)
+                continue
+            for key, value in values.items():
+                if isinstance(value, (int, float)):
+                    name = f"{collector}_{key}"
+                    lines.append(f"# TYPE {METRIC_PREFIX}_{name} gauge")
+                    lines.append(f"{METRIC_PREFIX}_{name} {float(value)}")
+
+        return "\n".join(lines) + "\n"
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+# Bot that runs every event handler (cog listeners and @bot.event) and prefix command through the metrics
+class InstrumentedBot(commands.AutoShardedBot):
+    def __init__(self, *args, metrics: Metrics, **kwargs):
+        self.metrics = metrics
+        kwargs.setdefault('tree_cls', InstrumentedTree)
+        super().__init__(*args, http_trace=metrics.http_trace(), **kwargs)
+
+    async def _run_event(self, coro, event_name, *args, **kwargs):
+        await super()._run_event(self.metrics.wrap(coro), event_name, *args, **kwargs)
+
+    async def invoke(self, ctx: commands.Context):
+        if ctx.command is None:
+            return await super().invoke(ctx)
+        await self.metrics.track('command', ctx.command.qualified_name, super().invoke(ctx), lambda: ctx.command_failed)
+
+    # Unload the cogs first (they flush buffered updates into the log queue), then send what's
+    # still queued while the HTTP session is open, then close the client
+    async def close(self):
+        for extension in tuple(self.extensions):
+            try:
+                await self.unload_extension(extension)
+            except Exception:
+                logging.exception("Could not unload %s", extension)
+        log_queue = getattr(self, 'log_queue', None)
+        if log_queue is not None:
+            await log_queue.close()
+        await super().close()
+
+# Slash commands (including the slash side of hybrid commands) and their autocomplete
+class InstrumentedTree(app_commands.CommandTree):
+    async def _call(self, interaction: discord.Interaction):
+        command = interaction.command
+        metrics = getattr(self.client, 'metrics', None)
+        if command is None or metrics is None:
+            return await super()._call(interaction)
+        kind = 'autocomplete' if interaction.type == discord.InteractionType.autocomplete else 'app_command'
+        await metrics.track(kind, command.qualified_name, super()._call(interaction), lambda: interaction.command_failed)
+
+# Serves the metrics in Prometheus format on http://host:port/metrics
+class MetricsServer:
+    def __init__(self, metrics: Metrics, host: str = '127.0.0.1', port: int = 9108):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._runner = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/metrics', self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logging.info("Serving metrics on http://%s:%s/metrics", self.host, self.port)
+
+    async def _handle(self, request):
+        return web.Response(body=self.metrics.render().encode(), headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'})
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
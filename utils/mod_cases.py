@@ -0,0 +1,58 @@
+import logging
+
+# Moderation case history.
+# Cases are read newest first per (guild, user) with keyset pagination: a page ends at the
+# (created_at, id) of its last case and the next page starts strictly after that, so every page is
+# a range scan on mod_cases_guild_user_idx no matter how far back it is.
+
+MOD_CASES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mod_cases (
+    id bigserial PRIMARY KEY,
+    guild_id bigint NOT NULL,
+    user_id bigint NOT NULL,
+    moderator_id bigint,
+    action text NOT NULL,
+    reason text,
+    duration_seconds integer,
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS mod_cases_guild_user_idx ON mod_cases (guild_id, user_id, created_at DESC, id DESC);
+"""
+
+CASES_PER_PAGE = 10
+
+class ModCaseStore:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def ensure_table(self):
+        async with self.pool.acquire() as con:
+            await con.execute(MOD_CASES_SCHEMA)
+
+    async def add(self, guild_id, user_id, moderator_id, action, reason=None, duration_seconds=None):
+        try:
+            return await self.pool.fetchrow(
+                'INSERT INTO mod_cases (guild_id, user_id, moderator_id, action, reason, duration_seconds) VALUES ($1, $2, $3, $4, $5, $6) RETURNING id, created_at',
+                guild_id, user_id, moderator_id, action, reason, duration_seconds)
+        except Exception:
+            logging.exception("ModCaseStore: failed to store %s case", action)
+            return None
+
+    # Cases older than `after` (a (created_at, id) cursor, None for the newest page)
+    async def page(self, guild_id, user_id, after=None, limit: int = CASES_PER_PAGE):
+        if after is None:
+            rows = await self.pool.fetch(
+                'SELECT id, moderator_id, action, reason, duration_seconds, created_at FROM mod_cases '
+                'WHERE guild_id = $1 AND user_id = $2 ORDER BY created_at DESC, id DESC LIMIT $3',
+                guild_id, user_id, limit + 1)
+        else:
+            rows = await self.pool.fetch(
+                'SELECT id, moderator_id, action, reason, duration_seconds, created_at FROM mod_cases '
+                'WHERE guild_id = $1 AND user_id = $2 AND (created_at, id) < ($3, $4) ORDER BY created_at DESC, id DESC LIMIT $5',
+                guild_id, user_id, after[0], after[1], limit + 1)
+        # one extra row tells us whether there is an older page
+        has_more = len(rows) > limit
+        return rows[:limit], has_more
+
+    async def count(self, guild_id, user_id):
+        return await self.pool.fetchval('SELECT count(*) FROM mod_cases WHERE guild_id = $1 AND user_id = $2', guild_id, user_id)
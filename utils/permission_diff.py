@@ -0,0 +1,127 @@
+import discord
+
+# Permission overwrite diffs on the raw allow/deny integers.
+# Everything that can be precomputed is: each tracked permission's bit, its position
+# (for a stable display order) and its formatted "Label :emoji:" text for every state.
+# A diff is then a couple of XORs and only the bits that changed get turned into text.
+
+# Permission labels for prettier display (also the tracked permissions, in display order)
+PERM_LABELS = {
+    'view_channel': 'View Channel',
+    'send_messages': 'Send Messages',
+    'send_tts_messages': 'Send TTS Messages',
+    'manage_messages': 'Manage Messages',
+    'embed_links': 'Embed Links',
+    'attach_files': 'Attach Files',
+    'read_message_history': 'Read Message History',
+    'mention_everyone': 'Mention everyone',
+    'use_external_emojis': 'Use External Emojis',
+    'add_reactions': 'Add Reactions',
+    'manage_roles': 'Manage Roles',
+    'manage_channels': 'Manage Channels',
+    'manage_webhooks': 'Manage Webhooks',
+    'connect': 'Connect (voice)',
+    'speak': 'Speak (voice)',
+    'mute_members': 'Mute Members',
+    'deafen_members': 'Deafen Members',
+    'move_members': 'Move Members',
+    'priority_speaker': 'Priority Speaker',
+    'create_instant_invite': 'Create Instant Invite',
+    'manage_threads': 'Manage Threads',
+    'send_messages_in_threads': 'Send Messages In Threads',
+    'use_application_commands': 'Use Application Commands',
+    'moderate_members': 'Moderate Members'
+}
+
+STATE_SYMBOLS = {
+    'Allow': ':green_square:',
+    'Disallow': ':red_square:',
+    'N/A': ':white_large_square:',
+}
+
+def pretty_perm_label(key: str) -> str:
+    return PERM_LABELS.get(key, key.replace('_', ' ').title())
+
+def perm_state_symbol(state: str) -> str:
+    return STATE_SYMBOLS.get(state, STATE_SYMBOLS['N/A'])
+
+def format_perm_state(key: str, state: str) -> str:
+    # place the emoji on the right side of permission
+    return f"{pretty_perm_label(key)} {perm_state_symbol(state)}"
+
+# (bit, name) in display order, and bit -> (position, {state: formatted line})
+PERM_BITS = [(discord.Permissions.VALID_FLAGS[name], name) for name in PERM_LABELS if name in discord.Permissions.VALID_FLAGS]
+_BIT_INFO = {
+    bit: (position, {state: format_perm_state(name, state) for state in STATE_SYMBOLS})
+    for position, (bit, name) in enumerate(PERM_BITS)
+}
+TRACKED_MASK = 0
+for _bit, _name in PERM_BITS:
+    TRACKED_MASK |= _bit
+
+# Explicit (allow, deny) bits of an overwrite, limited to the tracked permissions
+def overwrite_bits(overwrite):
+    if overwrite is None:
+        return 0, 0
+    try:
+        allow, deny = overwrite.pair()
+    except Exception:
+        return 0, 0
+    allow_value = allow.value
+    deny_value = deny.value
+    # a bit set on both sides isn't an explicit state
+    return (allow_value & ~deny_value) & TRACKED_MASK, (deny_value & ~allow_value) & TRACKED_MASK
+
+def _bits_in_order(mask):
+    bits = []
+    while mask:
+        low = mask & -mask
+        mask ^= low
+        if low in _BIT_INFO:
+            bits.append(low)
+    bits.sort(key=lambda bit: _BIT_INFO[bit][0])
+    return bits
+
+# "Label :emoji:" lines for every bit in mask
+def format_states(allow, deny, mask):
+    lines = []
+    for bit in _bits_in_order(mask):
+        state = 'Allow' if allow & bit else 'Disallow' if deny & bit else 'N/A'
+        lines.append(_BIT_INFO[bit][1][state])
+    return lines
+
+# Lines for the explicitly set permissions of one overwrite
+def format_overwrite(overwrite):
+    allow, deny = overwrite_bits(overwrite)
+    return format_states(allow, deny, allow | deny)
+
+# Bits whose explicit state differs between two overwrites
+def changed_mask(before, after):
+    before_allow, before_deny = overwrite_bits(before)
+    after_allow, after_deny = overwrite_bits(after)
+    return (before_allow ^ after_allow) | (before_deny ^ after_deny)
+
+# Compare two overwrites for the same role/member.
+# Returns (kind, before_lines, after_lines) with kind Added/Removed/Changed, or None if nothing changed
+def compare_overwrites(before, after):
+    before_allow, before_deny = overwrite_bits(before)
+    after_allow, after_deny = overwrite_bits(after)
+    before_set = before_allow | before_deny
+    after_set = after_allow | after_deny
+
+    if not before_set and after_set:
+        return 'Added', [], format_states(after_allow, after_deny, after_set)
+    if not after_set and before_set:
+        return 'Removed', format_states(before_allow, before_deny, before_set), []
+    changed = (before_allow ^ after_allow) | (before_deny ^ after_deny)
+    if not changed:
+        return None
+    return 'Changed', format_states(before_allow, before_deny, changed), format_states(after_allow, after_deny, changed)
+
+# Overwrites of a channel as a plain {target: PermissionOverwrite} dict
+def overwrites_of(channel):
+    ow_map = getattr(channel, 'overwrites', None) or getattr(channel, 'overwrites_map', None) or {}
+    try:
+        return dict(ow_map.items())
+    except Exception:
+        return dict(ow_map) if isinstance(ow_map, dict) else {}
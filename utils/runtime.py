@@ -0,0 +1,43 @@
+import aiohttp.resolver
+import asyncio
+import logging
+import sys
+import discord
+
+# Optional faster runtime (Fast_Runtime = True in apikeys.py):
+# - uvloop instead of the default asyncio event loop
+# - orjson for gateway and HTTP payloads, discord.py uses it on its own as soon as it's installed
+# - aiodns for discord.py's HTTP session, picked up by aiohttp
+# All of them come from Dependencies/requirements-speed.txt, anything missing falls back to the stdlib.
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+def backends(fast: bool) -> dict:
+    return {
+        'event loop': "uvloop" if fast and uvloop is not None else "asyncio",
+        'json': "orjson" if discord.utils.HAS_ORJSON else "json (stdlib)",
+        # aiohttp picks aiodns by itself when a recent enough version is installed
+        'dns': "aiodns" if aiohttp.resolver.DefaultResolver is aiohttp.resolver.AsyncResolver else "threaded resolver",
+    }
+
+def log_backends(fast: bool):
+    if fast:
+        if uvloop is None:
+            logging.warning("Fast_Runtime is on but uvloop isn't installed (or isn't supported on this platform), using the default event loop.")
+        if not discord.utils.HAS_ORJSON:
+            logging.warning("Fast_Runtime is on but orjson isn't installed, using the stdlib json module.")
+    logging.info("Runtime: %s", ", ".join(f"{name}: {backend}" for name, backend in backends(fast).items()))
+
+# asyncio.run() with uvloop as the event loop when fast is set and it's available
+def run(main, fast: bool = False):
+    log_backends(fast)
+    if not fast or uvloop is None:
+        return asyncio.run(main)
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(main)
+    uvloop.install()
+    return asyncio.run(main)
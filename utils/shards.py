@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import math
+from collections import Counter
+from time import monotonic
+
+# Per-shard connection state, fed by the on_shard_* events.
+# Shards are launched one after another by discord.py; before_identify spaces out their IDENTIFYs
+# (Discord allows one per 5 seconds per max_concurrency bucket) and records when each one started.
+
+SHARD_IDENTIFY_DELAY = 5.0
+
+class ShardState:
+    __slots__ = ('shard_id', 'status', 'identified_at', 'ready_at', 'ready_seconds', 'disconnects', 'resumes')
+
+    def __init__(self, shard_id: int):
+        self.shard_id = shard_id
+        self.status = "launching"
+        self.identified_at = None
+        self.ready_at = None
+        self.ready_seconds = None
+        self.disconnects = 0
+        self.resumes = 0
+
+class ShardTracker:
+    def __init__(self, bot, identify_delay: float = SHARD_IDENTIFY_DELAY):
+        self.bot = bot
+        self.identify_delay = identify_delay
+        self.started = monotonic()
+        self.startup_seconds = None
+        self.shards = {}
+
+    def _state(self, shard_id: int) -> ShardState:
+        state = self.shards.get(shard_id)
+        if state is None:
+            state = self.shards[shard_id] = ShardState(shard_id)
+        return state
+
+    # Used as bot.before_identify_hook
+    async def before_identify(self, shard_id, *, initial: bool = False):
+        if initial:
+            self.started = monotonic()
+        else:
+            await asyncio.sleep(self.identify_delay)
+        state = self._state(shard_id or 0)
+        state.status = "identifying"
+        state.identified_at = monotonic()
+
+    def connected(self, shard_id: int):
+        state = self._state(shard_id)
+        if state.status != "identifying":
+            state.status = "connecting"
+
+    def ready(self, shard_id: int) -> ShardState:
+        state = self._state(shard_id)
+        state.status = "ready"
+        state.ready_at = monotonic()
+        state.ready_seconds = state.ready_at - (state.identified_at or self.started)
+        logging.info("Shard %s/%s ready in %.1f s (%s)", shard_id, self.bot.shard_count, state.ready_seconds, self.describe(shard_id))
+        return state
+
+    # on_ready fires once every shard is ready (and again after a full reconnect)
+    def all_ready(self):
+        if self.startup_seconds is None:
+            self.startup_seconds = monotonic() - self.started
+            logging.info("All %s shard(s) ready in %.1f s", self.bot.shard_count, self.startup_seconds)
+            for line in self.summary():
+                logging.info("  %s", line)
+
+    def disconnected(self, shard_id: int):
+        state = self._state(shard_id)
+        state.status = "disconnected"
+        state.disconnects += 1
+
+    def resumed(self, shard_id: int):
+        state = self._state(shard_id)
+        state.status = "ready"
+        state.resumes += 1
+
+    def guild_counts(self) -> Counter:
+        return Counter(guild.shard_id for guild in self.bot.guilds)
+
+    def latency_ms(self, shard_id: int):
+        shard = self.bot.get_shard(shard_id)
+        if shard is None or not math.isfinite(shard.latency):
+            return None
+        return shard.latency * 1000
+
+    # "ready, 412 guilds, 45 ms"
+    def describe(self, shard_id: int, guild_counts: Counter = None) -> str:
+        state = self._state(shard_id)
+        guilds = (guild_counts if guild_counts is not None else self.guild_counts())[shard_id]
+        latency = self.latency_ms(shard_id)
+        latency_text = f"{latency:.0f} ms" if latency is not None else "no heartbeat yet"
+        return f"{state.status}, {guilds} guilds, {latency_text}"
+
+    # One line per shard, for the startup log and /ping
+    def summary(self, limit: int = None) -> list:
+        guild_counts = self.guild_counts()
+        shard_ids = sorted(self.shards)
+        lines = [f"#{shard_id}: {self.describe(shard_id, guild_counts)}" for shard_id in shard_ids[:limit]]
+        if limit is not None and len(shard_ids) > limit:
+            lines.append(f"... and {len(shard_ids) - limit} more")
+        return lines
+
+    def stats(self) -> dict:
+        statuses = Counter(state.status for state in self.shards.values())
+        return {
+            'shards': self.bot.shard_count or 0,
+            'ready': statuses['ready'],
+            'disconnected': statuses['disconnected'],
+            'startup_seconds': self.startup_seconds,
+        }